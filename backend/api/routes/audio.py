@@ -3,103 +3,124 @@ from fastapi.responses import JSONResponse
 import os
 import json
 import uuid
+import asyncio
 import concurrent.futures
-from typing import List
 from functools import lru_cache
+from typing import List
 
 from config.config import (
-    UPLOAD_DIR, OUTPUT_DIR, EXCEL_FILE_PATH,
+    UPLOAD_DIR, OUTPUT_DIR, JOBS_DIR,
+    JOB_WORKERS, JOB_QUEUE_MAX_PENDING, JOB_RETENTION_SECONDS,
+    UPLOAD_CHUNK_SIZE, MAX_UPLOAD_FILE_BYTES, MAX_UPLOAD_REQUEST_BYTES,
+    RESULT_CACHE_PATH, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_SECONDS,
+    RESULT_CACHE_EVICT_EVERY, RESULT_CACHE_EVICT_INTERVAL,
+    ASYNC_TRANSCRIBE_CONCURRENCY, ASYNC_ANALYZE_CONCURRENCY, ASYNC_GEOCODE_CONCURRENCY,
     WHISPER_ENDPOINT, WHISPER_API_KEY, WHISPER_API_VERSION,
-    GPT_ENDPOINT, GPT_API_KEY, GPT_API_VERSION, GPT_DEPLOYMENT,
+    GPT_ENDPOINT, GPT_API_KEY, GPT_API_VERSION, GPT_DEPLOYMENT, GPT_MAX_TOKENS,
+    GPT_BATCH_LIMIT, GPT_BATCH_MAX_CHARS, GPT_MAX_COMPLETION_TOKENS, BULK_INSERT_BATCH_SIZE, BULK_INSERT_FLUSH_SECONDS,
     GOOGLE_MAPS_API_KEY
 )
-from utils.json_data import excel_to_clean_json
-from utils.location import get_approx_lat_lng
-from models.database import connection_pool
+from utils.location import get_approx_lat_lng, get_approx_lat_lng_async, geocode_cache
+from utils.job_queue import JobQueue, QueueFullError
+from utils.uploads import UploadBudget, UploadTooLargeError, save_upload_streaming
+from utils.result_cache import AudioResultCache, file_sha256
+from utils.whisper_client import get_whisper_client, get_async_whisper_client
+from utils.audio_preprocess import prepared_audio, preprocess_for_upload
+from utils.rate_limit import get_limiter, estimate_tokens, limiter_stats
+from utils.taxonomy import get_taxonomy, severity_for_subtype
+from utils.metrics import JOBS_IN_FLIGHT, JOB_QUEUE_JOBS, external_call, stage_timer
+from models.database import connection_pool, get_connection
+from models.bulk_writer import BulkTicketWriter, write_outcome
 
 # Initialize router
 router = APIRouter()
 
-# Azure OpenAI client
-from openai import AzureOpenAI
-client = AzureOpenAI(
-    api_key=GPT_API_KEY,
-    api_version=GPT_API_VERSION,
-    azure_endpoint=GPT_ENDPOINT
+# Azure OpenAI clients, built on first use so importing the app doesn't load the SDK
+@lru_cache(maxsize=None)
+def get_gpt_client():
+    from openai import AzureOpenAI
+    return AzureOpenAI(
+        api_key=GPT_API_KEY,
+        api_version=GPT_API_VERSION,
+        azure_endpoint=GPT_ENDPOINT
+    )
+
+@lru_cache(maxsize=None)
+def get_async_gpt_client():
+    """Async client; must be used from the app's event loop"""
+    from openai import AsyncAzureOpenAI
+    return AsyncAzureOpenAI(
+        api_key=GPT_API_KEY,
+        api_version=GPT_API_VERSION,
+        azure_endpoint=GPT_ENDPOINT
+    )
+
+# Stage outputs keyed by audio content hash
+result_cache = AudioResultCache(
+    RESULT_CACHE_PATH,
+    max_entries=RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+    evict_every=RESULT_CACHE_EVICT_EVERY,
+    evict_interval=RESULT_CACHE_EVICT_INTERVAL
 )
 
 # === Function 1: Transcribe Audio ===
 def transcribe_audio(audio_path, endpoint, api_key, api_version):
-    import requests
-    with open(audio_path, "rb") as audio_file:
-        files = {
-            "file": (audio_path, audio_file, "audio/wav"),
-        }
-        data = {
-            "language": "en",
-            "response_format": "text"
-        }
-        headers = {
-            "api-key": api_key,
-        }
-        filename = os.path.splitext(os.path.basename(audio_path))[0]
-        phone_number = filename.split("_")[-1]
-        url = f"{endpoint}?api-version={api_version}"
-        response = requests.post(url, headers=headers, data=data, files=files)
-
-        if response.status_code == 200:
-            return response.text.strip(), phone_number
-        else:
-            raise Exception(f"Transcription Error {response.status_code}: {response.text}")
+    """Transcribe one file through the shared, connection-pooled Whisper client"""
+    filename = os.path.splitext(os.path.basename(audio_path))[0]
+    phone_number = filename.split("_")[-1]
+    # Upload a downmixed, 16 kHz, silence-trimmed copy when that is smaller
+    with prepared_audio(audio_path) as upload_path, stage_timer("transcribe"):
+        transcript = get_whisper_client(endpoint, api_key, api_version).transcribe(upload_path)
+    return transcript, phone_number
 
 # === Function 2: Analyze Transcript ===
-def analyze_transcript(transcript_text, client, deployment, output_json):
-    import re
+ANALYSIS_KEYS = (
+    "summary", "caller_name", "primary_location", "specific_landmark", "state_region",
+    "combined_address", "address_variations", "additional_context",
+    "crimeType", "crimeSubType", "description"
+)
+
+def build_analysis_messages(transcript_text):
+    """
+    Chat messages asking GPT to extract the ticket fields from a transcript
+
+    The crime taxonomy is sent as a compact "Type: SubType, ..." list rather
+    than the reference JSON, and the static part comes first so it is
+    identical across calls.
+    """
     system_prompt = (
         "You are an expert in extracting named entities from emergency call transcripts. "
-        "Your task is to provide accurate location and crime information in structured JSON format."
+        "Your task is to provide accurate location and crime information in structured JSON format. "
+        "Respond with a single JSON object only."
     )
 
-    user_prompt = f"""Analyze this emergency call transcript and extract the following information as a single JSON object:
-
-    TRANSCRIPT: {transcript_text}
-
-    Return JSON with:
-    {{
-        "summary": "...",
-        "caller_name": "...",
-        "primary_location": "...",
-        "specific_landmark": "...",
-        "state_region": "...",
-        "combined_address": "...",
-        "address_variations": ["...", "...", "..."],
-        "additional_context": "...",
-        "crimeType": "...",
-        "crimeSubType": "...",
-        "description": "..."
-    }}
-
-    Reference JSON:
-    {output_json}
-    """
-
-    response = client.chat.completions.create(
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ],
-        max_tokens=4096,
-        temperature=0.1,
-        top_p=0.25,
-        model=deployment
+    user_prompt = (
+        "Extract these keys from the emergency call transcript as one JSON object: "
+        f"{', '.join(ANALYSIS_KEYS)}. "
+        "address_variations is a list of up to 3 alternative spellings of the address; "
+        "every other value is a string.\n"
+        "crimeType and crimeSubType must come from this list (Type: SubTypes):\n"
+        f"{get_taxonomy().prompt_text}\n\n"
+        f"TRANSCRIPT: {transcript_text}"
     )
 
-    output = response.choices[0].message.content
-    json_blocks = re.findall(r'```json\s*(.*?)\s*```', output, re.DOTALL)
-    if not json_blocks:
-        raise ValueError("No JSON blocks found in GPT output.")
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
 
-    data = json.loads(json_blocks[0])
+def parse_analysis_output(output):
+    """Load the JSON object from a GPT reply and look up its severity"""
+    try:
+        data = json.loads(output)
+    except json.JSONDecodeError:
+        # Deployments without JSON mode may still wrap the object in a fence
+        import re
+        json_blocks = re.findall(r'```json\s*(.*?)\s*```', output, re.DOTALL)
+        if not json_blocks:
+            raise ValueError("No JSON object found in GPT output.")
+        data = json.loads(json_blocks[0])
 
     # Flatten nested dicts if needed
     flattened_data = {}
@@ -109,28 +130,171 @@ def analyze_transcript(transcript_text, client, deployment, output_json):
     else:
         flattened_data = data
 
-    crime_subtype = flattened_data.get('crimeSubType')
+    severity = severity_for_subtype(flattened_data.get('crimeSubType'))
 
-    json1 = None
-    if os.path.exists(output_json):
-        with open(output_json, 'r', encoding='utf-8') as f:
-            json1 = json.load(f)
-    else:
-        json1 = json.loads(output_json)
+    return flattened_data, severity
 
-    severity = None
-    for item in json1:
-        if item["Sub-Crime"] == crime_subtype:
-            severity = item["Severity Rank (1–10) based on threat or frequency"]
-            break
+def token_usage(response):
+    """Prompt/completion token counts reported for one chat completion"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens
+    }
+
+def summarize_token_usage(results):
+    """Token totals over a list of processing results, for the per-request report"""
+    summary = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    for result in results:
+        usage = result.get("token_usage")
+        if usage:
+            summary["calls"] += 1
+            for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                summary[key] += usage.get(key) or 0
+    return summary
+
+def build_batch_analysis_messages(transcripts):
+    """Chat messages asking for one analysis object per numbered transcript"""
+    system_prompt, user_prompt = (m["content"] for m in build_analysis_messages(""))
+    user_prompt = user_prompt[:user_prompt.rindex("TRANSCRIPT:")]
+    user_prompt += (
+        f"There are {len(transcripts)} separate transcripts below. Return a JSON object "
+        '{"results": [...]} with exactly one object per transcript, each containing '
+        '"index" (the transcript number) and the keys above.\n\n'
+    )
+    user_prompt += "\n\n".join(f"TRANSCRIPT {i}: {text}" for i, text in enumerate(transcripts))
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def validate_analysis(data):
+    """Raise ValueError unless ``data`` looks like a single analysis object"""
+    if not isinstance(data, dict):
+        raise ValueError("Analysis is not a JSON object.")
+    missing = [key for key in ANALYSIS_KEYS if key not in data]
+    if missing:
+        raise ValueError(f"Analysis is missing keys: {', '.join(missing)}")
+
+def pack_transcript_batches(items):
+    """Group pending items into batches bounded by count, transcript length and the completion-token cap"""
+    batch, chars = [], 0
+    for item in items:
+        length = len(item["transcript"])
+        if length > GPT_BATCH_MAX_CHARS:
+            # Long calls are analyzed on their own
+            yield [item]
+            continue
+        if batch and (len(batch) >= GPT_BATCH_LIMIT or chars + length > GPT_BATCH_MAX_CHARS):
+            yield batch
+            batch, chars = [], 0
+        batch.append(item)
+        chars += length
+    if batch:
+        yield batch
+
+def analyze_transcripts_batch(transcripts, client, deployment):
+    """
+    Analyze several transcripts in one chat completion
 
-    return flattened_data, severity
+    Every element of the returned array is validated on its own; any
+    transcript whose element is missing or invalid is re-analyzed
+    individually with analyze_transcript.
+
+    Returns:
+        Tuple of ([(analysis, severity, error), ...] in input order, token usage)
+    """
+    outcomes = [None] * len(transcripts)
+    usage_total = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+    def add_usage(usage):
+        for key in usage_total:
+            usage_total[key] += (usage or {}).get(key) or 0
+
+    if len(transcripts) > 1:
+        try:
+            messages = build_batch_analysis_messages(transcripts)
+            max_tokens = min(GPT_MAX_TOKENS * len(transcripts), GPT_MAX_COMPLETION_TOKENS)
+            get_limiter("gpt").acquire(estimate_request_tokens(messages, max_tokens))
+            with external_call("gpt"):
+                response = client.chat.completions.create(
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.1,
+                    top_p=0.25,
+                    response_format={"type": "json_object"},
+                    model=deployment
+                )
+            add_usage(token_usage(response))
+            elements = json.loads(response.choices[0].message.content).get("results") or []
+            for element in elements:
+                try:
+                    index = int(element.pop("index"))
+                    validate_analysis(element)
+                    if 0 <= index < len(transcripts) and outcomes[index] is None:
+                        outcomes[index] = (element, severity_for_subtype(element.get("crimeSubType")), None)
+                except Exception as e:
+                    print(f"Discarding invalid batch analysis element: {e}")
+        except Exception as e:
+            print(f"Batch analysis failed, retrying individually: {e}")
+
+    # Retry failures one transcript at a time
+    for index, transcript in enumerate(transcripts):
+        if outcomes[index] is not None:
+            continue
+        try:
+            analysis, severity, usage = analyze_transcript(transcript, client, deployment)
+            validate_analysis(analysis)
+            add_usage(usage)
+            outcomes[index] = (analysis, severity, None)
+        except Exception as e:
+            outcomes[index] = (None, None, e)
+
+    return outcomes, usage_total
+
+def estimate_request_tokens(messages, max_tokens):
+    """Tokens a chat request may consume, for the GPT TPM budget"""
+    return sum(estimate_tokens(m["content"]) for m in messages) + max_tokens
+
+def analyze_transcript(transcript_text, client, deployment):
+    """Returns (analysis, severity, token usage)"""
+    messages = build_analysis_messages(transcript_text)
+    get_limiter("gpt").acquire(estimate_request_tokens(messages, GPT_MAX_TOKENS))
+    with external_call("gpt"):
+        response = client.chat.completions.create(
+            messages=messages,
+            max_tokens=GPT_MAX_TOKENS,
+            temperature=0.1,
+            top_p=0.25,
+            response_format={"type": "json_object"},
+            model=deployment
+        )
+
+    analysis, severity = parse_analysis_output(response.choices[0].message.content)
+    return analysis, severity, token_usage(response)
+
+async def analyze_transcript_async(transcript_text, client, deployment):
+    messages = build_analysis_messages(transcript_text)
+    await get_limiter("gpt").acquire_async(estimate_request_tokens(messages, GPT_MAX_TOKENS))
+    with external_call("gpt"):
+        response = await client.chat.completions.create(
+            messages=messages,
+            max_tokens=GPT_MAX_TOKENS,
+            temperature=0.1,
+            top_p=0.25,
+            response_format={"type": "json_object"},
+            model=deployment
+        )
+
+    analysis, severity = parse_analysis_output(response.choices[0].message.content)
+    return analysis, severity, token_usage(response)
 
 def insert_to_db_with_pool(record):
     """Insert a record using the connection pool"""
-    conn = connection_pool.getconn()
     try:
-        cursor = conn.cursor()
         query = """
             INSERT INTO latest_crime_reports (
                 ticket_id, phone_number, caller_name, summary, primary_location,
@@ -151,108 +315,415 @@ def insert_to_db_with_pool(record):
         record.setdefault("status", "pending")
         record.setdefault("officer_assigned", None)
         
-        cursor.execute(query, record)
-        conn.commit()
-        cursor.close()
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(query, record)
+            conn.commit()
         return True
     except Exception as e:
         print(f"DB Insert Error: {e}")
         return False
-    finally:
-        connection_pool.putconn(conn)
 
-# Cache the JSON data to avoid reading it repeatedly
-@lru_cache(maxsize=1)
-def get_cached_json_data():
-    return excel_to_clean_json(EXCEL_FILE_PATH)
+def build_ticket_record(analysis, phone_num, audio_file):
+    """Database record for a new ticket built from the GPT analysis"""
+    return {
+        "ticket_id": f"TID-{uuid.uuid4().hex[:6]}",
+        "phone_number": phone_num,
+        "caller_name": analysis.get("caller_name"),
+        "summary": analysis.get("summary"),
+        "primary_location": analysis.get("primary_location"),
+        "specific_landmark": analysis.get("specific_landmark"),
+        "state_region": analysis.get("state_region"),
+        "combined_address": analysis.get("combined_address"),
+        "address_variations": analysis.get("address_variations"),
+        "additional_context": analysis.get("additional_context"),
+        "crime_type": analysis.get("crimeType"),
+        "crime_subtype": analysis.get("crimeSubType"),
+        "description": analysis.get("description"),
+        "severity_rank": analysis.get("severity_rank"),
+        "audio_file": audio_file,
+        "latitude": analysis.get("latitude"),
+        "longitude": analysis.get("longitude")
+    }
+
+def cached_ticket_result(filename, content_hash, cached):
+    """Result for audio whose ticket was already created from identical content"""
+    return {
+        "file": filename,
+        "status": "success",
+        "output_file": cached.get("output_file"),
+        "phone_number": cached.get("phone_number"),
+        "ticket_id": cached["ticket_id"],
+        "db_status": "duplicate",
+        "cached": True,
+        "sha256": content_hash,
+        "analysis": cached.get("analysis")
+    }
+
+def write_analysis_output(analysis, phone_num):
+    output_file = f"gpt_analysis_output_{phone_num}.json"
+    output_path = os.path.join(OUTPUT_DIR, output_file)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(analysis, f, ensure_ascii=False, indent=4)
+    return output_path
+
+def error_result(filename, error):
+    print(f"Error processing {filename}: {error}")
+    return {
+        "file": filename,
+        "status": "error",
+        "error": str(error)
+    }
+
+def transcribe_stage(file_path, content_hash, cached):
+    """Step 1: transcript and phone number, from the cache when available"""
+    if cached.get("transcript") is not None:
+        return cached["transcript"], cached["phone_number"]
+    transcript, phone_num = transcribe_audio(file_path, WHISPER_ENDPOINT, WHISPER_API_KEY, WHISPER_API_VERSION)
+    result_cache.put(content_hash, transcript=transcript, phone_number=phone_num)
+    return transcript, phone_num
+
+def store_analysis(content_hash, analysis, severity):
+    if severity:
+        analysis["severity_rank"] = severity
+    result_cache.put(content_hash, analysis=analysis, severity=severity)
+    return analysis
+
+def prepare_ticket(audio_file, content_hash, cached, phone_num, analysis):
+    """Steps 3-5: geocode, save the analysis and build the ticket record"""
+    # Step 3: Get location data
+    if cached.get("latitude") is not None:
+        analysis["latitude"] = cached["latitude"]
+        analysis["longitude"] = cached["longitude"]
+    else:
+        with stage_timer("geocode"):
+            latlng = get_approx_lat_lng(analysis, GOOGLE_MAPS_API_KEY)
+        if latlng:
+            analysis["latitude"] = latlng["latitude"]
+            analysis["longitude"] = latlng["longitude"]
+            result_cache.put(content_hash, latitude=latlng["latitude"], longitude=latlng["longitude"])
+
+    # Step 4: Save analysis to file
+    with stage_timer("write_output"):
+        output_path = write_analysis_output(analysis, phone_num)
+
+    # Step 5: Create database record
+    record = build_ticket_record(analysis, phone_num, audio_file)
+    return record, output_path
+
+def ticket_result(filename, content_hash, phone_num, analysis, record, output_path, db_success, usage=None,
+                  db_error=None):
+    """Result entry for a processed file, remembering the ticket for duplicate uploads"""
+    ticket_id = record["ticket_id"]
+    if db_success:
+        result_cache.put(content_hash, output_file=output_path, ticket_id=ticket_id)
+
+    result = {
+        "file": filename,
+        "status": "success",
+        "output_file": output_path,
+        "phone_number": phone_num,
+        "ticket_id": ticket_id if db_success else None,
+        "db_status": "inserted" if db_success else "failed to insert",
+        "cached": False,
+        "sha256": content_hash,
+        "token_usage": usage,
+        "analysis": analysis
+    }
+    if db_error:
+        result["db_error"] = db_error
+        result["db_status"] = f"failed to insert: {db_error}"
+    return result
+
+def finish_stage(filename, file_path, content_hash, cached, phone_num, analysis, usage=None):
+    """Steps 3-6: geocode, save the analysis, create and insert the ticket"""
+    record, output_path = prepare_ticket(os.path.basename(file_path), content_hash, cached, phone_num, analysis)
+
+    # Step 6: Insert into database, batched with the tickets other workers are writing
+    with stage_timer("db_insert"):
+        ticket_id, error = bulk_writer.write(record)
+
+    return ticket_result(
+        filename, content_hash, phone_num, analysis, record, output_path, ticket_id is not None, usage, error
+    )
 
+@JOBS_IN_FLIGHT.track_inprogress(pipeline="file")
 def process_audio_file(file_info):
-    """Process a single audio file and return the result"""
-    filename, file_path, json_path = file_info
+    """
+    Process a single audio file and return the result
+
+    ``file_info`` is (filename, file_path[, sha256]). Stage outputs
+    are cached by content hash, so re-submitted audio skips transcription,
+    analysis and geocoding and returns the ticket created the first time.
+    """
+    filename, file_path = file_info[:2]
+    content_hash = file_info[2] if len(file_info) > 2 and file_info[2] else None
     
     try:
+        content_hash = content_hash or file_sha256(file_path)
+        cached = result_cache.get(content_hash) or {}
+
+        if cached.get("ticket_id"):
+            return cached_ticket_result(filename, content_hash, cached)
+
         # Step 1: Transcribe audio
-        transcript, phone_num = transcribe_audio(file_path, WHISPER_ENDPOINT, WHISPER_API_KEY, WHISPER_API_VERSION)
+        transcript, phone_num = transcribe_stage(file_path, content_hash, cached)
         
         # Step 2: Analyze transcript
-        analysis, severity = analyze_transcript(transcript, client, GPT_DEPLOYMENT, json_path)
-        if severity:
-            analysis["severity_rank"] = severity
-        
-        # Step 3: Get location data
-        latlng = get_approx_lat_lng(analysis, GOOGLE_MAPS_API_KEY)
-        if latlng:
-            analysis["latitude"] = latlng["latitude"]
-            analysis["longitude"] = latlng["longitude"]
-        
-        # Step 4: Save analysis to file
-        output_file = f"gpt_analysis_output_{phone_num}.json"
-        output_path = os.path.join(OUTPUT_DIR, output_file)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(analysis, f, ensure_ascii=False, indent=4)
-        
-        # Step 5: Create database record
-        ticket_id = f"TID-{uuid.uuid4().hex[:6]}"
-        record = {
-            "ticket_id": ticket_id,
-            "phone_number": phone_num,
-            "caller_name": analysis.get("caller_name"),
-            "summary": analysis.get("summary"),
-            "primary_location": analysis.get("primary_location"),
-            "specific_landmark": analysis.get("specific_landmark"),
-            "state_region": analysis.get("state_region"),
-            "combined_address": analysis.get("combined_address"),
-            "address_variations": analysis.get("address_variations"),
-            "additional_context": analysis.get("additional_context"),
-            "crime_type": analysis.get("crimeType"),
-            "crime_subtype": analysis.get("crimeSubType"),
-            "description": analysis.get("description"),
-            "severity_rank": analysis.get("severity_rank"),
-            "audio_file": filename,
-            "latitude": analysis.get("latitude"),
-            "longitude": analysis.get("longitude")
-        }
-        
-        # Step 6: Insert into database
-        db_success = insert_to_db_with_pool(record)
+        usage = None
+        if cached.get("analysis") is not None:
+            analysis = cached["analysis"]
+        else:
+            with stage_timer("analyze"):
+                analysis, severity, usage = analyze_transcript(transcript, get_gpt_client(), GPT_DEPLOYMENT)
+            store_analysis(content_hash, analysis, severity)
         
-        return {
-            "file": filename,
-            "status": "success",
-            "output_file": output_path,
-            "phone_number": phone_num,
-            "ticket_id": ticket_id if db_success else None,
-            "db_status": "inserted" if db_success else "failed to insert",
-            "analysis": analysis
-        }
+        # Steps 3-6
+        return finish_stage(filename, file_path, content_hash, cached, phone_num, analysis, usage)
     except Exception as e:
-        print(f"Error processing {filename}: {str(e)}")
-        return {
-            "file": filename,
-            "status": "error",
-            "error": str(e)
+        return error_result(filename, e)
+
+# Buffered multi-row inserts for bulk imports
+bulk_writer = BulkTicketWriter(
+    connection_pool,
+    batch_size=BULK_INSERT_BATCH_SIZE,
+    flush_interval=BULK_INSERT_FLUSH_SECONDS
+)
+
+# Threads for the parallel stages of batch processing
+batch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="audio-batch")
+
+@JOBS_IN_FLIGHT.track_inprogress(pipeline="batch")
+def process_audio_batch(file_infos, batch_analysis=True):
+    """
+    Process several audio files together
+
+    Files are transcribed in parallel; with ``batch_analysis`` short
+    transcripts are packed into multi-transcript GPT requests (elements that
+    fail validation are retried one by one), otherwise each is analyzed on
+    its own in parallel. Geocoding runs in parallel again and all tickets are
+    written with a single bulk insert. Results are returned in the order of
+    ``file_infos``.
+    """
+    results = [None] * len(file_infos)
+    items = []
+
+    for i, file_info in enumerate(file_infos):
+        filename, file_path = file_info[:2]
+        try:
+            content_hash = (file_info[2] if len(file_info) > 2 else None) or file_sha256(file_path)
+            cached = result_cache.get(content_hash) or {}
+            if cached.get("ticket_id"):
+                results[i] = cached_ticket_result(filename, content_hash, cached)
+                continue
+            items.append({"index": i, "file": filename, "path": file_path, "hash": content_hash, "cached": cached})
+        except Exception as e:
+            results[i] = error_result(filename, e)
+
+    # Step 1: Transcribe in parallel
+    futures = {
+        batch_executor.submit(transcribe_stage, item["path"], item["hash"], item["cached"]): item
+        for item in items
+    }
+    transcribed = []
+    for future in concurrent.futures.as_completed(futures):
+        item = futures[future]
+        try:
+            item["transcript"], item["phone"] = future.result()
+            transcribed.append(item)
+        except Exception as e:
+            results[item["index"]] = error_result(item["file"], e)
+
+    # Step 2: Analysis for everything not already cached, batched unless disabled
+    for item in transcribed:
+        item["analysis"] = item["cached"].get("analysis")
+        item["usage"] = None
+    pending = [item for item in transcribed if item["analysis"] is None]
+    if batch_analysis:
+        for chunk in pack_transcript_batches(pending):
+            with stage_timer("analyze_batch"):
+                outcomes, usage = analyze_transcripts_batch([item["transcript"] for item in chunk], get_gpt_client(), GPT_DEPLOYMENT)
+            for item, (analysis, severity, error) in zip(chunk, outcomes):
+                if error is not None:
+                    results[item["index"]] = error_result(item["file"], error)
+                    continue
+                item["analysis"] = store_analysis(item["hash"], analysis, severity)
+                # Report the batch's token usage once, on its first successful element
+                item["usage"], usage = usage, None
+    else:
+        futures = {
+            batch_executor.submit(analyze_transcript, item["transcript"], get_gpt_client(), GPT_DEPLOYMENT): item
+            for item in pending
         }
+        for future in concurrent.futures.as_completed(futures):
+            item = futures[future]
+            try:
+                analysis, severity, item["usage"] = future.result()
+                item["analysis"] = store_analysis(item["hash"], analysis, severity)
+            except Exception as e:
+                results[item["index"]] = error_result(item["file"], e)
+
+    # Steps 3-5: Geocode and build records in parallel
+    futures = {
+        batch_executor.submit(
+            prepare_ticket, os.path.basename(item["path"]), item["hash"], item["cached"], item["phone"], item["analysis"]
+        ): item
+        for item in transcribed if item["analysis"] is not None
+    }
+    prepared = []
+    for future in concurrent.futures.as_completed(futures):
+        item = futures[future]
+        try:
+            item["record"], item["output_path"] = future.result()
+            prepared.append(item)
+        except Exception as e:
+            results[item["index"]] = error_result(item["file"], e)
+
+    # Step 6: One bulk insert for every finished record; failed rows are rejected individually
+    with stage_timer("db_insert_bulk"):
+        outcomes = bulk_writer.write_many([item["record"] for item in prepared])
+    for item, (ticket_id, error) in zip(prepared, outcomes):
+        results[item["index"]] = ticket_result(
+            item["file"], item["hash"], item["phone"], item["analysis"],
+            item["record"], item["output_path"], ticket_id is not None, item["usage"], error
+        )
+
+    return results
+
+# Per-stage concurrency limits for the asyncio pipeline
+stage_semaphores = {
+    "transcribe": asyncio.Semaphore(ASYNC_TRANSCRIBE_CONCURRENCY),
+    "analyze": asyncio.Semaphore(ASYNC_ANALYZE_CONCURRENCY),
+    "geocode": asyncio.Semaphore(ASYNC_GEOCODE_CONCURRENCY),
+}
+
+@JOBS_IN_FLIGHT.track_inprogress(pipeline="async")
+async def process_audio_file_async(file_info):
+    """
+    asyncio variant of process_audio_file
+
+    Whisper, GPT and the Maps API are awaited on shared async clients, each
+    stage behind its own semaphore, so one event loop keeps many calls in
+    flight. Local file, cache and DB work runs on worker threads.
+    """
+    filename, file_path = file_info[:2]
+    content_hash = file_info[2] if len(file_info) > 2 and file_info[2] else None
+    usage = None
+
+    try:
+        content_hash = content_hash or await asyncio.to_thread(file_sha256, file_path)
+        cached = await asyncio.to_thread(result_cache.get, content_hash) or {}
+
+        if cached.get("ticket_id"):
+            return cached_ticket_result(filename, content_hash, cached)
+
+        # Step 1: Transcribe audio
+        if cached.get("transcript") is not None:
+            transcript, phone_num = cached["transcript"], cached["phone_number"]
+        else:
+            phone_num = os.path.splitext(filename)[0].split("_")[-1]
+            async with stage_semaphores["transcribe"]:
+                prepared = await asyncio.to_thread(preprocess_for_upload, file_path)
+                try:
+                    whisper = get_async_whisper_client(WHISPER_ENDPOINT, WHISPER_API_KEY, WHISPER_API_VERSION)
+                    with stage_timer("transcribe"):
+                        transcript = await whisper.transcribe(prepared or file_path)
+                finally:
+                    if prepared:
+                        os.remove(prepared)
+            await asyncio.to_thread(result_cache.put, content_hash, transcript=transcript, phone_number=phone_num)
+
+        # Step 2: Analyze transcript
+        if cached.get("analysis") is not None:
+            analysis = cached["analysis"]
+        else:
+            async with stage_semaphores["analyze"]:
+                with stage_timer("analyze"):
+                    analysis, severity, usage = await analyze_transcript_async(transcript, get_async_gpt_client(), GPT_DEPLOYMENT)
+            if severity:
+                analysis["severity_rank"] = severity
+            await asyncio.to_thread(result_cache.put, content_hash, analysis=analysis, severity=severity)
+
+        # Step 3: Get location data
+        if cached.get("latitude") is not None:
+            analysis["latitude"] = cached["latitude"]
+            analysis["longitude"] = cached["longitude"]
+        else:
+            async with stage_semaphores["geocode"]:
+                with stage_timer("geocode"):
+                    latlng = await get_approx_lat_lng_async(analysis, GOOGLE_MAPS_API_KEY)
+            if latlng:
+                analysis["latitude"] = latlng["latitude"]
+                analysis["longitude"] = latlng["longitude"]
+                await asyncio.to_thread(
+                    result_cache.put, content_hash, latitude=latlng["latitude"], longitude=latlng["longitude"]
+                )
+
+        # Step 4-6: Save analysis, build the record and insert it
+        with stage_timer("write_output"):
+            output_path = await asyncio.to_thread(write_analysis_output, analysis, phone_num)
+        record = build_ticket_record(analysis, phone_num, os.path.basename(file_path))
+        with stage_timer("db_insert"):
+            # submit may flush a full batch itself, so it runs off the event loop
+            pending = await asyncio.to_thread(bulk_writer.submit, record)
+            await asyncio.wait([asyncio.wrap_future(pending)])
+        ticket_id, error = write_outcome(pending)
+
+        return await asyncio.to_thread(
+            ticket_result, filename, content_hash, phone_num, analysis, record, output_path,
+            ticket_id is not None, usage, error
+        )
+    except Exception as e:
+        return error_result(filename, e)
+
+async def save_wav_uploads(files: List[UploadFile]):
+    """
+    Stream every .wav upload to UPLOAD_DIR in fixed-size chunks
+
+    Returns:
+        Tuple of (saved file infos, error results). A file over the per-file
+        limit becomes an error result; going over the per-request limit
+        aborts the whole request with a 413.
+    """
+    saved, errors = [], []
+    budget = UploadBudget(MAX_UPLOAD_REQUEST_BYTES)
+
+    for file in files:
+        if not file.filename.endswith(".wav"):
+            errors.append({
+                "file": file.filename,
+                "status": "error",
+                "error": "Only .wav files are allowed."
+            })
+            continue
+        try:
+            saved.append(await save_upload_streaming(
+                file, UPLOAD_DIR, MAX_UPLOAD_FILE_BYTES, budget=budget, chunk_size=UPLOAD_CHUNK_SIZE
+            ))
+        except UploadTooLargeError as e:
+            if e.scope == "request":
+                raise HTTPException(status_code=413, detail=str(e))
+            errors.append({"file": file.filename, "status": "error", "error": str(e)})
+
+    return saved, errors
 
 @router.post("/upload-audio/")
 async def upload_audio(files: List[UploadFile] = File(..., description="Upload multiple audio files")):
     if len(files) > 10:
         raise HTTPException(status_code=400, detail="Maximum 10 audio files are allowed.")
 
-    uploaded_files = []
-
-    for file in files:
-        if not file.filename.endswith(".wav"):
-            return JSONResponse(
-                content={"error": f"Only .wav files are allowed. Invalid file: {file.filename}"},
-                status_code=400
-            )
-        # Unique filename to avoid conflicts
-        file_path = os.path.join(UPLOAD_DIR, file.filename)
-        with open(file_path, "wb") as f:
-            f.write(await file.read())
-        uploaded_files.append(file.filename)
+    saved, errors = await save_wav_uploads(files)
+    if errors:
+        return JSONResponse(
+            content={"error": f"{errors[0]['error']} Invalid file: {errors[0]['file']}"},
+            status_code=400
+        )
 
-    return {"message": "Upload successful", "filenames": uploaded_files}
+    return {
+        "message": "Upload successful",
+        "filenames": [info["filename"] for info in saved],
+        "files": saved
+    }
 
 @router.delete("/clear-audios/")
 async def clear_uploaded_audios():
@@ -268,134 +739,159 @@ async def clear_uploaded_audios():
         raise HTTPException(status_code=500, detail=f"Error clearing files: {str(e)}")
 
 @router.post("/process-audios")
-def process_all_audios():
+def process_all_audios(batch: bool = False):
+    """Process every .wav in UPLOAD_DIR; ``batch=true`` packs transcripts into shared GPT requests"""
     processed_results = []
     try:
-        json_path = excel_to_clean_json(EXCEL_FILE_PATH)
-
         audio_files = [f for f in os.listdir(UPLOAD_DIR) if f.lower().endswith(".wav")]
         if not audio_files:
             return JSONResponse(status_code=404, content={"error": "No .wav files found in the upload directory."})
 
-        for filename in audio_files:
-            audio_path = os.path.join(UPLOAD_DIR, filename)
-            try:
-                transcript, phone_num = transcribe_audio(audio_path, WHISPER_ENDPOINT, WHISPER_API_KEY, WHISPER_API_VERSION)
-                analysis, severity = analyze_transcript(transcript, client, GPT_DEPLOYMENT, json_path)
-                if severity:
-                    analysis["severity_rank"] = severity
-
-                # ⬇️ Enrich with latitude and longitude
-                latlng = get_approx_lat_lng(analysis, GOOGLE_MAPS_API_KEY)
-                if latlng:
-                    analysis["latitude"] = latlng["latitude"]
-                    analysis["longitude"] = latlng["longitude"]
-
-                output_file = f"gpt_analysis_output_{phone_num}.json"
-                output_path = os.path.join(OUTPUT_DIR, output_file)
-
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(analysis, f, ensure_ascii=False, indent=4)
-
-                ticket_id = f"TID-{uuid.uuid4().hex[:6]}"
-
-                record = {
-                    "ticket_id": ticket_id,
-                    "phone_number": phone_num,
-                    "caller_name": analysis.get("caller_name"),
-                    "summary": analysis.get("summary"),
-                    "primary_location": analysis.get("primary_location"),
-                    "specific_landmark": analysis.get("specific_landmark"),
-                    "state_region": analysis.get("state_region"),
-                    "combined_address": analysis.get("combined_address"),
-                    "address_variations": analysis.get("address_variations"),
-                    "additional_context": analysis.get("additional_context"),
-                    "crime_type": analysis.get("crimeType"),
-                    "crime_subtype": analysis.get("crimeSubType"),
-                    "description": analysis.get("description"),
-                    "severity_rank": analysis.get("severity_rank"),
-                    "audio_file": filename
-                }
-
-                db_success = insert_to_db_with_pool(record)
-
-                processed_results.append({
-                    "file": filename,
-                    "status": "success",
-                    "output_file": output_path,
-                    "phone_number": phone_num,
-                    "ticket_id": ticket_id if db_success else None,
-                    "db_status": "inserted" if db_success else "failed to insert",
-                    "analysis": analysis
-                })
-
-            except Exception as e:
-                processed_results.append({
-                    "file": filename,
-                    "status": "error",
-                    "error": str(e)
-                })
+        # Re-submitted files are answered from the result cache and new
+        # tickets are written through the bulk writer in one transaction
+        file_infos = [(filename, os.path.join(UPLOAD_DIR, filename)) for filename in audio_files]
+        processed_results = process_audio_batch(file_infos, batch_analysis=batch)
 
-        return JSONResponse(content={"results": processed_results})
+        return JSONResponse(content={
+            "results": processed_results,
+            "token_usage": summarize_token_usage(processed_results)
+        })
 
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+# Shared pool of long-lived workers used by every processing request
+job_queue = JobQueue(
+    handler=process_audio_file,
+    jobs_dir=JOBS_DIR,
+    max_workers=JOB_WORKERS,
+    max_pending=JOB_QUEUE_MAX_PENDING,
+    retention_seconds=JOB_RETENTION_SECONDS
+)
+JOB_QUEUE_JOBS.set_function(
+    lambda: {(status,): count for status, count in job_queue.stats()["jobs"].items()}
+)
+
 @router.post("/upload-and-process/")
-async def upload_and_process(files: List[UploadFile] = File(..., description="Upload and process audio files")):
-    """Upload and process multiple audio files in parallel"""
+async def upload_and_process(
+    files: List[UploadFile] = File(..., description="Upload and process audio files"),
+    batch: bool = False
+):
+    """
+    Upload audio files, process them on the shared job queue and wait for the results
+
+    With ``batch=true`` the files are processed together so their transcripts
+    share multi-transcript GPT requests.
+    """
     processed_results = []
-    file_infos = []  # List to store file info for parallel processing
 
     try:
-        # Get cached JSON data
-        json_path = get_cached_json_data()
-        
-        # Step 1: Save all uploaded files first
-        for file in files:
-            if not file.filename.endswith(".wav"):
+        # Step 1: Stream all uploaded files to disk and queue them on the shared workers
+        saved, processed_results = await save_wav_uploads(files)
+        if batch:
+            file_infos = [(info["filename"], info["path"], info["sha256"]) for info in saved]
+            processed_results.extend(await asyncio.to_thread(process_audio_batch, file_infos))
+            return JSONResponse(content={
+                "results": processed_results,
+                "token_usage": summarize_token_usage(processed_results)
+            })
+
+        # The whole request is admitted at once, so a full queue never leaves some of its files running untracked
+        submitted = job_queue.submit_many(
+            (info["filename"], info["path"], info["sha256"]) for info in saved
+        )
+
+        # Step 2: Wait for the queued jobs without blocking the event loop
+        for info, (_, future) in zip(saved, submitted):
+            try:
+                result = await asyncio.wrap_future(future)
+                processed_results.append(result)
+            except Exception as e:
                 processed_results.append({
-                    "file": file.filename,
+                    "file": info["filename"],
                     "status": "error",
-                    "error": "Only .wav files are allowed."
+                    "error": f"Processing failed: {str(e)}"
                 })
-                continue
-                
-            file_path = os.path.join(UPLOAD_DIR, file.filename)
-            with open(file_path, "wb") as f:
-                f.write(await file.read())
-            
-            # Add to list for parallel processing
-            file_infos.append((file.filename, file_path, json_path))
-        
-        # Step 2: Process files in parallel using ThreadPoolExecutor
-        # Use a reasonable number of workers based on your system capabilities
-        max_workers = min(10, len(file_infos))  # Limit to 10 concurrent workers
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks and collect futures
-            future_to_file = {executor.submit(process_audio_file, file_info): file_info[0] 
-                             for file_info in file_infos}
-            
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_file):
-                filename = future_to_file[future]
-                try:
-                    result = future.result()
-                    processed_results.append(result)
-                except Exception as e:
-                    processed_results.append({
-                        "file": filename,
-                        "status": "error",
-                        "error": f"Processing failed: {str(e)}"
-                    })
-        
+
         # Return all results
-        return JSONResponse(content={"results": processed_results})
+        return JSONResponse(content={
+            "results": processed_results,
+            "token_usage": summarize_token_usage(processed_results)
+        })
+
+    except HTTPException:
+        raise
+    except QueueFullError as e:
+        return JSONResponse(status_code=503, content={"error": str(e)})
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": f"Global error: {str(e)}"})
 
+@router.post("/upload-and-process-async/")
+async def upload_and_process_async(files: List[UploadFile] = File(..., description="Upload and process audio files")):
+    """Upload audio files and run them through the asyncio pipeline on the event loop"""
+    try:
+        saved, processed_results = await save_wav_uploads(files)
+        processed_results.extend(await asyncio.gather(*(
+            process_audio_file_async((info["filename"], info["path"], info["sha256"]))
+            for info in saved
+        )))
+
+        return JSONResponse(content={
+            "results": processed_results,
+            "token_usage": summarize_token_usage(processed_results)
+        })
+
+    except HTTPException:
+        raise
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"Global error: {str(e)}"})
 
+@router.post("/jobs/")
+async def submit_jobs(files: List[UploadFile] = File(..., description="Upload audio files for background processing")):
+    """Save the uploaded files, queue one job per file and return the job IDs right away"""
+    jobs = []
+
+    try:
+        saved, jobs = await save_wav_uploads(files)
+        submitted = job_queue.submit_many(
+            (info["filename"], info["path"], info["sha256"]) for info in saved
+        )
+        for info, (job_id, _) in zip(saved, submitted):
+            jobs.append({"file": info["filename"], "job_id": job_id, "status": "queued", "sha256": info["sha256"]})
+
+        return JSONResponse(status_code=202, content={"jobs": jobs})
+
+    except HTTPException:
+        raise
+    except QueueFullError as e:
+        return JSONResponse(status_code=503, content={"error": str(e), "jobs": jobs})
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Return the status of a queued job and its result once finished"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+@router.get("/jobs/")
+def get_job_queue_stats():
+    return job_queue.stats()
+
+@router.get("/cache/")
+def get_cache_stats():
+    return {"audio_results": result_cache.stats(), "geocode": geocode_cache.stats()}
+
+@router.get("/bulk-writer/")
+def get_bulk_writer_stats():
+    return bulk_writer.stats()
+
+@router.get("/rate-limits/")
+def get_rate_limit_stats():
+    return limiter_stats()
+
 @router.post("/create-ticket-from-voice")
 async def create_ticket_from_voice(request: Request):
     try:
@@ -1,83 +1,464 @@
+import io
+import re
+import csv
+import json
+import base64
+import asyncio
+from datetime import datetime, time, timedelta, timezone
+from typing import List, Optional
+
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import JSONResponse
-import psycopg2
-from config.config import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+from fastapi.responses import JSONResponse, StreamingResponse
+from config.config import (
+    DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD, DB_CONNECT_TIMEOUT,
+    DATA_PAGE_SIZE, DATA_PAGE_SIZE_MAX, EXPORT_FETCH_SIZE, CHANGES_SAFETY_LAG_SECONDS,
+    STREAM_QUEUE_SIZE, STREAM_HEARTBEAT_SECONDS,
+    HEATMAP_CELL_PIXELS, ROLLUP_CELL_DEGREES
+)
+from models.database import get_connection, pool_stats
+from models.listener import ReportListener, REPORT_CHANNEL
+from utils.metrics import query_timer
 
 # Initialize router
 router = APIRouter()
 
+REPORT_COLUMNS = (
+    "ticket_id", "phone_number", "caller_name", "summary", "primary_location",
+    "specific_landmark", "state_region", "combined_address",
+    "address_variations", "additional_context", "crime_type", "crime_subtype",
+    "description", "severity_rank", "audio_file", "created_at", "latitude",
+    "longitude", "status", "officer_assigned", "updated_at"
+)
+
+def encode_cursor(created_at, row_id, rank=None) -> str:
+    """Opaque page cursor pointing just past the (created_at, id) of the last row, plus its rank for searches"""
+    key = [created_at.isoformat(), row_id] + ([rank] if rank is not None else [])
+    raw = json.dumps(key).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(cursor: str, ranked: bool = False):
+    """(created_at, id), or (rank, created_at, id) for a search cursor"""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if ranked:
+            created_at, row_id, rank = key
+            return float(rank), datetime.fromisoformat(created_at), int(row_id)
+        created_at, row_id = key
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def search_tsquery(search: Optional[str]) -> Optional[str]:
+    """Prefix tsquery matching every word of ``search`` ("mur vizag" -> "mur:* & vizag:*")"""
+    words = re.findall(r"\w+", search or "")
+    return " & ".join(f"{word}:*" for word in words) if words else None
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Columns requested via ``fields=a,b,c``; all report columns by default"""
+    if not fields:
+        return list(REPORT_COLUMNS)
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in REPORT_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return selected
+
+def rows_to_records(columns: List[str], rows) -> List[dict]:
+    """Convert DB rows to dicts, ignoring any trailing cursor columns"""
+    records = []
+    for row in rows:
+        record = dict(zip(columns, row))
+        for key in ("created_at", "updated_at"):
+            if record.get(key):
+                record[key] = record[key].isoformat()
+        records.append(record)
+    return records
+
+CHANGES_START_SQL = "SELECT now() - make_interval(secs => %s)"
+# float8 so the rank survives the JSON cursor round trip exactly; the float4 that
+# ts_rank returns never compares equal to the float8 it was sent out as
+RANK_SQL = "ts_rank(search_vector, to_tsquery('simple', %s))::float8"
+
+def data_page_query(columns: List[str], limit: int, cursor=None, status=None, officer=None, search=None,
+                    severity=None, crimeType=None, crimeSubType=None, fromDate=None, toDate=None):
+    """
+    SQL and parameters for one /get-data page
+
+    Returns:
+        (query, params, ranked); ranked queries order by search rank and
+        return it as the last column after created_at and id
+    """
+    conditions = []
+    params = []
+    tsquery = search_tsquery(search)
+
+    if tsquery:
+        conditions.append("search_vector @@ to_tsquery('simple', %s)")
+        params.append(tsquery)
+
+    if cursor and tsquery:
+        conditions.append(f"({RANK_SQL}, created_at, id) < (%s::float8, %s, %s)")
+        params.append(tsquery)
+        params.extend(decode_cursor(cursor, ranked=True))
+    elif cursor:
+        conditions.append("(created_at, id) < (%s, %s)")
+        params.extend(decode_cursor(cursor))
+
+    if status:
+        conditions.append("status = %s")
+        params.append(status)
+
+    if officer:
+        conditions.append("officer_assigned = %s")
+        params.append(officer)
+
+    filter_conditions, filter_params = heatmap_filters(None, severity, crimeType, crimeSubType, fromDate, toDate)
+    conditions += filter_conditions
+    params += filter_params
+
+    # created_at, id (and the rank) always come back last so the next cursor can be built
+    query = f"SELECT {', '.join(columns)}, created_at, id"
+    if tsquery:
+        query += f", {RANK_SQL}"
+        params.insert(0, tsquery)
+    query += " FROM latest_crime_reports"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    if tsquery:
+        query += f" ORDER BY {RANK_SQL} DESC, created_at DESC, id DESC LIMIT %s"
+        params.append(tsquery)
+    else:
+        query += " ORDER BY created_at DESC, id DESC LIMIT %s"
+    params.append(limit + 1)
+    return query, params, bool(tsquery)
+
 @router.get("/get-data")
-def get_processed_data():
+def get_processed_data(
+    limit: int = DATA_PAGE_SIZE,
+    cursor: str = None,
+    fields: str = None,
+    status: str = None,
+    officer: str = None,
+    crimeType: str = None,
+    search: str = None,
+    severity: int = None,
+    crimeSubType: str = None,
+    fromDate: str = None,
+    toDate: str = None
+):
+    """
+    One page of crime reports, newest first
+
+    Pages are keyed on (created_at, id) so each request reads at most
+    ``limit`` rows from the index no matter how deep the client has paged.
+    With ``search`` only matching reports are returned, most relevant
+    first, and the cursor also carries the rank.
+
+    Args:
+        limit: Page size, capped at DATA_PAGE_SIZE_MAX
+        cursor: ``next_cursor`` from the previous page
+        fields: Comma-separated columns to return
+        status, officer: Optional exact-match filters
+        search: Full-text search over names, places, types and summaries
+        severity, crimeType, crimeSubType, fromDate, toDate: Same filters as /heatmap-data
+
+    Returns:
+        {"records": [...], "next_cursor": str or None}
+    """
     try:
-        conn = psycopg2.connect(
-            host=DB_HOST, port=DB_PORT, dbname=DB_NAME,
-            user=DB_USER, password=DB_PASSWORD
+        limit = max(1, min(limit, DATA_PAGE_SIZE_MAX))
+        columns = parse_fields(fields)
+        check_date_filters(fromDate, toDate)
+
+        query, params, ranked = data_page_query(
+            columns, limit, cursor, status, officer, search, severity, crimeType, crimeSubType, fromDate, toDate
         )
-        cursor = conn.cursor()
 
-        query = """
-        SELECT
-            ticket_id,
-            phone_number,
-            caller_name,
-            summary,
-            primary_location,
-            specific_landmark,
-            state_region,
-            combined_address,
-            address_variations,
-            additional_context,
-            crime_type,
-            crime_subtype,
-            description,
-            severity_rank,
-            audio_file,
-            created_at,
-            latitude,
-            longitude,
-            status,
-            officer_assigned
-        FROM latest_crime_reports
-        ORDER BY created_at DESC
-        """
+        with get_connection() as conn:
+            with conn.cursor() as db_cursor:
+                # Taken before the page is read so /data/changes picks up anything committed meanwhile
+                db_cursor.execute(CHANGES_START_SQL, (CHANGES_SAFETY_LAG_SECONDS,))
+                changes_from = db_cursor.fetchone()[0]
+                with query_timer("get_data"):
+                    db_cursor.execute(query, params)
+                    rows = db_cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            if ranked:
+                next_cursor = encode_cursor(rows[-1][-3], rows[-1][-2], rows[-1][-1])
+            else:
+                next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+
+        return JSONResponse(content={
+            "records": rows_to_records(columns, rows),
+            "next_cursor": next_cursor,
+            "changes_cursor": encode_cursor(changes_from, 0)
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+SUMMARY_SQL = """
+SELECT
+    COUNT(*),
+    COUNT(*) FILTER (WHERE COALESCE(status, 'pending') = 'pending'),
+    COUNT(*) FILTER (WHERE status = 'approved'),
+    COUNT(*) FILTER (WHERE status = 'rejected'),
+    COUNT(*) FILTER (WHERE severity_rank >= 8),
+    COUNT(*) FILTER (WHERE severity_rank >= 5 AND severity_rank < 8),
+    COUNT(*) FILTER (WHERE severity_rank < 5)
+FROM latest_crime_reports
+"""
+
+@router.get("/summary")
+def get_summary(
+    search: str = None,
+    status: str = None,
+    officer: str = None,
+    severity: int = None,
+    crimeType: str = None,
+    crimeSubType: str = None,
+    fromDate: str = None,
+    toDate: str = None,
+    top: int = 3
+):
+    """
+    Dashboard totals over every report matching the filters, not just the loaded page
+
+    Returns:
+        {"total", "status": {pending, approved, rejected},
+         "severity": {high, medium, low}, "top_crime_types": [{crime_type, count}, ...]}
+    """
+    check_date_filters(fromDate, toDate)
+    try:
+        conditions, params = heatmap_filters(search, severity, crimeType, crimeSubType, fromDate, toDate)
+        if status:
+            conditions.append("status = %s")
+            params.append(status)
+        if officer:
+            conditions.append("officer_assigned = %s")
+            params.append(officer)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        top_where = where + (" AND " if where else " WHERE ") + "crime_type IS NOT NULL"
+
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                with query_timer("summary"):
+                    cursor.execute(SUMMARY_SQL + where, params)
+                    counts = cursor.fetchone()
+                    cursor.execute(
+                        f"SELECT crime_type, COUNT(*) FROM latest_crime_reports{top_where} "
+                        "GROUP BY crime_type ORDER BY COUNT(*) DESC, crime_type LIMIT %s",
+                        params + [max(1, min(top, 20))]
+                    )
+                    top_types = cursor.fetchall()
+
+        total, pending, approved, rejected, high, medium, low = counts
+        return {
+            "total": total,
+            "status": {"pending": pending, "approved": approved, "rejected": rejected},
+            "severity": {"high": high, "medium": medium, "low": low},
+            "top_crime_types": [{"crime_type": name, "count": count} for name, count in top_types]
+        }
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@router.get("/filter-options")
+def get_filter_options():
+    """Every severity, crime type and subtype present, for the dashboard's filter menus"""
+    try:
+        options = {}
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                with query_timer("filter_options"):
+                    for key, column in (
+                        ("severities", "severity_rank"),
+                        ("crime_types", "crime_type"),
+                        ("crime_subtypes", "crime_subtype")
+                    ):
+                        cursor.execute(
+                            f"SELECT DISTINCT {column} FROM latest_crime_reports "
+                            f"WHERE {column} IS NOT NULL ORDER BY {column}"
+                        )
+                        options[key] = [row[0] for row in cursor.fetchall()]
+        return options
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+def changes_query(columns: List[str], cursor: Optional[str], limit: int):
+    """SQL and parameters for one page of the change feed"""
+    query = f"SELECT {', '.join(columns)}, updated_at, id FROM latest_crime_reports"
+    params = []
+    if cursor:
+        query += " WHERE (updated_at, id) > (%s, %s)"
+        params.extend(decode_cursor(cursor))
+    query += " ORDER BY updated_at, id LIMIT %s"
+    params.append(limit + 1)
+    return query, params
+
+def fetch_changes(cursor: Optional[str], limit: int, columns: List[str]) -> dict:
+    """One page of the change feed; see get_changed_data"""
+    query, params = changes_query(columns, cursor, limit)
+
+    with get_connection() as conn:
+        with conn.cursor() as db_cursor:
+            db_cursor.execute(CHANGES_START_SQL, (CHANGES_SAFETY_LAG_SECONDS,))
+            settled = db_cursor.fetchone()[0]
+            with query_timer("changes"):
+                db_cursor.execute(query, params)
+                rows = db_cursor.fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+    elif rows and rows[-1][-2] <= settled:
+        next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+    elif cursor and decode_cursor(cursor)[0] > settled:
+        next_cursor = cursor
+    else:
+        # Don't move past rows that may still be joined by a late commit
+        next_cursor = encode_cursor(settled, 0)
+
+    return {
+        "records": rows_to_records(columns, rows),
+        "next_cursor": next_cursor,
+        "has_more": has_more
+    }
 
-        cursor.execute(query)
-        rows = cursor.fetchall()
-
-        # Convert DB rows to dicts
-        records = []
-        for row in rows:
-            records.append({
-                "ticket_id": row[0],
-                "phone_number": row[1],
-                "caller_name": row[2],
-                "summary": row[3],
-                "primary_location": row[4],
-                "specific_landmark": row[5],
-                "state_region": row[6],
-                "combined_address": row[7],
-                "address_variations": row[8],
-                "additional_context": row[9],
-                "crime_type": row[10],
-                "crime_subtype": row[11],
-                "description": row[12],
-                "severity_rank": row[13],
-                "audio_file": row[14],
-                "created_at": row[15].isoformat() if row[15] else None,
-                "latitude": row[16],
-                "longitude": row[17],
-                "status": row[18],
-                "officer_assigned": row[19]
-            })
-
-        cursor.close()
-        conn.close()
-
-        return JSONResponse(content={"records": records})
+@router.get("/changes")
+def get_changed_data(cursor: str = None, limit: int = DATA_PAGE_SIZE, fields: str = None):
+    """
+    Rows inserted or updated since ``cursor``, oldest change first
 
+    Start from the ``changes_cursor`` of /data/get-data and pass back the
+    returned ``next_cursor`` each time. Rows changed within the last
+    CHANGES_SAFETY_LAG_SECONDS may be sent twice, so clients should merge
+    by ticket_id. ``has_more`` means another page is ready right away.
+
+    Returns:
+        {"records": [...], "next_cursor": str, "has_more": bool}
+    """
+    try:
+        limit = max(1, min(limit, DATA_PAGE_SIZE_MAX))
+        return JSONResponse(content=fetch_changes(cursor, limit, parse_fields(fields)))
+
+    except HTTPException:
+        raise
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+# === Live stream: NOTIFY from the report triggers, fanned out over SSE ===
+
+def load_report_events(ids: List[int]) -> List[dict]:
+    """Load the rows named by a batch of notifications, in change order"""
+    columns = list(REPORT_COLUMNS)
+    query = f"""
+        SELECT {', '.join(columns)}, updated_at, id FROM latest_crime_reports
+        WHERE id = ANY(%s) ORDER BY updated_at, id
+    """
+    with get_connection() as conn:
+        with conn.cursor() as db_cursor:
+            with query_timer("stream_load"):
+                db_cursor.execute(query, (ids,))
+                rows = db_cursor.fetchall()
+    records = rows_to_records(columns, rows)
+    return [
+        {"cursor": encode_cursor(row[-2], row[-1]), "record": record}
+        for row, record in zip(rows, records)
+    ]
+
+report_listener = ReportListener(
+    REPORT_CHANNEL,
+    load_report_events,
+    max_queue=STREAM_QUEUE_SIZE,
+    host=DB_HOST,
+    port=DB_PORT,
+    dbname=DB_NAME,
+    user=DB_USER,
+    password=DB_PASSWORD,
+    connect_timeout=DB_CONNECT_TIMEOUT
+)
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['cursor']}\nevent: report\ndata: {json.dumps(event['record'])}\n\n"
+
+async def replay_changes(cursor: str):
+    """Events for everything changed since ``cursor``, stepped back by the safety lag"""
+    changed_at, _ = decode_cursor(cursor)
+    page_cursor = encode_cursor(changed_at - timedelta(seconds=CHANGES_SAFETY_LAG_SECONDS), 0)
+    columns = list(REPORT_COLUMNS)
+    while True:
+        page = await asyncio.to_thread(fetch_changes, page_cursor, DATA_PAGE_SIZE_MAX, columns)
+        for record in page["records"]:
+            yield {"cursor": None, "record": record}
+        page_cursor = page["next_cursor"]
+        if not page["has_more"]:
+            break
+    # Replayed rows carry no exact cursor; resume later replays from the page cursor
+    yield {"cursor": page_cursor, "record": None}
+
+@router.get("/stream")
+async def stream_reports(request: Request, cursor: str = None):
+    """
+    Server-sent events for every inserted or updated report
+
+    Each ``report`` event carries the full row and an id that works as a
+    resume cursor: browsers send it back as Last-Event-ID on reconnect (or
+    pass ``cursor=``) and missed changes are replayed before live events
+    resume. Clients that fall more than STREAM_QUEUE_SIZE events behind
+    are caught up the same way instead of buffering without bound.
+    """
+    resume_from = request.headers.get("last-event-id") or cursor
+    if resume_from:
+        decode_cursor(resume_from)
+
+    async def events():
+        # Subscribe before replaying so nothing committed meanwhile is lost
+        subscriber = report_listener.subscribe()
+        last_cursor = resume_from
+        replay = bool(last_cursor)
+        try:
+            while not await request.is_disconnected():
+                if subscriber.overflowed:
+                    # Fell behind: drop the backlog and catch up from the last cursor instead
+                    while not subscriber.queue.empty():
+                        subscriber.queue.get_nowait()
+                    subscriber.overflowed = False
+                    replay = bool(last_cursor)
+                if replay:
+                    replay = False
+                    async for event in replay_changes(last_cursor):
+                        if event["record"] is None:
+                            last_cursor = event["cursor"]
+                            yield f"id: {last_cursor}\n\n"
+                        else:
+                            yield f"event: report\ndata: {json.dumps(event['record'])}\n\n"
+                    continue
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                last_cursor = event["cursor"]
+                yield format_sse(event)
+        finally:
+            report_listener.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/stream-stats")
+def get_stream_stats():
+    return report_listener.stats()
+
 @router.post("/update-data")
 async def update_data(request: Request):
     try:
@@ -87,113 +468,369 @@ async def update_data(request: Request):
         officer_assigned = data.get("officer_assigned")
         if not ticket_id:
             raise HTTPException(status_code=400, detail="ticket_id is required")
-        conn = psycopg2.connect(
-            host=DB_HOST, port=DB_PORT, dbname=DB_NAME,
-            user=DB_USER, password=DB_PASSWORD
-        )
-        cursor = conn.cursor()
         query = """
             UPDATE latest_crime_reports
             SET status = %s, officer_assigned = %s
             WHERE ticket_id = %s
         """
-        cursor.execute(query, (status, officer_assigned, ticket_id))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                with query_timer("update_data"):
+                    cursor.execute(query, (status, officer_assigned, ticket_id))
+            conn.commit()
         return {"message": "Update successful"}
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+def heatmap_filters(search=None, severity=None, crimeType=None, crimeSubType=None, fromDate=None, toDate=None):
+    """WHERE conditions and parameters for the heatmap filter set"""
+    # Build conditions and parameters list
+    conditions = []
+    params = []
+
+    # Add search filter (GIN-indexed full-text match, prefix per word)
+    tsquery = search_tsquery(search)
+    if tsquery:
+        conditions.append("search_vector @@ to_tsquery('simple', %s)")
+        params.append(tsquery)
+
+    # Add severity filter
+    if severity:
+        conditions.append("severity_rank = %s")
+        params.append(severity)
+
+    # Add crime type filter
+    if crimeType:
+        conditions.append("LOWER(crime_type) = LOWER(%s)")
+        params.append(crimeType)
+
+    # Add crime subtype filter
+    if crimeSubType:
+        conditions.append("LOWER(crime_subtype) = LOWER(%s)")
+        params.append(crimeSubType)
+
+    # Add date filters; parsed here so naive values mean UTC, as they do for the rollup
+    if fromDate:
+        conditions.append("created_at >= %s")
+        params.append(parse_timestamp(fromDate))
+
+    if toDate:
+        conditions.append("created_at <= %s")
+        params.append(parse_timestamp(toDate))
+
+    return conditions, params
+
+def heatmap_cell_size(zoom: int) -> float:
+    """Cell edge in degrees: HEATMAP_CELL_PIXELS screen pixels at this web-map zoom level"""
+    zoom = max(0, min(zoom, 20))
+    return 360.0 / (256 * 2 ** zoom) * HEATMAP_CELL_PIXELS
+
+def parse_timestamp(value: str) -> datetime:
+    """ISO timestamp from the query string; naive values are taken as UTC"""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def check_date_filters(fromDate: Optional[str], toDate: Optional[str]):
+    """Reject date filters Postgres would fail on with a 400"""
+    try:
+        for value in (fromDate, toDate):
+            if value:
+                parse_timestamp(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="fromDate and toDate must be ISO timestamps")
+
+def rollup_day_range(fromDate: Optional[str], toDate: Optional[str]):
+    """
+    Split a date filter into whole UTC days served by heatmap_rollup and
+    the partial-day edges that still have to be read from the reports.
+
+    Returns (first_day, end_day, edge_conditions, edge_params) where the
+    rollup covers first_day <= day < end_day (either may be None for an
+    open end), or None when the range is too short to benefit.
+    """
+    start = parse_timestamp(fromDate) if fromDate else None
+    end = parse_timestamp(toDate) if toDate else None
+    first_day = end_day = None
+    edges, edge_params = [], []
+
+    if start is not None:
+        start = start.astimezone(timezone.utc)
+        first_day = start.date()
+        if start != datetime.combine(first_day, time.min, timezone.utc):
+            first_day += timedelta(days=1)
+            edges.append("(created_at >= %s AND created_at < %s)")
+            edge_params.extend([start, datetime.combine(first_day, time.min, timezone.utc)])
+
+    if end is not None:
+        end = end.astimezone(timezone.utc)
+        end_day = end.date()
+        edges.append("(created_at >= %s AND created_at <= %s)")
+        edge_params.extend([datetime.combine(end_day, time.min, timezone.utc), end])
+
+    if first_day is not None and end_day is not None and first_day >= end_day:
+        return None
+    return first_day, end_day, edges, edge_params
+
+def rollup_query(cell: float, severity=None, crimeType=None, crimeSubType=None, fromDate=None, toDate=None):
+    """
+    SQL and parameters binning heatmap_rollup into ``cell``-degree cells,
+    or None if the filters need the raw table
+
+    Whole days come from the rollup; partial days at either end of the
+    date range are binned from latest_crime_reports through the same base
+    grid so both halves line up.
+    """
+    try:
+        day_range = rollup_day_range(fromDate, toDate)
+    except ValueError:
+        return None
+    if day_range is None:
+        return None
+    first_day, end_day, edges, edge_params = day_range
+
+    rollup_conditions, rollup_params = ["incidents > 0"], []
+    if first_day is not None:
+        rollup_conditions.append("day >= %s")
+        rollup_params.append(first_day)
+    if end_day is not None:
+        rollup_conditions.append("day < %s")
+        rollup_params.append(end_day)
+
+    raw_conditions, raw_params = heatmap_filters(
+        severity=severity, crimeType=crimeType, crimeSubType=crimeSubType
+    )
+    # The rollup stores the same columns, so the non-date filters apply to both
+    rollup_conditions += raw_conditions
+    rollup_params += raw_params
+
+    base = ROLLUP_CELL_DEGREES
+    query = f"""
+    SELECT
+        (floor(((cell_lat + 0.5) * %s) / %s) + 0.5) * %s,
+        (floor(((cell_lng + 0.5) * %s) / %s) + 0.5) * %s,
+        SUM(incidents), SUM(incidents * severity_rank), MAX(severity_rank)
+    FROM heatmap_rollup
+    WHERE {" AND ".join(rollup_conditions)}
+    GROUP BY 1, 2
+    """
+    params = [base, cell, cell, base, cell, cell] + rollup_params
+
+    if edges:
+        query = f"""
+        SELECT cell_lat, cell_lng, SUM(incidents), SUM(severity_sum), MAX(severity_max) FROM (
+            {query}
+            UNION ALL
+            SELECT
+                (floor(((floor(latitude / %s) + 0.5) * %s) / %s) + 0.5) * %s,
+                (floor(((floor(longitude / %s) + 0.5) * %s) / %s) + 0.5) * %s,
+                COUNT(*), SUM(severity_rank), MAX(severity_rank)
+            FROM latest_crime_reports
+            WHERE latitude IS NOT NULL AND longitude IS NOT NULL AND severity_rank IS NOT NULL
+                AND ({" OR ".join(edges)})
+                {"".join(" AND " + c for c in raw_conditions)}
+            GROUP BY 1, 2
+        ) AS cells (cell_lat, cell_lng, incidents, severity_sum, severity_max)
+        GROUP BY 1, 2
+        """
+        params += [base, base, cell, cell, base, base, cell, cell] + edge_params + raw_params
+    return query, params
+
+def heatmap_cells_from_rollup(cell: float, severity=None, crimeType=None, crimeSubType=None,
+                              fromDate=None, toDate=None):
+    """Heatmap cells read from heatmap_rollup, or None if the filters need the raw table"""
+    built = rollup_query(cell, severity, crimeType, crimeSubType, fromDate, toDate)
+    if built is None:
+        return None
+    query, params = built
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            with query_timer("heatmap_rollup"):
+                cursor.execute(query, params)
+                return cursor.fetchall()
+
+def heatmap_query(search=None, severity=None, crimeType=None, crimeSubType=None, fromDate=None, toDate=None,
+                  cell: Optional[float] = None):
+    """
+    SQL and parameters reading heatmap points from latest_crime_reports
+
+    Every located incident, or with ``cell`` the incidents binned into
+    ``cell``-degree squares as (lat, lng, count, severity_sum, severity_max).
+    """
+    conditions, params = heatmap_filters(search, severity, crimeType, crimeSubType, fromDate, toDate)
+    where = "latitude IS NOT NULL AND longitude IS NOT NULL AND severity_rank IS NOT NULL"
+    if conditions:
+        where += " AND " + " AND ".join(conditions)
+
+    if cell is None:
+        return f"SELECT latitude, longitude, severity_rank FROM latest_crime_reports WHERE {where}", params
+
+    query = f"""
+    SELECT
+        (floor(latitude / %s) + 0.5) * %s AS cell_lat,
+        (floor(longitude / %s) + 0.5) * %s AS cell_lng,
+        COUNT(*), SUM(severity_rank), MAX(severity_rank)
+    FROM latest_crime_reports
+    WHERE {where}
+    GROUP BY 1, 2
+    """
+    return query, [cell, cell, cell, cell] + params
+
 @router.get("/heatmap-data")
 def get_heatmap_data(
     search: str = None,
-    severity: str = None,
+    severity: int = None,
     crimeType: str = None,
     crimeSubType: str = None,
     fromDate: str = None,
-    toDate: str = None
+    toDate: str = None,
+    zoom: int = None
 ):
+    """
+    Heatmap points for the filtered reports
+
+    Without ``zoom`` every incident is returned as {lat, lng, severity}.
+    With ``zoom`` incidents are binned into square lat/lng cells about
+    HEATMAP_CELL_PIXELS wide at that zoom level, and each cell comes back
+    as {lat, lng, count, severity_sum, severity_max} at its centre, so the
+    payload is bounded by the visible grid rather than the number of
+    incidents. Binned queries without ``search`` whose cells are at least
+    ROLLUP_CELL_DEGREES wide are answered from the heatmap_rollup table;
+    finer zooms bin the reports directly so cells aren't snapped to the
+    rollup grid.
+    """
+    check_date_filters(fromDate, toDate)
     try:
-        conn = psycopg2.connect(
-            host=DB_HOST, port=DB_PORT, dbname=DB_NAME,
-            user=DB_USER, password=DB_PASSWORD
-        )
-        cursor = conn.cursor()
-        
-        # Start with base query
-        query = """
-        SELECT latitude, longitude, severity_rank FROM latest_crime_reports
-        WHERE latitude IS NOT NULL AND longitude IS NOT NULL AND severity_rank IS NOT NULL
-        """
-        
-        # Build conditions and parameters list
-        conditions = []
-        params = []
-        
-        # Add search filter
-        if search:
-            search_condition = """
-            (
-                LOWER(caller_name) LIKE LOWER(%s) OR
-                LOWER(summary) LIKE LOWER(%s) OR
-                LOWER(primary_location) LIKE LOWER(%s) OR
-                LOWER(specific_landmark) LIKE LOWER(%s) OR
-                LOWER(combined_address) LIKE LOWER(%s) OR
-                LOWER(crime_type) LIKE LOWER(%s) OR
-                LOWER(crime_subtype) LIKE LOWER(%s) OR
-                LOWER(description) LIKE LOWER(%s)
+        rows = None
+        if zoom is not None:
+            cell = heatmap_cell_size(zoom)
+            if not search and cell >= ROLLUP_CELL_DEGREES:
+                rows = heatmap_cells_from_rollup(cell, severity, crimeType, crimeSubType, fromDate, toDate)
+
+        if rows is None:
+            query, params = heatmap_query(
+                search, severity, crimeType, crimeSubType, fromDate, toDate, cell if zoom is not None else None
             )
-            """
-            search_param = f"%{search}%"
-            conditions.append(search_condition)
-            params.extend([search_param] * 8)  # 8 fields to search
-        
-        # Add severity filter
-        if severity:
-            conditions.append("severity_rank = %s")
-            params.append(severity)
-        
-        # Add crime type filter
-        if crimeType:
-            conditions.append("LOWER(crime_type) = LOWER(%s)")
-            params.append(crimeType)
-        
-        # Add crime subtype filter
-        if crimeSubType:
-            conditions.append("LOWER(crime_subtype) = LOWER(%s)")
-            params.append(crimeSubType)
-        
-        # Add date filters
-        if fromDate:
-            conditions.append("created_at >= %s")
-            params.append(fromDate)
-        
-        if toDate:
-            conditions.append("created_at <= %s")
-            params.append(toDate)
-        
-        # Add conditions to query if any
-        if conditions:
-            query += " AND " + " AND ".join(conditions)
-        
-        # Add order by
-        query += " ORDER BY created_at DESC"
-        
-        # Execute query with parameters
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        
+
+            # Execute query with parameters
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    with query_timer("heatmap"):
+                        cursor.execute(query, params)
+                        rows = cursor.fetchall()
+
+        if zoom is None:
+            data = [
+                {"lat": row[0], "lng": row[1], "severity": row[2]} for row in rows
+            ]
+            return {"data": data}
+
         data = [
-            {"lat": row[0], "lng": row[1], "severity": row[2]} for row in rows
+            {"lat": row[0], "lng": row[1], "count": row[2], "severity_sum": row[3], "severity_max": row[4]}
+            for row in rows
         ]
-        cursor.close()
-        conn.close()
-        return {"data": data}
+        return {"data": data, "cell_size": cell}
     except Exception as e:
         print(f"Heatmap data error: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "crime_reports.ndjson"),
+    "csv": ("text/csv", "crime_reports.csv"),
+}
+
+def export_batches(query: str, params: list, columns: List[str]):
+    """
+    Filtered reports in batches of EXPORT_FETCH_SIZE rows
+
+    Rows come from a named (server-side) cursor, so only one batch is held
+    in memory at a time. The pooled connection is returned when the export
+    finishes or the client goes away.
+    """
+    with get_connection() as conn:
+        with conn.cursor(name="report_export") as db_cursor:
+            db_cursor.itersize = EXPORT_FETCH_SIZE
+            db_cursor.execute(query, params)
+            while True:
+                rows = db_cursor.fetchmany(EXPORT_FETCH_SIZE)
+                if not rows:
+                    break
+                yield rows_to_records(columns, rows)
+        conn.rollback()
+
+def ndjson_lines(batches):
+    for records in batches:
+        yield "".join(json.dumps(record, default=str) + "\n" for record in records)
+
+def csv_value(value):
+    """Array columns become one "; "-separated cell; NULL elements are left out"""
+    if isinstance(value, list):
+        return "; ".join(str(v) for v in value if v is not None)
+    return value
+
+def csv_lines(batches, columns: List[str]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for records in batches:
+        for record in records:
+            writer.writerow([csv_value(record[column]) for column in columns])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@router.get("/export")
+def export_reports(
+    format: str = "ndjson",
+    fields: str = None,
+    search: str = None,
+    severity: int = None,
+    crimeType: str = None,
+    crimeSubType: str = None,
+    fromDate: str = None,
+    toDate: str = None
+):
+    """
+    Stream every report matching the heatmap filters, oldest first
+
+    Rows are written as they are read, so memory stays flat and the first
+    bytes arrive immediately however many reports match.
+
+    Args:
+        format: ``ndjson`` (one JSON object per line) or ``csv``
+        fields: Comma-separated columns to export; all by default
+        search, severity, crimeType, crimeSubType, fromDate, toDate: Same filters as /heatmap-data
+
+    Returns:
+        A streamed ``crime_reports.ndjson`` or ``crime_reports.csv`` attachment
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    columns = parse_fields(fields)
+    # Bad dates are rejected here rather than failing halfway through the stream
+    check_date_filters(fromDate, toDate)
+
+    conditions, params = heatmap_filters(search, severity, crimeType, crimeSubType, fromDate, toDate)
+    query = f"SELECT {', '.join(columns)} FROM latest_crime_reports"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY created_at, id"
+
+    batches = export_batches(query, params, columns)
+    body = ndjson_lines(batches) if format == "ndjson" else csv_lines(batches, columns)
+    media_type, filename = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/pool-stats")
+def get_pool_stats():
+    return pool_stats()
+
 @router.get("/get-maps-link")
 def get_maps_link(lat: float, lng: float):
     """Generate a Google Maps URL from latitude and longitude coordinates"""
@@ -0,0 +1 @@
+# Offline pipeline benchmarks; run with python -m benchmarks
@@ -0,0 +1,152 @@
+"""
+Offline benchmark of the audio pipeline against local Whisper/GPT/Maps stand-ins.
+
+Run from the backend directory, e.g.:
+
+    python -m benchmarks --files 40 --workers 1,4,8 --mode file,async --skip-db
+    python -m benchmarks --gpt-ms 2000 --throttle-rate 0.05 --json results.json
+
+Every (mode, workers) pair runs in its own process against the same mock
+servers and synthetic WAV batch, and reports throughput, end-to-end and
+per-stage p50/p95/p99 latency, error counts and peak RSS. Without
+--skip-db tickets are inserted into the configured Postgres database.
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+from benchmarks.mock_servers import Behavior, MockServer
+from benchmarks.wavgen import generate_batch
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=40, help="synthetic calls per run")
+    parser.add_argument("--seconds", type=float, default=5.0, help="length of each synthetic call")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="sample rate of the synthetic calls")
+    parser.add_argument("--channels", type=int, default=1, help="channels of the synthetic calls")
+    parser.add_argument("--silence", type=float, default=0.0, help="seconds of dead air before and after each call")
+    parser.add_argument("--no-preprocess", action="store_true", help="upload audio to Whisper as-is")
+    parser.add_argument("--workers", default="1,4,8", help="comma-separated worker counts")
+    parser.add_argument("--mode", default="file", help="comma-separated: file, batch, async, upload")
+    parser.add_argument("--whisper-ms", type=float, default=800, help="mock Whisper latency")
+    parser.add_argument("--gpt-ms", type=float, default=1500, help="mock GPT latency")
+    parser.add_argument("--maps-ms", type=float, default=80, help="mock geocoder latency")
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency spread as a fraction of the mean")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of mock calls answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of mock calls answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with a 429")
+    parser.add_argument("--geocoders", default="google", help="GEOCODER_BACKENDS for the run")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="keep the configured client-side RPM/TPM limits")
+    parser.add_argument("--skip-db", action="store_true", help="don't insert tickets into Postgres")
+    parser.add_argument("--json", help="also write all reports to this file")
+    return parser.parse_args(argv)
+
+
+def run_env(args, server, workdir, workers):
+    env = dict(os.environ)
+    env.update(server.endpoints())
+    env.update({
+        "WHISPER_API_KEY": "benchmark",
+        "GPT_API_KEY": "benchmark",
+        "GOOGLE_MAPS_API_KEY": "benchmark",
+        "GEOCODER_BACKENDS": args.geocoders,
+        # Fresh caches per run so nothing is served from a previous run
+        "CACHE_DIR": os.path.join(workdir, "cache"),
+        "RESULT_CACHE_PATH": os.path.join(workdir, "cache", "audio_results.sqlite3"),
+        "GEOCODE_CACHE_PATH": os.path.join(workdir, "cache", "geocode.sqlite3"),
+        "JOBS_DIR": os.path.join(workdir, "jobs"),
+        "UPLOAD_DIR": os.path.join(workdir, "uploads"),
+        "OUTPUT_DIR": os.path.join(workdir, "output"),
+        "JOB_WORKERS": str(workers),
+        "ASYNC_TRANSCRIBE_CONCURRENCY": str(workers),
+        "ASYNC_ANALYZE_CONCURRENCY": str(workers),
+        "ASYNC_GEOCODE_CONCURRENCY": str(workers),
+        "WHISPER_MAX_CONCURRENCY": str(workers),
+        "WHISPER_MAX_CONNECTIONS": str(workers),
+        "WHISPER_BACKOFF_BASE": "0.1",
+    })
+    if args.no_preprocess:
+        env["AUDIO_PREPROCESS"] = "false"
+    if not args.keep_rate_limits:
+        for name in ("RATE_LIMIT_WHISPER_RPM", "RATE_LIMIT_GPT_RPM", "RATE_LIMIT_GPT_TPM", "RATE_LIMIT_MAPS_RPM"):
+            env[name] = "0"
+    return env
+
+
+def print_report(report):
+    e2e = report["end_to_end"]
+    print(
+        f"{report['mode']:>6} x{report['workers']:<3} "
+        f"{report['throughput_files_per_s']:>8.2f} files/s  "
+        f"e2e p50 {e2e.get('p50_ms', 0):>8.0f} p95 {e2e.get('p95_ms', 0):>8.0f} p99 {e2e.get('p99_ms', 0):>8.0f} ms  "
+        f"errors {report['errors']:<4} peak RSS {report['peak_rss_mb']:.0f} MB"
+    )
+    for name, stage in report["stages"].items():
+        if stage.get("count"):
+            print(
+                f"{'':12}{name:<14} n={stage['count']:<5} "
+                f"p50 {stage['p50_ms']:>8.0f} p95 {stage['p95_ms']:>8.0f} p99 {stage['p99_ms']:>8.0f} ms"
+            )
+    for error in report["sample_errors"]:
+        print(f"{'':12}error: {error}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    modes = [m.strip() for m in args.mode.split(",") if m.strip()]
+    worker_counts = [int(w) for w in args.workers.split(",") if w.strip()]
+
+    server = MockServer(
+        whisper=Behavior(args.whisper_ms, args.jitter, args.error_rate, args.throttle_rate, args.retry_after),
+        gpt=Behavior(args.gpt_ms, args.jitter, args.error_rate, args.throttle_rate, args.retry_after),
+        maps=Behavior(args.maps_ms, args.jitter, args.error_rate, args.throttle_rate, args.retry_after),
+    ).start()
+
+    reports = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="dial112-bench-") as tmp:
+            files_dir = os.path.join(tmp, "calls")
+            generate_batch(files_dir, args.files, args.seconds, args.sample_rate, args.channels, args.silence)
+            print(f"Mock services on {server.base_url}; {args.files} calls of {args.seconds:.0f}s each")
+
+            for mode in modes:
+                for workers in worker_counts:
+                    workdir = os.path.join(tmp, f"{mode}-{workers}")
+                    os.makedirs(workdir)
+                    out = os.path.join(workdir, "report.json")
+                    command = [
+                        sys.executable, "-m", "benchmarks.harness",
+                        "--mode", mode, "--workers", str(workers),
+                        "--files-dir", files_dir, "--out", out
+                    ]
+                    if args.skip_db:
+                        command.append("--skip-db")
+                    completed = subprocess.run(
+                        command, cwd=BACKEND_DIR, env=run_env(args, server, workdir, workers),
+                        stdout=subprocess.DEVNULL
+                    )
+                    if completed.returncode != 0 or not os.path.exists(out):
+                        print(f"{mode:>6} x{workers:<3} failed (exit code {completed.returncode})")
+                        continue
+                    with open(out, encoding="utf-8") as f:
+                        report = json.load(f)
+                    reports.append(report)
+                    print_report(report)
+    finally:
+        server.stop()
+
+    print("Mock calls: " + ", ".join(f"{key}={count}" for key, count in sorted(server.counts.items())))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"reports": reports, "mock_calls": dict(server.counts)}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Runs one benchmark configuration in a fresh process.
+
+Started by ``python -m benchmarks``, which points the backend at the mock
+services through environment variables before this module imports it, so
+every run gets its own config, caches and peak-RSS figure.
+"""
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import resource
+import threading
+import concurrent.futures
+from collections import defaultdict
+
+timings = defaultdict(list)
+_timings_lock = threading.Lock()
+
+
+def record(name, seconds):
+    with _timings_lock:
+        timings[name].append(seconds)
+
+
+def timed(name, fn):
+    """Wrap a sync or async callable so each call's duration lands in ``timings[name]``"""
+    if asyncio.iscoroutinefunction(fn):
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - started)
+        return async_wrapper
+
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record(name, time.perf_counter() - started)
+    return wrapper
+
+
+def instrument(audio, skip_db):
+    """Time every pipeline stage; with ``skip_db`` ticket inserts succeed without touching Postgres"""
+    from utils.whisper_client import WhisperClient, AsyncWhisperClient
+    WhisperClient.transcribe = timed("transcribe", WhisperClient.transcribe)
+    AsyncWhisperClient.transcribe = timed("transcribe", AsyncWhisperClient.transcribe)
+
+    if skip_db:
+        def write(batch):
+            for record, future in batch:
+                future.set_result(record["ticket_id"])
+        audio.bulk_writer._write = write
+
+    stages = (
+        ("analyze", "analyze_transcript"),
+        ("analyze", "analyze_transcript_async"),
+        ("analyze_batch", "analyze_transcripts_batch"),
+        ("geocode", "get_approx_lat_lng"),
+        ("geocode", "get_approx_lat_lng_async"),
+        ("write_output", "write_analysis_output"),
+    )
+    for name, attr in stages:
+        setattr(audio, attr, timed(name, getattr(audio, attr)))
+    # Every pipeline writes tickets through the bulk writer; time its flushes
+    audio.bulk_writer._write = timed("db_insert", audio.bulk_writer._write)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(values):
+    """Latency summary in milliseconds"""
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+
+def is_error(result):
+    return result.get("status") != "success" or result.get("db_status") == "failed to insert"
+
+
+def run_file_mode(audio, files, workers):
+    def one(file_info):
+        started = time.perf_counter()
+        result = audio.process_audio_file(file_info)
+        record("end_to_end", time.perf_counter() - started)
+        return result
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(one, files))
+
+
+def run_batch_mode(audio, files, workers):
+    # process_audio_batch fans out on its own executor, sized by JOB_WORKERS
+    started = time.perf_counter()
+    results = audio.process_audio_batch(files)
+    record("end_to_end", time.perf_counter() - started)
+    return results
+
+
+def run_async_mode(audio, files, workers):
+    async def main():
+        limit = asyncio.Semaphore(workers)
+
+        async def one(file_info):
+            async with limit:
+                started = time.perf_counter()
+                result = await audio.process_audio_file_async(file_info)
+                record("end_to_end", time.perf_counter() - started)
+                return result
+
+        return await asyncio.gather(*(one(f) for f in files))
+
+    return asyncio.run(main())
+
+
+def run_upload_mode(audio, files, workers):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+    app.include_router(audio.router, prefix="/audio")
+    audio.job_queue.start()
+    results = []
+
+    with TestClient(app) as client:
+        def one(file_info):
+            filename, path = file_info
+            started = time.perf_counter()
+            with open(path, "rb") as f:
+                response = client.post("/audio/upload-and-process/", files=[("files", (filename, f, "audio/wav"))])
+            record("end_to_end", time.perf_counter() - started)
+            if response.status_code != 200:
+                return [{"file": filename, "status": "error", "error": response.text}]
+            return response.json()["results"]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            for batch in pool.map(one, files):
+                results.extend(batch)
+
+    audio.job_queue.shutdown()
+    return results
+
+
+MODES = {
+    "file": run_file_mode,
+    "batch": run_batch_mode,
+    "async": run_async_mode,
+    "upload": run_upload_mode,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=sorted(MODES), required=True)
+    parser.add_argument("--workers", type=int, required=True)
+    parser.add_argument("--files-dir", required=True)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--skip-db", action="store_true")
+    args = parser.parse_args(argv)
+
+    from api.routes import audio
+    instrument(audio, args.skip_db)
+
+    files = [
+        (name, os.path.join(args.files_dir, name))
+        for name in sorted(os.listdir(args.files_dir)) if name.endswith(".wav")
+    ]
+
+    started = time.perf_counter()
+    results = MODES[args.mode](audio, files, args.workers)
+    wall = time.perf_counter() - started
+
+    errors = [r for r in results if is_error(r)]
+    report = {
+        "mode": args.mode,
+        "workers": args.workers,
+        "files": len(files),
+        "wall_seconds": round(wall, 3),
+        "throughput_files_per_s": round(len(files) / wall, 3) if wall else None,
+        "errors": len(errors),
+        "sample_errors": [e.get("error") for e in errors[:5]],
+        "end_to_end": summarize(timings.get("end_to_end", [])),
+        "stages": {name: summarize(values) for name, values in sorted(timings.items()) if name != "end_to_end"},
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
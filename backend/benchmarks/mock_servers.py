@@ -0,0 +1,309 @@
+import re
+import ssl
+import json
+import time
+import random
+import socket
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+TRANSCRIPTS = (
+    "Hello 112, my name is Ravi. Someone snatched my gold chain near the bus stand in Vijayawada, "
+    "close to the Benz Circle. Please send police quickly.",
+    "This is Lakshmi calling from Guntur, near Lakshmipuram main road. There has been a car accident "
+    "and two people are injured.",
+    "My name is Suresh, I am in Visakhapatnam near RK Beach. A group of men are fighting and one has a knife.",
+    "Sir, I am calling from Tirupati, near the railway station. My phone was stolen from my bag ten minutes ago.",
+)
+
+ANALYSES = (
+    ("Robbery", "Chain Snatching", "Ravi", "Vijayawada", "Benz Circle"),
+    ("Accident", "Car Accident", "Lakshmi", "Guntur", "Lakshmipuram main road"),
+    ("Assault", "Knife Attack", "Suresh", "Visakhapatnam", "RK Beach"),
+    ("Theft", "Mobile Theft", "Unknown", "Tirupati", "Railway station"),
+)
+
+
+class Behavior:
+    """Latency and failure profile of one mocked service"""
+
+    def __init__(self, latency_ms=0.0, jitter=0.2, error_rate=0.0, throttle_rate=0.0, retry_after=1):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+
+    def delay(self) -> float:
+        spread = self.latency_ms * self.jitter
+        return max(0.0, random.uniform(self.latency_ms - spread, self.latency_ms + spread)) / 1000.0
+
+
+def analysis_object(seed: int) -> dict:
+    crime, subtype, caller, city, landmark = ANALYSES[seed % len(ANALYSES)]
+    return {
+        "summary": f"{crime} reported near {landmark}, {city}.",
+        "caller_name": caller,
+        "primary_location": city,
+        "specific_landmark": landmark,
+        "state_region": "Andhra Pradesh",
+        "combined_address": f"{landmark}, {city}, Andhra Pradesh, India",
+        "address_variations": [f"{landmark} {city}", city],
+        "additional_context": "",
+        "crimeType": crime,
+        "crimeSubType": subtype,
+        "description": f"Caller reports {subtype.lower()} near {landmark}."
+    }
+
+
+def chat_completion(content: str, prompt_chars: int) -> dict:
+    completion_tokens = len(content) // 4 + 1
+    prompt_tokens = prompt_chars // 4 + 1
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "mock",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content}
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
+
+
+class MockServer:
+    """
+    One local HTTP server standing in for Whisper, Azure OpenAI chat and the Maps geocoder.
+
+    Routes are picked by path: ``/audio/transcriptions``, ``/chat/completions``
+    and ``/geocode/json``. Each service answers after its configured latency,
+    fails with a 500 at ``error_rate`` and with a 429 plus Retry-After at
+    ``throttle_rate``. Request counts per service and status, and the bytes
+    uploaded to Whisper, are kept in ``counts``.
+    """
+
+    def __init__(self, whisper: Behavior, gpt: Behavior, maps: Behavior, host: str = "127.0.0.1", port: int = 0):
+        self.behaviors = {"whisper": whisper, "gpt": gpt, "maps": maps}
+        self.counts = Counter()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def endpoints(self) -> dict:
+        """Environment overrides pointing the backend at this server"""
+        return {
+            "WHISPER_ENDPOINT": f"{self.base_url}/openai/deployments/whisper/audio/transcriptions",
+            "GPT_ENDPOINT": self.base_url,
+            "GEOCODE_URL": f"{self.base_url}/maps/api/geocode/json",
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-services", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _count(self, service, status, amount=1):
+        with self._lock:
+            self.counts[f"{service} {status}"] += amount
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                self._dispatch()
+
+            def do_POST(self):
+                self._dispatch()
+
+            def _send(self, status, body, content_type="application/json", headers=None):
+                payload = body if isinstance(body, bytes) else body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _dispatch(self):
+                path = urlparse(self.path).path
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+
+                if path.endswith("/audio/transcriptions"):
+                    service = "whisper"
+                    server._count("whisper", "bytes", len(body))
+                elif path.endswith("/chat/completions"):
+                    service = "gpt"
+                elif path.endswith("/geocode/json"):
+                    service = "maps"
+                else:
+                    self._send(404, json.dumps({"error": "unknown route"}))
+                    return
+
+                behavior = server.behaviors[service]
+                time.sleep(behavior.delay())
+                roll = random.random()
+                if roll < behavior.throttle_rate:
+                    server._count(service, 429)
+                    self._send(429, json.dumps({"error": {"code": "429", "message": "Rate limit"}}),
+                               headers={"Retry-After": str(behavior.retry_after)})
+                    return
+                if roll < behavior.throttle_rate + behavior.error_rate:
+                    server._count(service, 500)
+                    self._send(500, json.dumps({"error": {"code": "500", "message": "Mock failure"}}))
+                    return
+
+                server._count(service, 200)
+                if service == "whisper":
+                    self._send(200, random.choice(TRANSCRIPTS), content_type="text/plain")
+                elif service == "gpt":
+                    self._send(200, json.dumps(self._completion(body)))
+                else:
+                    self._send(200, json.dumps({
+                        "status": "OK",
+                        "results": [{"geometry": {"location": {
+                            "lat": round(random.uniform(13.0, 19.0), 6),
+                            "lng": round(random.uniform(77.0, 84.5), 6)
+                        }}}]
+                    }))
+
+            def _completion(self, body):
+                request = json.loads(body or b"{}")
+                prompt = "".join(m.get("content") or "" for m in request.get("messages", []))
+                batch = re.search(r"There are (\d+) separate transcripts", prompt)
+                if batch:
+                    content = {"results": [
+                        dict(analysis_object(i), index=i) for i in range(int(batch.group(1)))
+                    ]}
+                else:
+                    content = analysis_object(random.randrange(len(ANALYSES)))
+                return chat_completion(json.dumps(content), len(prompt))
+
+        return Handler
+
+
+class H2WhisperServer:
+    """
+    TLS + HTTP/2 stand-in for the Whisper endpoint, used to check that uploads are multiplexed
+
+    Every request is answered with a transcript ``latency`` seconds after its
+    body has arrived, so concurrent uploads overlap. ``connections`` counts
+    accepted connections and ``peak_streams`` the most requests open at once
+    on any one of them. Needs the ``h2`` package and a certificate the client
+    trusts for 127.0.0.1.
+    """
+
+    def __init__(self, certfile: str, keyfile: str, latency: float = 0.2, host: str = "127.0.0.1", port: int = 0):
+        self.certfile = certfile
+        self.latency = latency
+        self.connections = 0
+        self.peak_streams = 0
+        self._lock = threading.Lock()
+        self._context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self._context.load_cert_chain(certfile, keyfile)
+        self._context.set_alpn_protocols(["h2"])
+        self._sock = socket.create_server((host, port))
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._sock.getsockname()[:2]
+        return f"https://{host}:{port}"
+
+    def endpoints(self) -> dict:
+        return {"WHISPER_ENDPOINT": f"{self.base_url}/openai/deployments/whisper/audio/transcriptions"}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._accept_loop, name="mock-whisper-h2", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._sock.close()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                raw, _ = self._sock.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.connections += 1
+            threading.Thread(target=self._serve, args=(raw,), daemon=True).start()
+
+    def _serve(self, raw):
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        try:
+            sock = self._context.wrap_socket(raw, server_side=True)
+        except OSError:
+            raw.close()
+            return
+
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        send_lock = threading.Lock()
+        open_streams = set()
+
+        def respond(stream_id):
+            body = random.choice(TRANSCRIPTS).encode("utf-8")
+            try:
+                with send_lock:
+                    open_streams.discard(stream_id)
+                    conn.send_headers(stream_id, [
+                        (":status", "200"), ("content-type", "text/plain"), ("content-length", str(len(body)))
+                    ])
+                    conn.send_data(stream_id, body, end_stream=True)
+                    sock.sendall(conn.data_to_send())
+            except Exception:
+                pass
+
+        try:
+            with send_lock:
+                conn.initiate_connection()
+                sock.sendall(conn.data_to_send())
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                with send_lock:
+                    for event in conn.receive_data(data):
+                        if isinstance(event, h2.events.RequestReceived):
+                            open_streams.add(event.stream_id)
+                            with self._lock:
+                                self.peak_streams = max(self.peak_streams, len(open_streams))
+                        elif isinstance(event, h2.events.DataReceived):
+                            conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                        elif isinstance(event, h2.events.StreamEnded):
+                            threading.Timer(self.latency, respond, (event.stream_id,)).start()
+                    sock.sendall(conn.data_to_send())
+        except OSError:
+            pass
+        finally:
+            sock.close()
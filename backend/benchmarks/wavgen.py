@@ -0,0 +1,51 @@
+import os
+import math
+import wave
+import random
+import struct
+from typing import List, Tuple
+
+
+def generate_wav(path: str, seconds: float, sample_rate: int = 16000, seed: int = 0,
+                 channels: int = 1, silence: float = 0.0):
+    """
+    16-bit WAV of a few tones plus noise; ``seed`` makes every file's content unique
+
+    ``silence`` seconds of near-silence are added before and after the tones,
+    like the dead air around a real call recording.
+    """
+    rng = random.Random(seed)
+    tones = [rng.uniform(120, 900) for _ in range(3)]
+    quiet = int(silence * sample_rate)
+    frames = bytearray()
+    for n in range(int(seconds * sample_rate) + 2 * quiet):
+        t = n / sample_rate
+        if n < quiet or n >= int(seconds * sample_rate) + quiet:
+            sample = 0.001 * rng.uniform(-1, 1)
+        else:
+            sample = sum(math.sin(2 * math.pi * f * t) for f in tones) / len(tones)
+            sample = 0.6 * sample + 0.1 * rng.uniform(-1, 1)
+        frames += struct.pack("<h", int(sample * 32767 * 0.8)) * channels
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames))
+
+
+def generate_batch(directory: str, count: int, seconds: float = 5.0, sample_rate: int = 16000,
+                   channels: int = 1, silence: float = 0.0) -> List[Tuple[str, str]]:
+    """
+    Write ``count`` synthetic calls named like real uploads (``call_0001_9876500001.wav``)
+
+    Returns:
+        List of (filename, path) pairs as process_audio_file expects them
+    """
+    os.makedirs(directory, exist_ok=True)
+    files = []
+    for i in range(count):
+        filename = f"call_{i:04d}_98765{i:05d}.wav"
+        path = os.path.join(directory, filename)
+        generate_wav(path, seconds, sample_rate, seed=i, channels=channels, silence=silence)
+        files.append((filename, path))
+    return files
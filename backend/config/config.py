@@ -11,25 +11,144 @@ DB_NAME = os.getenv("DB_NAME", "crime_reports")
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
 
+# Connection pooling shared by all routes
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_SQLALCHEMY_POOL_SIZE = int(os.getenv("DB_SQLALCHEMY_POOL_SIZE", "5"))
+DB_SQLALCHEMY_MAX_OVERFLOW = int(os.getenv("DB_SQLALCHEMY_MAX_OVERFLOW", "5"))
+# Bounds each new connection attempt so an unreachable server fails fast instead of hanging
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+
+# Startup: migrations are retried in the background until Postgres is reachable
+MIGRATE_RETRY_MAX_SECONDS = float(os.getenv("MIGRATE_RETRY_MAX_SECONDS", "30"))
+# Longest /readyz waits for a pooled connection before reporting the database unavailable
+READINESS_DB_TIMEOUT = float(os.getenv("READINESS_DB_TIMEOUT", "2"))
+
+# Page sizes for /data/get-data
+DATA_PAGE_SIZE = int(os.getenv("DATA_PAGE_SIZE", "100"))
+DATA_PAGE_SIZE_MAX = int(os.getenv("DATA_PAGE_SIZE_MAX", "500"))
+# Rows per round trip of the server-side cursor behind /data/export
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "2000"))
+# Rows touched this recently are re-sent by /data/changes in case an older transaction commits late
+CHANGES_SAFETY_LAG_SECONDS = float(os.getenv("CHANGES_SAFETY_LAG_SECONDS", "2"))
+
+# Live report stream (/data/stream)
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "500"))
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+
+# Heatmap grid cells are about this many screen pixels wide at the requested zoom
+HEATMAP_CELL_PIXELS = int(os.getenv("HEATMAP_CELL_PIXELS", "16"))
+# Base cell of the heatmap_rollup table; fixed by migrations/versions/0004_heatmap_rollup.py
+ROLLUP_CELL_DEGREES = 0.01
+
 # Directory paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-UPLOAD_DIR = os.path.join(BASE_DIR, "uploaded_audios")
-OUTPUT_DIR = os.path.join(BASE_DIR, "output_json")
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", os.path.join(BASE_DIR, "uploaded_audios"))
+OUTPUT_DIR = os.getenv("OUTPUT_DIR", os.path.join(BASE_DIR, "output_json"))
 EXCEL_FILE_PATH = os.path.join(BASE_DIR, "assets", "crime_types.xlsx")
+TAXONOMY_PATH = os.getenv("TAXONOMY_PATH", os.path.join(BASE_DIR, "assets", "Crime Types & Sub-Types_cleaned.json"))
+TAXONOMY_RELOAD_CHECK_SECONDS = float(os.getenv("TAXONOMY_RELOAD_CHECK_SECONDS", "5"))
+JOBS_DIR = os.getenv("JOBS_DIR", os.path.join(BASE_DIR, "jobs"))
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(BASE_DIR, "cache"))
 
 # Ensure directories exist
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Background job queue for audio processing
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_MAX_PENDING = int(os.getenv("JOB_QUEUE_MAX_PENDING", "200"))
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+
+# Per-backend request/token budgets for external APIs (0 = unlimited)
+RATE_LIMIT_WHISPER_RPM = float(os.getenv("RATE_LIMIT_WHISPER_RPM", "50"))
+RATE_LIMIT_GPT_RPM = float(os.getenv("RATE_LIMIT_GPT_RPM", "300"))
+RATE_LIMIT_GPT_TPM = float(os.getenv("RATE_LIMIT_GPT_TPM", "50000"))
+RATE_LIMIT_MAPS_RPM = float(os.getenv("RATE_LIMIT_MAPS_RPM", "3000"))
+
+# Bulk ticket inserts: rows per flush and max seconds a row waits in the buffer
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "500"))
+BULK_INSERT_FLUSH_SECONDS = float(os.getenv("BULK_INSERT_FLUSH_SECONDS", "1.0"))
+
+# Per-stage concurrency for the asyncio pipeline
+ASYNC_TRANSCRIBE_CONCURRENCY = int(os.getenv("ASYNC_TRANSCRIBE_CONCURRENCY", "32"))
+ASYNC_ANALYZE_CONCURRENCY = int(os.getenv("ASYNC_ANALYZE_CONCURRENCY", "32"))
+ASYNC_GEOCODE_CONCURRENCY = int(os.getenv("ASYNC_GEOCODE_CONCURRENCY", "64"))
+
+# Streaming upload limits (bytes)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+MAX_UPLOAD_FILE_BYTES = int(os.getenv("MAX_UPLOAD_FILE_BYTES", str(100 * 1024 * 1024)))
+MAX_UPLOAD_REQUEST_BYTES = int(os.getenv("MAX_UPLOAD_REQUEST_BYTES", str(500 * 1024 * 1024)))
+
+# Content-hash cache of pipeline results for re-uploaded audio
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", os.path.join(CACHE_DIR, "audio_results.sqlite3"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", str(30 * 86400)))
+# Retention is applied after this many writes or seconds, whichever comes first
+RESULT_CACHE_EVICT_EVERY = int(os.getenv("RESULT_CACHE_EVICT_EVERY", "100"))
+RESULT_CACHE_EVICT_INTERVAL = float(os.getenv("RESULT_CACHE_EVICT_INTERVAL", "60"))
+
 # Azure OpenAI configuration
 WHISPER_ENDPOINT = os.getenv("WHISPER_ENDPOINT", "https://your-whisper-endpoint.openai.azure.com/openai/deployments/whisper/audio/transcriptions")
 WHISPER_API_KEY = os.getenv("WHISPER_API_KEY", "your-whisper-api-key")
 WHISPER_API_VERSION = os.getenv("WHISPER_API_VERSION", "2023-09-01-preview")
 
+# Audio preprocessing before upload to Whisper: downmix to mono, resample,
+# trim leading/trailing silence (frames this many dB below the loudest one)
+# and write 16-bit PCM
+AUDIO_PREPROCESS = os.getenv("AUDIO_PREPROCESS", "true").lower() in ("1", "true", "yes")
+AUDIO_TARGET_SAMPLE_RATE = int(os.getenv("AUDIO_TARGET_SAMPLE_RATE", "16000"))
+AUDIO_SILENCE_THRESHOLD_DB = float(os.getenv("AUDIO_SILENCE_THRESHOLD_DB", "40"))
+AUDIO_SILENCE_PAD_SECONDS = float(os.getenv("AUDIO_SILENCE_PAD_SECONDS", "0.3"))
+
+# Shared Whisper HTTP client: timeouts (seconds), pool size and retry policy
+WHISPER_CONNECT_TIMEOUT = float(os.getenv("WHISPER_CONNECT_TIMEOUT", "5"))
+WHISPER_READ_TIMEOUT = float(os.getenv("WHISPER_READ_TIMEOUT", "120"))
+WHISPER_MAX_CONNECTIONS = int(os.getenv("WHISPER_MAX_CONNECTIONS", "10"))
+WHISPER_MAX_CONCURRENCY = int(os.getenv("WHISPER_MAX_CONCURRENCY", "8"))
+WHISPER_MAX_RETRIES = int(os.getenv("WHISPER_MAX_RETRIES", "4"))
+WHISPER_BACKOFF_BASE = float(os.getenv("WHISPER_BACKOFF_BASE", "0.5"))
+WHISPER_BACKOFF_MAX = float(os.getenv("WHISPER_BACKOFF_MAX", "30"))
+# HTTP/2 multiplexes concurrent uploads over one TLS connection; without the
+# h2 package the client falls back to HTTP/1.1
+WHISPER_HTTP2 = os.getenv("WHISPER_HTTP2", "true").lower() in ("1", "true", "yes")
+
 GPT_ENDPOINT = os.getenv("GPT_ENDPOINT", "https://your-gpt-endpoint.openai.azure.com")
 GPT_API_KEY = os.getenv("GPT_API_KEY", "your-gpt-api-key")
 GPT_API_VERSION = os.getenv("GPT_API_VERSION", "2023-07-01-preview")
 GPT_DEPLOYMENT = os.getenv("GPT_DEPLOYMENT", "gpt-35-turbo")
+# Enough for the eleven-key analysis object; the old 4096 reserved far more than needed
+GPT_MAX_TOKENS = int(os.getenv("GPT_MAX_TOKENS", "800"))
+# Batch analysis: transcripts per request and total transcript characters per request
+GPT_BATCH_SIZE = int(os.getenv("GPT_BATCH_SIZE", "8"))
+GPT_BATCH_MAX_CHARS = int(os.getenv("GPT_BATCH_MAX_CHARS", "12000"))
+# Output-token cap of the deployment (4096 for gpt-35-turbo); batches are sized so
+# GPT_MAX_TOKENS per transcript fits under it
+GPT_MAX_COMPLETION_TOKENS = int(os.getenv("GPT_MAX_COMPLETION_TOKENS", "4096"))
+# Transcripts per batch request actually used: the smaller of the configured size and what the cap allows
+GPT_BATCH_LIMIT = max(1, min(GPT_BATCH_SIZE, GPT_MAX_COMPLETION_TOKENS // GPT_MAX_TOKENS))
 
 # Google Maps API configuration
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "your-google-maps-api-key")
+
+GEOCODE_URL = os.getenv("GEOCODE_URL", "https://maps.googleapis.com/maps/api/geocode/json")
+GEOCODE_TIMEOUT = float(os.getenv("GEOCODE_TIMEOUT", "10"))
+
+# Local geocoding cache keyed by normalized address
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", os.path.join(CACHE_DIR, "geocode.sqlite3"))
+GEOCODE_CACHE_MAX_ENTRIES = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "50000"))
+GEOCODE_CACHE_TTL_SECONDS = int(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(90 * 86400)))
+GEOCODE_CACHE_EVICT_EVERY = int(os.getenv("GEOCODE_CACHE_EVICT_EVERY", "100"))
+GEOCODE_CACHE_EVICT_INTERVAL = float(os.getenv("GEOCODE_CACHE_EVICT_INTERVAL", "60"))
+
+# Geocoder backends tried in order: cache, exact gazetteer names (offline), google
+# and partial / fuzzy gazetteer matches as the last resort
+DEFAULT_GEOCODER_BACKENDS = "cache,gazetteer,google,gazetteer_fuzzy"
+GEOCODER_BACKENDS = [
+    b.strip() for b in os.getenv("GEOCODER_BACKENDS", DEFAULT_GEOCODER_BACKENDS).split(",") if b.strip()
+]
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH", os.path.join(BASE_DIR, "assets", "ap_gazetteer.csv"))
+GAZETTEER_MIN_SIMILARITY = float(os.getenv("GAZETTEER_MIN_SIMILARITY", "0.6"))
@@ -1,13 +1,51 @@
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.routes import auth, audio, data
-from models.database import engine, Base
-from config.config import UPLOAD_DIR
+from models.database import engine, connection_pool, ping_database
+from migrations.runner import upgrade_until_ready
+from config.config import UPLOAD_DIR, MIGRATE_RETRY_MAX_SECONDS, READINESS_DB_TIMEOUT
+from utils.metrics import CONTENT_TYPE, render_metrics
+from utils.taxonomy import get_taxonomy
+
+# Set once pending schema migrations have been applied
+schema_ready = threading.Event()
+stop_startup = threading.Event()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing here waits on Postgres: migrations retry in the background until
+    # the database is reachable and /readyz reports when the app can take traffic
+    threading.Thread(
+        target=upgrade_until_ready,
+        args=(engine, schema_ready, stop_startup, MIGRATE_RETRY_MAX_SECONDS),
+        name="migrations",
+        daemon=True
+    ).start()
+    # Load the crime taxonomy ahead of the first analysis
+    threading.Thread(target=get_taxonomy, name="taxonomy-warmup", daemon=True).start()
+
+    # Shared audio workers (resuming jobs from a previous run) and the
+    # single LISTEN connection feeding /data/stream
+    audio.job_queue.start()
+    data.report_listener.start()
+    yield
+
+    stop_startup.set()
+    data.report_listener.stop()
+    audio.job_queue.shutdown()
+    connection_pool.closeall()
+    engine.dispose()
+
 
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Serve uploaded audio files as static files
 app.mount("/uploaded_audios", StaticFiles(directory=UPLOAD_DIR), name="uploaded_audios")
@@ -21,9 +59,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database
-Base.metadata.create_all(bind=engine)
-
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(audio.router, prefix="/audio", tags=["audio"])
@@ -33,3 +68,25 @@ app.include_router(data.router, prefix="/data", tags=["data"])
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Dial 112 AI Analyzer API"}
+
+# Liveness: the process is up and serving, whatever state its dependencies are in
+@app.get("/healthz", include_in_schema=False)
+def healthz():
+    return {"status": "ok"}
+
+# Readiness: schema migrated and the database answering
+@app.get("/readyz", include_in_schema=False)
+def readyz():
+    checks = {
+        "schema": schema_ready.is_set(),
+        "database": ping_database(READINESS_DB_TIMEOUT),
+        "report_listener": data.report_listener.connected
+    }
+    # The stream listener reconnects on its own; it doesn't gate other traffic
+    ready = checks["schema"] and checks["database"]
+    return JSONResponse(status_code=200 if ready else 503, content={"ready": ready, "checks": checks})
+
+# Prometheus scrape endpoint: stage latencies, external calls, DB pool and queue gauges
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
@@ -0,0 +1,34 @@
+"""
+Schema migration commands, run from the backend directory:
+
+    python -m migrations upgrade       # apply pending migrations
+    python -m migrations status        # list migrations and whether they are applied
+
+Index usage of the hot queries is checked by tests/test_query_plans.py.
+"""
+import sys
+
+from models.database import engine
+from migrations.runner import upgrade, status
+
+
+def main(argv):
+    command = argv[0] if argv else "upgrade"
+
+    if command == "upgrade":
+        applied = upgrade(engine)
+        print(f"Applied {len(applied)} migration(s)" if applied else "Schema is up to date")
+        return 0
+
+    if command == "status":
+        for migration in status(engine):
+            mark = "x" if migration["applied"] else " "
+            print(f"[{mark}] {migration['version']:04d}_{migration['name']}: {migration['description']}")
+        return 0
+
+    print(__doc__)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
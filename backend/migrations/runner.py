@@ -0,0 +1,154 @@
+import re
+import time
+import pkgutil
+import importlib
+from typing import Dict, List
+
+from sqlalchemy import text
+
+from migrations import versions
+
+# Any fixed key works; it only keeps two app processes from migrating at once
+ADVISORY_LOCK_KEY = 112112
+
+# How often a process waiting for another one's migrations retries the lock
+LOCK_POLL_SECONDS = 1.0
+
+MIGRATION_NAME = re.compile(r"^(\d{4})_(\w+)$")
+CONCURRENT_INDEX = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.I)
+
+INVALID_INDEX_SQL = """
+SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+WHERE c.relname = :name AND pg_table_is_visible(c.oid) AND NOT i.indisvalid
+"""
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+
+def discover() -> List[Dict]:
+    """Migration modules in migrations/versions, ordered by version"""
+    found = []
+    for module in pkgutil.iter_modules(versions.__path__):
+        match = MIGRATION_NAME.match(module.name)
+        if not match:
+            continue
+        mod = importlib.import_module(f"{versions.__name__}.{module.name}")
+        found.append({
+            "version": int(match.group(1)),
+            "name": match.group(2),
+            "description": (mod.__doc__ or "").strip(),
+            "statements": mod.STATEMENTS,
+            "concurrent": getattr(mod, "CONCURRENT", False),
+        })
+    found.sort(key=lambda m: m["version"])
+    return found
+
+
+def applied_versions(conn) -> set:
+    conn.execute(text(CREATE_TABLE_SQL))
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def _apply(engine, migration: Dict):
+    record = text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)")
+    if migration["concurrent"]:
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in migration["statements"]:
+                drop_invalid_index(conn, statement)
+                conn.execute(text(statement))
+            conn.execute(record, {"version": migration["version"], "name": migration["name"]})
+    else:
+        with engine.begin() as conn:
+            for statement in migration["statements"]:
+                conn.execute(text(statement))
+            conn.execute(record, {"version": migration["version"], "name": migration["name"]})
+
+
+def drop_invalid_index(conn, statement: str):
+    """
+    Drop the INVALID leftover of an interrupted CREATE INDEX CONCURRENTLY
+
+    IF NOT EXISTS would otherwise skip the broken index forever.
+    """
+    match = CONCURRENT_INDEX.search(statement)
+    if match and conn.execute(text(INVALID_INDEX_SQL), {"name": match.group(1)}).first():
+        print(f"Dropping invalid index {match.group(1)} before rebuilding it")
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {match.group(1)}"))
+
+
+def acquire_lock(conn):
+    """
+    Take the migration lock, polling instead of blocking
+
+    A session blocked in pg_advisory_lock() keeps a snapshot open, and
+    CREATE INDEX CONCURRENTLY in the lock holder waits for every open
+    snapshot, so a blocking wait would deadlock concurrent app starts.
+    """
+    while not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}).scalar():
+        time.sleep(LOCK_POLL_SECONDS)
+
+
+def upgrade(engine) -> List[str]:
+    """
+    Apply every pending migration in version order
+
+    Each migration runs in its own transaction (or statement by statement
+    when it is marked CONCURRENT) and is recorded in schema_migrations.
+    A session-level advisory lock serialises concurrent app starts.
+
+    Returns:
+        Names of the migrations applied by this call
+    """
+    applied = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        acquire_lock(lock_conn)
+        try:
+            done = applied_versions(lock_conn)
+            for migration in discover():
+                if migration["version"] in done:
+                    continue
+                label = f"{migration['version']:04d}_{migration['name']}"
+                print(f"Applying migration {label}")
+                _apply(engine, migration)
+                applied.append(label)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+    return applied
+
+
+def upgrade_until_ready(engine, ready, stop, max_delay: float = 30.0):
+    """
+    Run upgrade() until it succeeds, backing off while the database is unreachable
+
+    Meant for a background thread at app startup so the process comes up
+    (and answers liveness checks) before Postgres does. ``ready`` is set
+    once the schema is current; setting ``stop`` abandons the retries.
+    """
+    delay = 1.0
+    while not stop.is_set():
+        try:
+            upgrade(engine)
+            ready.set()
+            return
+        except Exception as e:
+            print(f"Migrations failed, retrying in {delay:.0f}s: {e}")
+            stop.wait(delay)
+            delay = min(delay * 2, max_delay)
+
+
+def status(engine) -> List[Dict]:
+    """Every known migration with whether it has been applied"""
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+        conn.commit()
+    return [
+        {"version": m["version"], "name": m["name"], "applied": m["version"] in done, "description": m["description"]}
+        for m in discover()
+    ]
@@ -0,0 +1,41 @@
+"""Tables and indexes as originally created by Base.metadata.create_all"""
+
+STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id SERIAL PRIMARY KEY,
+        username VARCHAR,
+        hashed_password VARCHAR,
+        is_active INTEGER
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_users_id ON users (id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username)",
+    """
+    CREATE TABLE IF NOT EXISTS latest_crime_reports (
+        id SERIAL PRIMARY KEY,
+        ticket_id VARCHAR,
+        phone_number VARCHAR,
+        caller_name VARCHAR,
+        summary TEXT,
+        primary_location VARCHAR,
+        specific_landmark VARCHAR,
+        state_region VARCHAR,
+        combined_address VARCHAR,
+        address_variations VARCHAR[],
+        additional_context TEXT,
+        crime_type VARCHAR,
+        crime_subtype VARCHAR,
+        description TEXT,
+        severity_rank INTEGER,
+        audio_file VARCHAR,
+        created_at TIMESTAMPTZ DEFAULT now(),
+        latitude FLOAT,
+        longitude FLOAT,
+        status VARCHAR,
+        officer_assigned VARCHAR
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_latest_crime_reports_id ON latest_crime_reports (id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_latest_crime_reports_ticket_id ON latest_crime_reports (ticket_id)",
+)
@@ -0,0 +1,30 @@
+"""updated_at maintained by trigger, plus the keyset indexes for get-data and changes"""
+
+STATEMENTS = (
+    """
+    ALTER TABLE latest_crime_reports
+        ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_latest_crime_reports_created_at_id
+        ON latest_crime_reports (created_at, id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_latest_crime_reports_updated_at_id
+        ON latest_crime_reports (updated_at, id)
+    """,
+    """
+    CREATE OR REPLACE FUNCTION latest_crime_reports_touch() RETURNS trigger AS $$
+    BEGIN
+        NEW.updated_at := now();
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS latest_crime_reports_touch ON latest_crime_reports",
+    """
+    CREATE TRIGGER latest_crime_reports_touch
+        BEFORE UPDATE ON latest_crime_reports
+        FOR EACH ROW EXECUTE FUNCTION latest_crime_reports_touch()
+    """,
+)
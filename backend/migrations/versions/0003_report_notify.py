@@ -0,0 +1,19 @@
+"""NOTIFY crime_reports on insert/update to wake the /data/stream listener"""
+
+STATEMENTS = (
+    # The payload stays tiny; the listener loads the row after commit
+    """
+    CREATE OR REPLACE FUNCTION latest_crime_reports_notify() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('crime_reports', json_build_object('op', TG_OP, 'id', NEW.id)::text);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS latest_crime_reports_notify ON latest_crime_reports",
+    """
+    CREATE TRIGGER latest_crime_reports_notify
+        AFTER INSERT OR UPDATE ON latest_crime_reports
+        FOR EACH ROW EXECUTE FUNCTION latest_crime_reports_notify()
+    """,
+)
@@ -0,0 +1,69 @@
+"""heatmap_rollup summary table, kept in step with latest_crime_reports by trigger"""
+
+# Base cells are 0.01 degrees; config.ROLLUP_CELL_DEGREES must match
+STATEMENTS = (
+    # Heatmap rollup: incidents per UTC day x type x subtype x severity x base cell.
+    # Severity is part of the key, so per-group sums and maxima follow from the count.
+    """
+    CREATE TABLE IF NOT EXISTS heatmap_rollup (
+        day DATE NOT NULL,
+        crime_type TEXT NOT NULL,
+        crime_subtype TEXT NOT NULL,
+        severity_rank INTEGER NOT NULL,
+        cell_lat INTEGER NOT NULL,
+        cell_lng INTEGER NOT NULL,
+        incidents INTEGER NOT NULL,
+        PRIMARY KEY (day, crime_type, crime_subtype, severity_rank, cell_lat, cell_lng)
+    )
+    """,
+    """
+    CREATE OR REPLACE FUNCTION heatmap_rollup_apply(r latest_crime_reports, delta INTEGER) RETURNS void AS $$
+    BEGIN
+        IF r.latitude IS NULL OR r.longitude IS NULL OR r.severity_rank IS NULL THEN
+            RETURN;
+        END IF;
+        INSERT INTO heatmap_rollup AS h
+            (day, crime_type, crime_subtype, severity_rank, cell_lat, cell_lng, incidents)
+        VALUES (
+            (r.created_at AT TIME ZONE 'UTC')::date,
+            COALESCE(r.crime_type, ''), COALESCE(r.crime_subtype, ''), r.severity_rank,
+            floor(r.latitude / 0.01), floor(r.longitude / 0.01), delta
+        )
+        ON CONFLICT (day, crime_type, crime_subtype, severity_rank, cell_lat, cell_lng)
+        DO UPDATE SET incidents = h.incidents + EXCLUDED.incidents;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION heatmap_rollup_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM heatmap_rollup_apply(OLD, -1);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM heatmap_rollup_apply(NEW, 1);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS heatmap_rollup_sync ON latest_crime_reports",
+    """
+    CREATE TRIGGER heatmap_rollup_sync
+        AFTER INSERT OR DELETE OR UPDATE OF latitude, longitude, severity_rank, crime_type, crime_subtype, created_at
+        ON latest_crime_reports
+        FOR EACH ROW EXECUTE FUNCTION heatmap_rollup_sync()
+    """,
+    # One-off backfill when the rollup is first created on a populated table
+    """
+    INSERT INTO heatmap_rollup (day, crime_type, crime_subtype, severity_rank, cell_lat, cell_lng, incidents)
+    SELECT
+        (created_at AT TIME ZONE 'UTC')::date,
+        COALESCE(crime_type, ''), COALESCE(crime_subtype, ''), severity_rank,
+        floor(latitude / 0.01), floor(longitude / 0.01), COUNT(*)
+    FROM latest_crime_reports
+    WHERE latitude IS NOT NULL AND longitude IS NOT NULL AND severity_rank IS NOT NULL
+        AND NOT EXISTS (SELECT 1 FROM heatmap_rollup)
+    GROUP BY 1, 2, 3, 4, 5, 6
+    """,
+)
@@ -0,0 +1,20 @@
+"""Weighted full-text search column with a GIN index"""
+
+STATEMENTS = (
+    # Types and caller first, then places, then the free text. The 'simple'
+    # config keeps local names unstemmed so prefix matches behave predictably.
+    """
+    ALTER TABLE latest_crime_reports
+        ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(crime_type, '') || ' ' || coalesce(crime_subtype, '') || ' '
+                || coalesce(caller_name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(primary_location, '') || ' ' || coalesce(specific_landmark, '')
+                || ' ' || coalesce(combined_address, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(summary, '') || ' ' || coalesce(description, '')), 'C')
+        ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_latest_crime_reports_search_vector
+        ON latest_crime_reports USING GIN (search_vector)
+    """,
+)
@@ -0,0 +1,32 @@
+"""Composite and partial indexes for the dashboard filters and raw heatmap reads"""
+
+# Built without blocking ticket inserts; each statement runs in its own transaction
+CONCURRENT = True
+
+STATEMENTS = (
+    # get-data filtered by status or officer, paged on (created_at, id)
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_latest_crime_reports_status_created_at_id
+        ON latest_crime_reports (status, created_at, id)
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_latest_crime_reports_officer_created_at_id
+        ON latest_crime_reports (officer_assigned, created_at, id)
+    """,
+    # Case-insensitive type/subtype filters shared by get-data and the heatmap
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_latest_crime_reports_type_subtype_created_at
+        ON latest_crime_reports (lower(crime_type), lower(crime_subtype), created_at)
+    """,
+    # Heatmap reads only touch located, ranked reports: date ranges become index-only scans
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_latest_crime_reports_located_created_at
+        ON latest_crime_reports (created_at) INCLUDE (latitude, longitude, severity_rank)
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL AND severity_rank IS NOT NULL
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_latest_crime_reports_located_severity_created_at
+        ON latest_crime_reports (severity_rank, created_at) INCLUDE (latitude, longitude)
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+    """,
+)
@@ -0,0 +1,11 @@
+"""created_at is required: keyset cursors and the date filters depend on it"""
+
+STATEMENTS = (
+    """
+    UPDATE latest_crime_reports
+        SET created_at = updated_at
+        WHERE created_at IS NULL
+    """,
+    "ALTER TABLE latest_crime_reports ALTER COLUMN created_at SET DEFAULT now()",
+    "ALTER TABLE latest_crime_reports ALTER COLUMN created_at SET NOT NULL",
+)
@@ -0,0 +1,179 @@
+import time
+import threading
+import collections
+import concurrent.futures
+from typing import Dict, List, Tuple
+
+from psycopg2.extras import execute_values
+
+TICKET_COLUMNS = (
+    "ticket_id", "phone_number", "caller_name", "summary", "primary_location",
+    "specific_landmark", "state_region", "combined_address",
+    "address_variations", "additional_context", "crime_type", "crime_subtype",
+    "description", "severity_rank", "audio_file", "latitude", "longitude",
+    "status", "officer_assigned"
+)
+
+INSERT_SQL = f"INSERT INTO latest_crime_reports ({', '.join(TICKET_COLUMNS)}) VALUES %s RETURNING ticket_id"
+ROW_TEMPLATE = "(" + ", ".join(f"%({column})s" for column in TICKET_COLUMNS) + ")"
+
+
+class RowRejectedError(Exception):
+    """A buffered record the database refused; carries the insert error"""
+
+
+def write_outcome(future: concurrent.futures.Future) -> Tuple[str, str]:
+    """(ticket_id, error) for a finished Future returned by ``submit``"""
+    try:
+        ticket_id = future.result()
+        return ticket_id, None if ticket_id else "rejected"
+    except Exception as e:
+        return None, str(e)
+
+
+class BulkTicketWriter:
+    """
+    Buffers ticket records and inserts them with execute_values in one transaction.
+
+    A batch is flushed once ``batch_size`` records are waiting or the oldest
+    has waited ``flush_interval`` seconds. If the multi-row insert fails, the
+    batch is replayed row by row under savepoints in the same transaction so
+    only the bad rows are rejected. ``submit`` returns a Future resolving to
+    the inserted ticket ID; a rejected row fails with RowRejectedError
+    carrying the database's error message.
+    """
+
+    def __init__(self, pool, batch_size: int = 500, flush_interval: float = 1.0, max_rejects: int = 1000):
+        self._pool = pool
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: List[Tuple[Dict, concurrent.futures.Future]] = []
+        self._oldest = None
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self.rejects = collections.deque(maxlen=max_rejects)
+        self.inserted = 0
+        self.flushes = 0
+
+    def submit(self, record: Dict) -> concurrent.futures.Future:
+        record = dict(record)
+        record.setdefault("status", "pending")
+        record.setdefault("officer_assigned", None)
+        future = concurrent.futures.Future()
+        with self._cond:
+            self._ensure_thread()
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((record, future))
+            full = len(self._pending) >= self._batch_size
+            self._cond.notify()
+        if full:
+            self.flush()
+        return future
+
+    def write(self, record: Dict) -> Tuple[str, str]:
+        """Buffer ``record`` alongside other callers' records and wait for its batch; returns (ticket_id, error)"""
+        return write_outcome(self.submit(record))
+
+    def write_many(self, records: List[Dict]) -> List[Tuple[str, str]]:
+        """Insert ``records`` right away; returns (ticket_id, error) per record in order"""
+        futures = [self.submit(record) for record in records]
+        self.flush()
+        return [write_outcome(future) for future in futures]
+
+    def flush(self):
+        with self._cond:
+            batch, self._pending = self._pending, []
+            self._oldest = None
+        if batch:
+            with self._write_lock:
+                self._write(batch)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "inserted": self.inserted,
+            "flushes": self.flushes,
+            "rejected": len(self.rejects),
+            "recent_rejects": [
+                {"ticket_id": r["record"].get("ticket_id"), "error": r["error"]} for r in list(self.rejects)[-20:]
+            ]
+        }
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._flush_loop, name="bulk-ticket-writer", daemon=True)
+            self._thread.start()
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                remaining = self._oldest + self._flush_interval - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+            self.flush()
+
+    def _write(self, batch: List[Tuple[Dict, concurrent.futures.Future]]):
+        records = [record for record, _ in batch]
+        try:
+            conn = self._pool.getconn()
+        except Exception as e:
+            for record, future in batch:
+                self._reject(record, future, e)
+            return
+
+        try:
+            cursor = conn.cursor()
+            try:
+                rows = execute_values(cursor, INSERT_SQL, records, template=ROW_TEMPLATE,
+                                      page_size=len(records), fetch=True)
+                inserted = {row[0] for row in rows}
+                conn.commit()
+                for record, future in batch:
+                    future.set_result(record["ticket_id"] if record["ticket_id"] in inserted else None)
+                self.inserted += len(inserted)
+            except Exception as e:
+                print(f"Bulk insert failed, retrying row by row: {e}")
+                conn.rollback()
+                written = self._write_rows(cursor, batch)
+                conn.commit()
+                for future, ticket_id in written:
+                    future.set_result(ticket_id)
+                self.inserted += len(written)
+            finally:
+                cursor.close()
+        except Exception as e:
+            print(f"Bulk insert error: {e}")
+            conn.rollback()
+            for record, future in batch:
+                if not future.done():
+                    self._reject(record, future, e)
+        finally:
+            self.flushes += 1
+            self._pool.putconn(conn)
+
+    def _write_rows(self, cursor, batch):
+        """Insert each row under its own savepoint so one bad row doesn't sink the rest"""
+        single_sql = INSERT_SQL.replace("VALUES %s", f"VALUES {ROW_TEMPLATE}")
+        written = []
+        for record, future in batch:
+            cursor.execute("SAVEPOINT bulk_row")
+            try:
+                cursor.execute(single_sql, record)
+                cursor.execute("RELEASE SAVEPOINT bulk_row")
+                written.append((future, record["ticket_id"]))
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT bulk_row")
+                self._reject(record, future, e)
+        return written
+
+    def _reject(self, record, future, error):
+        print(f"DB Insert Error for {record.get('ticket_id')}: {error}")
+        self.rejects.append({"record": record, "error": str(error), "at": time.time()})
+        future.set_exception(RowRejectedError(str(error)))
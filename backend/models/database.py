@@ -1,18 +1,36 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import psycopg2
-from psycopg2 import pool
+import time
+import weakref
+import threading
 import urllib.parse
+from contextlib import contextmanager
 
-from config.config import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+from config.config import (
+    DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD,
+    DB_POOL_MIN, DB_POOL_MAX, DB_POOL_TIMEOUT, DB_POOL_RECYCLE_SECONDS, DB_POOL_PRE_PING,
+    DB_SQLALCHEMY_POOL_SIZE, DB_SQLALCHEMY_MAX_OVERFLOW, DB_CONNECT_TIMEOUT
+)
+from utils.metrics import DB_POOL_WAIT_SECONDS, DB_POOL_TIMEOUTS, DB_POOL_IN_USE
 
 # URL encode the password to handle special characters like '@'
 encoded_password = urllib.parse.quote_plus(DB_PASSWORD)
 
-# Create SQLAlchemy engine
+# Create SQLAlchemy engine; its pool follows the same timeout/recycle/pre-ping settings.
+# It stays separate from connection_pool below: SQLAlchemy resets, invalidates and
+# switches isolation level on the connections it pools (auth sessions, migrations),
+# so it is sized on its own with DB_SQLALCHEMY_POOL_SIZE / DB_SQLALCHEMY_MAX_OVERFLOW
 SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{encoded_password}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    pool_size=DB_SQLALCHEMY_POOL_SIZE,
+    max_overflow=DB_SQLALCHEMY_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args={"connect_timeout": DB_CONNECT_TIMEOUT}
+)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -20,12 +38,199 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create Base class
 Base = declarative_base()
 
-# Create a connection pool for database connections
-connection_pool = pool.SimpleConnectionPool(
-    1, 10,
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection frees up within the checkout timeout"""
+
+
+class ConnectionPool:
+    """
+    Thread-safe psycopg2 connection pool shared by every route.
+
+    Wraps ThreadedConnectionPool with a checkout timeout (callers wait for a
+    free slot instead of failing immediately), a liveness ping on checkout,
+    recycling of connections older than ``recycle_seconds`` and usage stats.
+    Connections are only opened on first use.
+    """
+
+    def __init__(self, minconn, maxconn, timeout=30.0, recycle_seconds=1800, pre_ping=True, **conn_kwargs):
+        self._minconn = minconn
+        self._maxconn = maxconn
+        self._timeout = timeout
+        self._recycle_seconds = recycle_seconds
+        self._pre_ping = pre_ping
+        self._conn_kwargs = conn_kwargs
+        self._pool = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(maxconn)
+        # Opening time per connection; weak keys so closed connections drop out
+        self._born = weakref.WeakKeyDictionary()
+        self.checkouts = 0
+        self.in_use = 0
+        self.timeouts = 0
+        self.recycled = 0
+        self.broken = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                from psycopg2 import pool
+                self._pool = pool.ThreadedConnectionPool(self._minconn, self._maxconn, **self._conn_kwargs)
+            return self._pool
+
+    def _checkout_raw(self, pool):
+        conn = pool.getconn()
+        self._born.setdefault(conn, time.monotonic())
+        return conn
+
+    def _discard(self, pool, conn):
+        self._born.pop(conn, None)
+        pool.putconn(conn, close=True)
+
+    def _usable(self, conn) -> bool:
+        if conn.closed:
+            return False
+        if self._recycle_seconds and time.monotonic() - self._born.get(conn, 0) > self._recycle_seconds:
+            self.recycled += 1
+            return False
+        if self._pre_ping:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+            except Exception:
+                self.broken += 1
+                return False
+        return True
+
+    def getconn(self, timeout=None):
+        """Check out a live connection, waiting up to ``timeout`` seconds for a free slot"""
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self._timeout if timeout is None else timeout):
+            self.timeouts += 1
+            DB_POOL_TIMEOUTS.inc()
+            raise PoolTimeoutError(f"No database connection available within {self._timeout}s")
+        waited = time.monotonic() - started
+        DB_POOL_WAIT_SECONDS.observe(waited)
+        try:
+            pool = self._get_pool()
+            conn = self._checkout_raw(pool)
+            # After a database restart every idle connection is dead. There are
+            # at most maxconn of them, so once they are discarded the pool opens
+            # a fresh connection
+            for _ in range(self._maxconn):
+                if self._usable(conn):
+                    break
+                self._discard(pool, conn)
+                conn = self._checkout_raw(pool)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return conn
+
+    def putconn(self, conn, close=False):
+        """Return a connection; open transactions are rolled back by the pool"""
+        try:
+            pool = self._get_pool()
+            if close or conn.closed:
+                self._discard(pool, conn)
+            else:
+                pool.putconn(conn)
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """``with connection_pool.connection() as conn:`` checkout/return helper"""
+        conn = self.getconn()
+        try:
+            yield conn
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            self.putconn(conn)
+
+    def closeall(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+                self._born.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_connections": self._maxconn,
+                "in_use": self.in_use,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "recycled": self.recycled,
+                "broken": self.broken,
+                "avg_wait_seconds": round(self.total_wait / self.checkouts, 4) if self.checkouts else 0.0,
+                "max_wait_seconds": round(self.max_wait, 4)
+            }
+
+
+# Shared psycopg2 pool for raw SQL in the audio and data routes
+connection_pool = ConnectionPool(
+    DB_POOL_MIN, DB_POOL_MAX,
+    timeout=DB_POOL_TIMEOUT,
+    recycle_seconds=DB_POOL_RECYCLE_SECONDS,
+    pre_ping=DB_POOL_PRE_PING,
     host=DB_HOST,
     port=DB_PORT,
     dbname=DB_NAME,
     user=DB_USER,
-    password=DB_PASSWORD  # Use the original password for psycopg2 connection
+    password=DB_PASSWORD,  # Use the original password for psycopg2 connection
+    connect_timeout=DB_CONNECT_TIMEOUT
 )
+DB_POOL_IN_USE.set_function(lambda: connection_pool.in_use)
+
+
+def get_connection():
+    """Context manager yielding a pooled psycopg2 connection"""
+    return connection_pool.connection()
+
+
+def ping_database(timeout: float) -> bool:
+    """Whether a pooled connection can be checked out within ``timeout`` seconds and answers a query"""
+    try:
+        conn = connection_pool.getconn(timeout=timeout)
+    except Exception as e:
+        print(f"Database not reachable: {e}")
+        return False
+    healthy = False
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        healthy = True
+    except Exception as e:
+        print(f"Database ping failed: {e}")
+    connection_pool.putconn(conn, close=not healthy)
+    return healthy
+
+
+def pool_stats():
+    """Usage of both pools: raw psycopg2 and the SQLAlchemy engine"""
+    sa_pool = engine.pool
+    return {
+        "psycopg2": connection_pool.stats(),
+        "sqlalchemy": {
+            "size": sa_pool.size(),
+            "checked_out": sa_pool.checkedout(),
+            "overflow": sa_pool.overflow(),
+            "status": sa_pool.status()
+        }
+    }
@@ -0,0 +1,162 @@
+import time
+import json
+import select
+import asyncio
+import threading
+from typing import Callable, Dict, List, Optional
+
+# Channel the trigger from migrations/versions/0003_report_notify.py notifies;
+# a migration can't read settings, so this is fixed rather than configurable
+REPORT_CHANNEL = "crime_reports"
+
+
+class Subscriber:
+    """Bounded event queue for one streaming client"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        # Set when the client fell behind and events were dropped; it must catch up from its cursor
+        self.overflowed = False
+
+
+class ReportListener:
+    """
+    Single LISTEN connection that fans report changes out to every streaming client.
+
+    Inserts and updates fire NOTIFY on ``channel`` with the row id (see
+    migrations/versions/0003_report_notify.py). The listener batches the
+    ids it receives, loads those rows once through ``loader`` and pushes
+    the resulting events onto each subscriber's bounded asyncio queue. A subscriber whose queue is full is
+    flagged as overflowed instead of growing without limit. The connection
+    is reopened with backoff if it drops. Notifications sent while it was
+    down, or whose rows failed to load, are lost, so every subscriber is
+    flagged as overflowed then too and catches up from its cursor.
+    """
+
+    def __init__(self, channel: str, loader: Callable[[List[int]], List[Dict]],
+                 max_queue: int = 500, **conn_kwargs):
+        self._channel = channel
+        self._loader = loader
+        self._max_queue = max_queue
+        self._conn_kwargs = conn_kwargs
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.connected = False
+        self.notifications = 0
+        self.events = 0
+        self.overflows = 0
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="report-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(asyncio.get_running_loop(), self._max_queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            "connected": self.connected,
+            "subscribers": len(subscribers),
+            "notifications": self.notifications,
+            "events": self.events,
+            "overflows": self.overflows,
+            "max_queue_depth": max((s.queue.qsize() for s in subscribers), default=0)
+        }
+
+    def _run(self):
+        delay = 1.0
+        while not self._stop.is_set():
+            conn = None
+            try:
+                import psycopg2
+                conn = psycopg2.connect(**self._conn_kwargs)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self._channel}")
+                self.connected = True
+                delay = 1.0
+                # Anything notified before LISTEN took effect was missed
+                self._overflow_all()
+                self._listen(conn)
+            except Exception as e:
+                print(f"Report listener error, reconnecting in {delay:.0f}s: {e}")
+            finally:
+                self.connected = False
+                if conn is not None:
+                    conn.close()
+            self._stop.wait(delay)
+            delay = min(delay * 2, 30.0)
+
+    def _listen(self, conn):
+        while not self._stop.is_set():
+            if select.select([conn], [], [], 1.0) == ([], [], []):
+                continue
+            conn.poll()
+            ids = []
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                self.notifications += 1
+                try:
+                    ids.append(int(json.loads(notify.payload)["id"]))
+                except Exception:
+                    print(f"Ignoring malformed notification: {notify.payload}")
+            if ids:
+                try:
+                    events = self._loader(sorted(set(ids)))
+                except Exception as e:
+                    print(f"Report listener failed to load {len(ids)} changed rows: {e}")
+                    self._overflow_all()
+                    continue
+                self._publish(events)
+
+    def _publish(self, events: List[Dict]):
+        if not events:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        self.events += len(events)
+        for subscriber in subscribers:
+            subscriber.loop.call_soon_threadsafe(self._deliver, subscriber, events)
+
+    def _overflow_all(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.loop.call_soon_threadsafe(self._overflow, subscriber)
+
+    def _overflow(self, subscriber: Subscriber):
+        # Runs on the subscriber's event loop
+        if not subscriber.overflowed:
+            subscriber.overflowed = True
+            self.overflows += 1
+
+    def _deliver(self, subscriber: Subscriber, events: List[Dict]):
+        # Runs on the subscriber's event loop
+        if subscriber.overflowed:
+            return
+        for event in events:
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._overflow(subscriber)
+                return
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, ARRAY, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ARRAY, Float, DateTime, ForeignKey, FetchedValue
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -14,6 +15,7 @@ class User(Base):
 
 class CrimeReport(Base):
     __tablename__ = "latest_crime_reports"
+    # Indexes, triggers and the generated search column are defined in migrations/versions
 
     id = Column(Integer, primary_key=True, index=True)
     ticket_id = Column(String, unique=True, index=True)
@@ -31,8 +33,12 @@ class CrimeReport(Base):
     description = Column(Text)
     severity_rank = Column(Integer)
     audio_file = Column(String)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Kept current by a BEFORE UPDATE trigger so raw SQL updates count too
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     latitude = Column(Float)
     longitude = Column(Float)
     status = Column(String, default="pending")
     officer_assigned = Column(String)
+    # Full-text search document, generated by Postgres
+    search_vector = Column(TSVECTOR, server_default=FetchedValue())
@@ -0,0 +1,71 @@
+import os
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils import audio_preprocess
+from utils.audio_preprocess import LinearResampler, LowPassFilter, lowpass_taps, preprocess_wav
+
+
+def blocks(signal, size):
+    return [signal[i:i + size] for i in range(0, len(signal), size)]
+
+
+def test_blockwise_filter_matches_whole_signal():
+    signal = np.random.default_rng(0).standard_normal(10007).astype(np.float32)
+    taps = lowpass_taps(44100, 16000)
+    lowpass = LowPassFilter(taps)
+    filtered = np.concatenate([lowpass.process(b) for b in blocks(signal, 1000)] + [lowpass.flush()])
+    np.testing.assert_allclose(filtered, np.convolve(signal, taps, mode="same"), atol=1e-5)
+
+
+@pytest.mark.parametrize("size", [7, 1000, 4096])
+def test_blockwise_resampling_matches_whole_signal(size):
+    signal = np.random.default_rng(1).standard_normal(10007).astype(np.float32)
+    resampler = LinearResampler(44100, 16000)
+    resampled = np.concatenate(
+        [resampler.process(b) for b in blocks(signal, size)] + [resampler.process(signal[:0], final=True)]
+    )
+    count = int(len(signal) * 16000 / 44100)
+    expected = np.interp(np.arange(count) * (44100 / 16000), np.arange(len(signal)), signal)
+    assert resampler.produced == count
+    np.testing.assert_allclose(resampled, expected, atol=1e-5)
+
+
+def write_tone(path, rate, channels, seconds, silence):
+    t = np.arange(int(rate * seconds)) / rate
+    tone = 0.5 * np.sin(2 * np.pi * 440 * t)
+    quiet = int(rate * silence)
+    tone[:quiet] *= 0.001
+    tone[-quiet:] *= 0.001
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((np.repeat(tone[:, None], channels, axis=1) * 32767).astype("<i2").tobytes())
+
+
+def test_downsamples_downmixes_and_trims(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_preprocess, "BLOCK_FRAMES", 4096)
+    source = tmp_path / "call_9876543210.wav"
+    write_tone(source, 48000, 2, seconds=3, silence=1)
+    out = preprocess_wav(str(source), target_rate=16000, threshold_db=40, pad_seconds=0.1)
+    try:
+        with wave.open(out) as wav:
+            assert (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) == (1, 2, 16000)
+            assert 1.1 * 16000 <= wav.getnframes() <= 1.3 * 16000
+    finally:
+        os.remove(out)
+
+
+def test_never_upsamples(tmp_path):
+    source = tmp_path / "call.wav"
+    write_tone(source, 8000, 1, seconds=2, silence=0.5)
+    out = preprocess_wav(str(source), target_rate=16000, threshold_db=40, pad_seconds=0.1)
+    try:
+        with wave.open(out) as wav:
+            assert wav.getframerate() == 8000
+    finally:
+        os.remove(out)
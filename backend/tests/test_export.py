@@ -0,0 +1,30 @@
+import csv
+import io
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("psycopg2")
+
+from api.routes.data import csv_lines
+
+
+def read_csv(chunks):
+    return list(csv.reader(io.StringIO("".join(chunks))))
+
+
+def test_null_array_elements_are_skipped():
+    columns = ["ticket_id", "address_variations", "severity_rank"]
+    batches = [[
+        {"ticket_id": "TID-1", "address_variations": [None], "severity_rank": 3},
+        {"ticket_id": "TID-2", "address_variations": ["Benz Circle", None, "Vijayawada"], "severity_rank": None},
+    ]]
+    assert read_csv(csv_lines(batches, columns)) == [
+        columns,
+        ["TID-1", "", "3"],
+        ["TID-2", "Benz Circle; Vijayawada", ""],
+    ]
+
+
+def test_header_only_when_nothing_matches():
+    assert read_csv(csv_lines([], ["ticket_id"])) == [["ticket_id"]]
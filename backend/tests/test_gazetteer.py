@@ -0,0 +1,56 @@
+import csv
+
+import pytest
+
+from utils.gazetteer import Gazetteer
+
+PLACES = [
+    {"name": "Vijayawada", "kind": "city", "district": "NTR", "latitude": "16.5062", "longitude": "80.6480", "aliases": "Bezawada"},
+    {"name": "Benz Circle", "kind": "landmark", "district": "NTR", "latitude": "16.4997", "longitude": "80.6560", "aliases": ""},
+    {"name": "Kanaka Durga Temple", "kind": "landmark", "district": "NTR", "latitude": "16.5150", "longitude": "80.6070", "aliases": "Durga Temple|Indrakeeladri"},
+    {"name": "Guntur", "kind": "city", "district": "Guntur", "latitude": "16.3067", "longitude": "80.4365", "aliases": ""},
+]
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    path = tmp_path / "places.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(PLACES[0]))
+        writer.writeheader()
+        writer.writerows(PLACES)
+    return Gazetteer(str(path))
+
+
+def test_exact_name_and_alias(gazetteer):
+    assert gazetteer.lookup("Vijayawada")["name"] == "Vijayawada"
+    assert gazetteer.lookup("bezawada", fuzzy=False)["name"] == "Vijayawada"
+    assert gazetteer.lookup("Durga Temple", fuzzy=False)["name"] == "Kanaka Durga Temple"
+
+
+def test_region_suffix_is_ignored(gazetteer):
+    assert gazetteer.lookup("Benz Circle, Andhra Pradesh, India", fuzzy=False)["name"] == "Benz Circle"
+
+
+def test_strict_lookup_rejects_names_inside_longer_text(gazetteer):
+    assert gazetteer.lookup("Benz Circle, Vijayawada", fuzzy=False) is None
+    assert gazetteer.lookup("near Durga Temple ghat road", fuzzy=False) is None
+    assert gazetteer.lookup("Vijaywada", fuzzy=False) is None
+
+
+def test_fuzzy_lookup_prefers_the_more_specific_place(gazetteer):
+    assert gazetteer.lookup("Benz Circle, Vijayawada")["name"] == "Benz Circle"
+
+
+def test_fuzzy_lookup_matches_misspellings(gazetteer):
+    assert gazetteer.lookup("Vijaywada")["name"] == "Vijayawada"
+    assert gazetteer.lookup("Xyzzy Plugh") is None
+
+
+def test_lookup_any_returns_first_resolving_candidate(gazetteer):
+    place = gazetteer.lookup_any([None, "", "Benz Circle, Vijayawada", "Guntur"], fuzzy=False)
+    assert place["name"] == "Guntur"
+
+
+def test_missing_file_resolves_nothing(tmp_path):
+    assert Gazetteer(str(tmp_path / "missing.csv")).lookup("Vijayawada") is None
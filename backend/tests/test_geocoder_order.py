@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip("httpx")
+
+from utils import location
+from config.config import DEFAULT_GEOCODER_BACKENDS
+
+# The shipped order, whatever GEOCODER_BACKENDS is set to in this environment
+DEFAULT_ORDER = DEFAULT_GEOCODER_BACKENDS.split(",")
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Record the order backends run in; each returns the result given in ``results``"""
+    called, results = [], {}
+
+    def backend(name):
+        def geocode(location_data, address, api_key):
+            called.append(name)
+            return results.get(name)
+        return geocode
+
+    for name in list(location.GEOCODERS):
+        monkeypatch.setitem(location.GEOCODERS, name, backend(name))
+    return called, results
+
+
+def test_default_order_tries_google_before_fuzzy_gazetteer():
+    assert DEFAULT_ORDER == ["cache", "gazetteer", "google", "gazetteer_fuzzy"]
+
+
+def test_first_backend_with_a_result_wins(calls):
+    called, results = calls
+    results["google"] = {"latitude": 1.0, "longitude": 2.0}
+    results["gazetteer_fuzzy"] = {"latitude": 3.0, "longitude": 4.0}
+    latlng = location.get_approx_lat_lng({"primary_location": "Benz Circle, Vijayawada"}, "key", DEFAULT_ORDER)
+    assert latlng == {"latitude": 1.0, "longitude": 2.0}
+    assert called == ["cache", "gazetteer", "google"]
+
+
+def test_fuzzy_gazetteer_is_the_fallback_when_google_fails(calls, monkeypatch):
+    called, results = calls
+    results["gazetteer_fuzzy"] = {"latitude": 3.0, "longitude": 4.0}
+
+    def failing(location_data, address, api_key):
+        called.append("google")
+        raise RuntimeError("OVER_QUERY_LIMIT")
+    monkeypatch.setitem(location.GEOCODERS, "google", failing)
+
+    latlng = location.get_approx_lat_lng({"primary_location": "Benz Circle, Vijayawada"}, "key", DEFAULT_ORDER)
+    assert latlng == {"latitude": 3.0, "longitude": 4.0}
+    assert called == ["cache", "gazetteer", "google", "gazetteer_fuzzy"]
+
+
+def test_strict_gazetteer_leaves_partial_matches_to_google(monkeypatch):
+    monkeypatch.setattr(location, "location_candidates", lambda location_data, address: ["Benz Circle, Vijayawada"])
+    monkeypatch.setattr(location.gazetteer, "lookup_any", lambda candidates, fuzzy=True: {"latitude": 0, "longitude": 0} if fuzzy else None)
+    assert location.gazetteer_geocoder({}, "Benz Circle, Vijayawada", "key") is None
+    assert location.gazetteer_fuzzy_geocoder({}, "Benz Circle, Vijayawada", "key") == {"latitude": 0, "longitude": 0}
+
+
+def test_a_single_address_variation_is_not_split_into_characters():
+    candidates = location.location_candidates({"address_variations": "Benz Circle Vijayawada"}, "Vijayawada")
+    assert candidates == ["Vijayawada", "Benz Circle Vijayawada"]
@@ -0,0 +1,62 @@
+"""
+Import-time budget for the API
+
+Imports ``main`` under ``python -X importtime`` in a fresh interpreter with
+the database pointed at an unreachable address, so the import must neither
+connect nor block. Fails when the import takes longer than the budget
+(IMPORT_TIME_BUDGET seconds, 1.5 by default) or pulls in a module that
+should only load on first use.
+"""
+import os
+import sys
+import subprocess
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET", "1.5"))
+
+# Only loaded by the code paths that need them
+DEFERRED_MODULES = ("pandas", "openai", "numpy")
+
+
+def import_timings():
+    """(module, cumulative seconds) for every module ``import main`` loads"""
+    env = dict(os.environ)
+    # Port 9 (discard) on localhost refuses connections straight away
+    env.update({"DB_HOST": "127.0.0.1", "DB_PORT": "9"})
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        if "ModuleNotFoundError" in completed.stderr:
+            pytest.skip(f"backend dependencies missing: {completed.stderr.strip().splitlines()[-1]}")
+        pytest.fail(f"Importing main failed:\n{completed.stderr}")
+
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        timings[name] = int(cumulative) / 1e6
+    return timings
+
+
+@pytest.fixture(scope="module")
+def timings():
+    return import_timings()
+
+
+def test_main_imports_within_budget(timings):
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[1:6]
+    assert timings["main"] <= BUDGET_SECONDS, (
+        f"import main took {timings['main']:.2f}s, budget is {BUDGET_SECONDS:.2f}s; slowest: "
+        + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in slowest)
+    )
+
+
+@pytest.mark.parametrize("module", DEFERRED_MODULES)
+def test_heavy_modules_load_on_first_use(timings, module):
+    assert module not in timings
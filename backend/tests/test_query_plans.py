@@ -0,0 +1,94 @@
+"""
+The hot dashboard and heatmap queries keep using their indexes
+
+Each query is built by the same helper the route uses and EXPLAINed with
+sequential scans disabled, so a check passes only if an index can serve
+it regardless of how many rows the database holds. Skipped unless the
+database from config is reachable and migrated.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("fastapi")
+psycopg2 = pytest.importorskip("psycopg2")
+
+from config.config import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+from api.routes.data import (
+    REPORT_COLUMNS, changes_query, data_page_query, encode_cursor, heatmap_query, rollup_query
+)
+
+NOW = datetime.now(timezone.utc)
+DAY = NOW.replace(hour=0, minute=0, second=0, microsecond=0)
+COLUMNS = list(REPORT_COLUMNS)
+CELL = 0.05
+
+
+def page(**filters):
+    query, params, _ = data_page_query(COLUMNS, 100, **filters)
+    return query, params
+
+
+CHECKS = [
+    ("get-data first page", ["ix_latest_crime_reports_created_at_id"], lambda: page()),
+    ("get-data next page", ["ix_latest_crime_reports_created_at_id"],
+     lambda: page(cursor=encode_cursor(NOW, 1000000))),
+    ("get-data by status", ["ix_latest_crime_reports_status_created_at_id"], lambda: page(status="pending")),
+    ("get-data by officer", ["ix_latest_crime_reports_officer_created_at_id"], lambda: page(officer="officer")),
+    ("search first page", ["ix_latest_crime_reports_search_vector"], lambda: page(search="theft vizag")),
+    ("search next page", ["ix_latest_crime_reports_search_vector"],
+     lambda: page(search="theft", cursor=encode_cursor(NOW, 1000000, 0.05))),
+    ("changes feed", ["ix_latest_crime_reports_updated_at_id"],
+     lambda: changes_query(COLUMNS, encode_cursor(NOW - timedelta(hours=1), 0), 100)),
+    ("heatmap date range", ["ix_latest_crime_reports_located_created_at"],
+     lambda: heatmap_query(fromDate=(NOW - timedelta(days=7)).isoformat(), cell=CELL)),
+    ("heatmap severity", ["ix_latest_crime_reports_located_severity_created_at"],
+     lambda: heatmap_query(severity=8, cell=CELL)),
+    ("heatmap crime type", ["ix_latest_crime_reports_type_subtype_created_at"],
+     lambda: heatmap_query(crimeType="Theft", cell=CELL)),
+    ("heatmap rollup whole days", ["heatmap_rollup_pkey"],
+     lambda: rollup_query(CELL, fromDate=(DAY - timedelta(days=7)).isoformat(), toDate=DAY.isoformat())),
+    ("heatmap rollup with partial days", ["heatmap_rollup_pkey", "ix_latest_crime_reports_located_created_at"],
+     lambda: rollup_query(CELL, fromDate=(DAY - timedelta(days=7, hours=6)).isoformat(), toDate=NOW.isoformat())),
+]
+
+
+def index_names(plan):
+    names = [plan["Index Name"]] if "Index Name" in plan else []
+    for child in plan.get("Plans", []):
+        names.extend(index_names(child))
+    return names
+
+
+@pytest.fixture(scope="module")
+def conn():
+    try:
+        conn = psycopg2.connect(
+            host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD, connect_timeout=2
+        )
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"database not reachable: {e}")
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('ix_latest_crime_reports_located_created_at')")
+        migrated = cursor.fetchone()[0] is not None
+    conn.rollback()
+    if not migrated:
+        conn.close()
+        pytest.skip("database schema is not migrated")
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("name, indexes, build", CHECKS, ids=[check[0] for check in CHECKS])
+def test_query_uses_index(conn, name, indexes, build):
+    query, params = build()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN (FORMAT JSON) " + query, params)
+            plan = cursor.fetchone()[0]
+    finally:
+        conn.rollback()
+    used = index_names(plan[0]["Plan"])
+    missing = [index for index in indexes if index not in used]
+    assert not missing, f"{name}: expected {missing}, plan used {used or 'no index'}"
@@ -0,0 +1,146 @@
+import time
+import shutil
+import asyncio
+import threading
+import subprocess
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from benchmarks.mock_servers import Behavior, H2WhisperServer, MockServer
+from utils import rate_limit, whisper_client
+from utils.whisper_client import AsyncWhisperClient, WhisperClient
+
+
+@pytest.fixture
+def server():
+    mock = MockServer(Behavior(), Behavior(), Behavior()).start()
+    yield mock
+    mock.stop()
+
+
+def make_client(server, cls=WhisperClient, **kwargs):
+    return cls(server.endpoints()["WHISPER_ENDPOINT"], "test-key", "2023-09-01-preview", **kwargs)
+
+
+@pytest.fixture
+def h2_server(tmp_path):
+    pytest.importorskip("h2")
+    if not shutil.which("openssl"):
+        pytest.skip("openssl is needed to make a test certificate")
+    cert, key = str(tmp_path / "cert.pem"), str(tmp_path / "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert,
+         "-days", "1", "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True, capture_output=True
+    )
+    mock = H2WhisperServer(cert, key).start()
+    yield mock
+    mock.stop()
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "call.wav"
+    path.write_bytes(b"RIFF" + bytes(64))
+    return str(path)
+
+
+def test_transcribes_against_local_server(server, audio_file):
+    client = make_client(server)
+    try:
+        assert client.transcribe(audio_file)
+    finally:
+        client.close()
+    assert server.counts["whisper 200"] == 1
+
+
+def test_gives_up_after_max_retries(server, audio_file):
+    server.behaviors["whisper"].throttle_rate = 1.0
+    server.behaviors["whisper"].retry_after = 0
+    client = make_client(server, max_retries=2)
+    try:
+        with pytest.raises(Exception, match="429"):
+            client.transcribe(audio_file)
+    finally:
+        client.close()
+    assert server.counts["whisper 429"] == 3
+
+
+def test_backoff_sleeps_without_holding_the_semaphore(server, audio_file, monkeypatch):
+    server.behaviors["whisper"].throttle_rate = 1.0
+    client = make_client(server, max_concurrency=1, max_retries=1)
+    free_while_sleeping = []
+    real_sleep = time.sleep
+    caller = threading.current_thread()
+
+    def sleep(seconds):
+        # time.sleep is patched process-wide; the mock server's own sleeps run on its threads
+        if threading.current_thread() is not caller:
+            return real_sleep(seconds)
+        free_while_sleeping.append(client._semaphore.acquire(blocking=False))
+        client._semaphore.release()
+    monkeypatch.setattr(whisper_client.time, "sleep", sleep)
+
+    try:
+        with pytest.raises(Exception):
+            client.transcribe(audio_file)
+    finally:
+        client.close()
+    assert free_while_sleeping == [True]
+
+
+def test_async_backoff_sleeps_without_holding_the_semaphore(server, audio_file, monkeypatch):
+    server.behaviors["whisper"].throttle_rate = 1.0
+    real_sleep = asyncio.sleep
+
+    async def run():
+        client = make_client(server, AsyncWhisperClient, max_concurrency=1, max_retries=1)
+        free_while_sleeping = []
+
+        async def sleep(seconds):
+            free_while_sleeping.append(not client._semaphore.locked())
+            await real_sleep(0)
+        monkeypatch.setattr(whisper_client.asyncio, "sleep", sleep)
+
+        try:
+            with pytest.raises(Exception):
+                await client.transcribe(audio_file)
+        finally:
+            await client.aclose()
+        return free_while_sleeping
+
+    assert asyncio.run(run()) == [True]
+
+
+def test_http2_falls_back_without_h2(monkeypatch):
+    import builtins
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name == "h2":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+
+    assert whisper_client.http2_available(True) is False
+    assert whisper_client.http2_available(False) is False
+
+
+def test_concurrent_uploads_are_multiplexed_over_one_http2_connection(h2_server, audio_file, monkeypatch):
+    # httpx trusts SSL_CERT_FILE; the client itself is built with its defaults
+    monkeypatch.setenv("SSL_CERT_FILE", h2_server.certfile)
+    # Earlier tests have drained the shared limiter, which would space the uploads out
+    monkeypatch.setitem(rate_limit.limiters, "whisper", rate_limit.RateLimiter("whisper", rpm=6000))
+
+    async def run():
+        client = make_client(h2_server, AsyncWhisperClient, max_concurrency=4)
+        try:
+            return await asyncio.gather(*(client.transcribe(audio_file) for _ in range(4)))
+        finally:
+            await client.aclose()
+
+    assert all(asyncio.run(run()))
+    assert h2_server.connections == 1
+    assert h2_server.peak_streams == 4
@@ -0,0 +1,313 @@
+import os
+import wave
+import tempfile
+from contextlib import contextmanager
+from typing import Optional
+
+from config.config import (
+    AUDIO_PREPROCESS, AUDIO_TARGET_SAMPLE_RATE, AUDIO_SILENCE_THRESHOLD_DB, AUDIO_SILENCE_PAD_SECONDS
+)
+from utils.metrics import AUDIO_BYTES_SAVED, stage_timer
+
+# Length of the frames whose energy decides what counts as silence
+FRAME_SECONDS = 0.02
+# Taps of the anti-aliasing filter applied before downsampling
+LOWPASS_TAPS = 101
+# Input frames decoded per step; memory is bounded by this, not by the recording length
+BLOCK_FRAMES = 1 << 16
+
+
+def decode_frames(raw: bytes, width: int, channels: int):
+    """Decode PCM frames into mono float32 samples in [-1, 1]"""
+    import numpy as np
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        samples = values.astype(np.float32) / 8388608
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported sample width: {width} bytes")
+
+    samples = samples[:len(samples) - len(samples) % channels]
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    return samples
+
+
+def encode_pcm16(samples) -> bytes:
+    import numpy as np
+
+    return (np.clip(samples, -1.0, 1.0) * 32767).round().astype("<i2").tobytes()
+
+
+def lowpass_taps(source_rate: int, target_rate: int):
+    """Windowed-sinc low-pass just under the Nyquist frequency of ``target_rate``"""
+    import numpy as np
+
+    cutoff = 0.45 * target_rate / source_rate
+    n = np.arange(LOWPASS_TAPS) - (LOWPASS_TAPS - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(LOWPASS_TAPS)
+    return (taps / taps.sum()).astype(np.float32)
+
+
+class LowPassFilter:
+    """
+    FIR filter applied block by block
+
+    The last ``len(taps) - 1`` inputs are carried into the next block, so
+    the concatenated output equals ``np.convolve(signal, taps, mode="same")``
+    over the whole recording once ``flush`` has been called.
+    """
+
+    def __init__(self, taps):
+        import numpy as np
+
+        self._taps = taps
+        self._history = np.zeros(len(taps) - 1, dtype=np.float32)
+        # Leading outputs of the full convolution that "same" mode leaves out
+        self._skip = (len(taps) - 1) // 2
+
+    def process(self, block):
+        import numpy as np
+
+        if len(block) == 0:
+            return block
+        extended = np.concatenate([self._history, block])
+        filtered = np.convolve(extended, self._taps, mode="valid")
+        self._history = extended[len(extended) - len(self._history):]
+        if self._skip:
+            skipped = min(self._skip, len(filtered))
+            filtered = filtered[skipped:]
+            self._skip -= skipped
+        return filtered
+
+    def flush(self):
+        """Outputs still owed for the end of the signal"""
+        import numpy as np
+
+        return self.process(np.zeros((len(self._taps) - 1) // 2, dtype=np.float32))
+
+
+class LinearResampler:
+    """
+    Linear-interpolation resampling of a signal that arrives in blocks
+
+    Output sample ``j`` is read at input position ``j * source_rate /
+    target_rate``. Inputs from the first position not yet produced onwards
+    are carried into the next block, so positions between blocks still
+    interpolate. A ``total``-sample input yields
+    ``int(total * target_rate / source_rate)`` samples.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int):
+        self._source_rate = source_rate
+        self._target_rate = target_rate
+        self._offset = 0
+        self._carry = None
+        self.produced = 0
+
+    def process(self, block, final: bool = False):
+        import numpy as np
+
+        if self._source_rate == self._target_rate:
+            self.produced += len(block)
+            return block
+
+        if self._carry is not None:
+            block = np.concatenate([self._carry, block])
+        first = self._offset - (len(self._carry) if self._carry is not None else 0)
+        self._offset = first + len(block)
+        if len(block) == 0:
+            return block
+
+        step = self._source_rate / self._target_rate
+        ratio = self._target_rate / self._source_rate
+        stop = int(self._offset * ratio)
+        if not final:
+            # Only positions up to the last sample received so far
+            stop = min(stop, int((self._offset - 1) * ratio) + 1)
+        positions = np.arange(self.produced, stop) * step - first
+        resampled = np.interp(positions, np.arange(len(block)), block).astype(np.float32)
+        self.produced = max(self.produced, stop)
+
+        keep = min(len(block) - 1, max(0, int(self.produced * step) - first))
+        self._carry = block[keep:]
+        return resampled
+
+
+class FrameLevels:
+    """RMS level in dB of consecutive ``frame``-sample frames of a signal that arrives in blocks"""
+
+    def __init__(self, frame: int):
+        self.frame = frame
+        self._carry = None
+        self._levels = []
+
+    def process(self, block):
+        import numpy as np
+
+        if self._carry is not None:
+            block = np.concatenate([self._carry, block])
+        frames = len(block) // self.frame
+        if frames:
+            rms = np.sqrt(np.mean(block[:frames * self.frame].reshape(frames, self.frame) ** 2, axis=1))
+            self._levels.append(20 * np.log10(rms + 1e-10))
+        self._carry = block[frames * self.frame:]
+
+    def levels(self):
+        import numpy as np
+
+        return np.concatenate(self._levels) if self._levels else np.zeros(0)
+
+
+def speech_bounds(levels, frame: int, length: int, threshold_db: float, pad_seconds: float, rate: int):
+    """
+    Sample range left after dropping leading and trailing frames more than
+    ``threshold_db`` quieter than the loudest frame
+
+    Returns:
+        Tuple of (start, end) sample indexes
+    """
+    import numpy as np
+
+    if len(levels) == 0:
+        return 0, length
+    loud = np.flatnonzero(levels >= levels.max() - threshold_db)
+    pad = int(rate * pad_seconds)
+    start = max(0, int(loud[0]) * frame - pad)
+    end = min(length, (int(loud[-1]) + 1) * frame + pad)
+    return start, end
+
+
+def keep_frames(path: str, start: int, end: int):
+    """Rewrite a WAV file in place keeping only frames [start, end), a block at a time"""
+    fd, trimmed_path = tempfile.mkstemp(suffix=".wav", dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        with wave.open(path, "rb") as source, wave.open(trimmed_path, "wb") as trimmed:
+            trimmed.setparams(source.getparams())
+            source.setpos(start)
+            remaining = end - start
+            while remaining > 0:
+                raw = source.readframes(min(BLOCK_FRAMES, remaining))
+                if not raw:
+                    break
+                trimmed.writeframes(raw)
+                remaining -= len(raw) // (source.getsampwidth() * source.getnchannels())
+        os.replace(trimmed_path, path)
+    except BaseException:
+        if os.path.exists(trimmed_path):
+            os.remove(trimmed_path)
+        raise
+
+
+def preprocess_wav(path: str,
+                   target_rate: int = AUDIO_TARGET_SAMPLE_RATE,
+                   threshold_db: float = AUDIO_SILENCE_THRESHOLD_DB,
+                   pad_seconds: float = AUDIO_SILENCE_PAD_SECONDS) -> Optional[str]:
+    """
+    Downmix, resample and trim a WAV file into a compact copy for transcription
+
+    The recording is decoded, filtered and resampled BLOCK_FRAMES at a time
+    and written out as it goes, so memory does not grow with its length.
+
+    Args:
+        path: Source WAV file; it is never modified
+        target_rate: Output sample rate (Whisper works at 16 kHz); lower-rate
+            recordings keep their own rate rather than being upsampled
+        threshold_db: How far below the loudest frame a frame counts as silence
+        pad_seconds: Silence kept either side of the speech
+
+    Returns:
+        Path to a temporary 16-bit mono WAV the caller must delete, or None
+        when the original is already as small
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    fd, out_path = tempfile.mkstemp(prefix=f"{stem}_", suffix=".wav")
+    os.close(fd)
+
+    try:
+        with wave.open(path, "rb") as source, wave.open(out_path, "wb") as out:
+            channels, width, rate = source.getnchannels(), source.getsampwidth(), source.getframerate()
+            out_rate = min(rate, target_rate)
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(out_rate)
+
+            lowpass = LowPassFilter(lowpass_taps(rate, out_rate)) if out_rate < rate else None
+            resampler = LinearResampler(rate, out_rate)
+            levels = FrameLevels(max(1, int(out_rate * FRAME_SECONDS)))
+
+            def emit(samples):
+                levels.process(samples)
+                out.writeframes(encode_pcm16(samples))
+
+            while True:
+                raw = source.readframes(BLOCK_FRAMES)
+                if not raw:
+                    break
+                block = decode_frames(raw, width, channels)
+                if lowpass is not None:
+                    block = lowpass.process(block)
+                emit(resampler.process(block))
+            tail = lowpass.flush() if lowpass is not None else decode_frames(b"", width, channels)
+            emit(resampler.process(tail, final=True))
+
+        length = resampler.produced
+        start, end = speech_bounds(levels.levels(), levels.frame, length, threshold_db, pad_seconds, out_rate)
+        if channels == 1 and width == 2 and rate == out_rate and (start, end) == (0, length):
+            os.remove(out_path)
+            return None
+        if (start, end) != (0, length):
+            keep_frames(out_path, start, end)
+    except BaseException:
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        raise
+
+    before, after = os.path.getsize(path), os.path.getsize(out_path)
+    if after >= before:
+        os.remove(out_path)
+        return None
+    AUDIO_BYTES_SAVED.inc(before - after)
+    print(
+        f"Preprocessed {os.path.basename(path)}: {before} -> {after} bytes "
+        f"({before - after} saved, {channels}ch {rate} Hz -> 1ch {out_rate} Hz, "
+        f"{(length - (end - start)) / out_rate:.1f}s silence trimmed)"
+    )
+    return out_path
+
+
+def preprocess_for_upload(path: str) -> Optional[str]:
+    """
+    preprocess_wav when AUDIO_PREPROCESS is on; any failure falls back to the original file
+
+    Returns:
+        Path to a temporary file the caller must delete, or None to upload ``path`` as-is
+    """
+    if not AUDIO_PREPROCESS:
+        return None
+    try:
+        with stage_timer("preprocess"):
+            return preprocess_wav(path)
+    except Exception as e:
+        print(f"Audio preprocessing skipped for {os.path.basename(path)}: {e}")
+        return None
+
+
+@contextmanager
+def prepared_audio(path: str):
+    """``with prepared_audio(path) as upload_path:`` yields the file to send and removes any temporary copy"""
+    prepared = preprocess_for_upload(path)
+    try:
+        yield prepared or path
+    finally:
+        if prepared:
+            os.remove(prepared)
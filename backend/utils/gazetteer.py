@@ -0,0 +1,154 @@
+import os
+import csv
+import json
+import threading
+from typing import Dict, List, Optional
+
+from utils.geocode_cache import normalize_address
+
+# More specific places win when several entries match equally well
+_KIND_PRIORITY = {"landmark": 0, "mandal": 1, "town": 2, "city": 3, "district": 4}
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Gazetteer:
+    """
+    In-memory index of known places (name, aliases, coordinates).
+
+    Exact lookups go through a dict of normalized names; with ``fuzzy`` on,
+    anything else is matched on known word runs and then scored against a
+    character-trigram inverted index, so misspelt or partially transcribed
+    place names still resolve without the network.
+    """
+
+    def __init__(self, path: str, min_similarity: float = 0.6):
+        self._path = path
+        self._min_similarity = min_similarity
+        self._entries: List[Dict] = []
+        self._names: Dict[str, int] = {}
+        self._grams: Dict[str, List[int]] = {}
+        self._gram_counts: List[int] = []
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            if os.path.exists(self._path):
+                places = self._read_geojson() if self._path.endswith((".json", ".geojson")) else self._read_csv()
+            else:
+                print(f"Gazetteer file not found: {self._path}")
+                places = []
+            for place in places:
+                self._add(place)
+            self._loaded = True
+
+    def _read_csv(self) -> List[Dict]:
+        places = []
+        with open(self._path, "r", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                places.append({
+                    "name": row["name"],
+                    "kind": row.get("kind") or "",
+                    "district": row.get("district") or "",
+                    "latitude": float(row["latitude"]),
+                    "longitude": float(row["longitude"]),
+                    "aliases": [a for a in (row.get("aliases") or "").split("|") if a]
+                })
+        return places
+
+    def _read_geojson(self) -> List[Dict]:
+        with open(self._path, "r", encoding="utf-8") as f:
+            collection = json.load(f)
+        places = []
+        for feature in collection.get("features", []):
+            geometry = feature.get("geometry") or {}
+            if geometry.get("type") != "Point":
+                continue
+            props = feature.get("properties") or {}
+            aliases = props.get("aliases") or []
+            if isinstance(aliases, str):
+                aliases = [a for a in aliases.split("|") if a]
+            places.append({
+                "name": props["name"],
+                "kind": props.get("kind", ""),
+                "district": props.get("district", ""),
+                "latitude": float(geometry["coordinates"][1]),
+                "longitude": float(geometry["coordinates"][0]),
+                "aliases": aliases
+            })
+        return places
+
+    def _add(self, place: Dict):
+        for name in [place["name"]] + place["aliases"]:
+            key = normalize_address(name)
+            if not key:
+                continue
+            idx = len(self._gram_counts)
+            self._entries.append(place)
+            self._names.setdefault(key, idx)
+            grams = _trigrams(key)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(idx)
+
+    def _rank(self, idx: int):
+        return _KIND_PRIORITY.get(self._entries[idx]["kind"], len(_KIND_PRIORITY))
+
+    def lookup(self, text: str, fuzzy: bool = True) -> Optional[Dict]:
+        """
+        Resolve a place name to its gazetteer entry, or None if nothing is close enough
+
+        Args:
+            text: Place name or address
+            fuzzy: Also accept a known name inside the text or a trigram match;
+                when False only the whole string naming a place resolves
+        """
+        if not text:
+            return None
+        self._load()
+        key = normalize_address(text)
+        if not key:
+            return None
+
+        if key in self._names:
+            return self._entries[self._names[key]]
+        if not fuzzy:
+            return None
+
+        # Any run of whole words that is a known name, longest first
+        words = key.split(" ")
+        for size in range(len(words) - 1, 0, -1):
+            matches = [
+                self._names[" ".join(words[i:i + size])]
+                for i in range(len(words) - size + 1)
+                if " ".join(words[i:i + size]) in self._names
+            ]
+            if matches:
+                return self._entries[min(matches, key=self._rank)]
+
+        # Fuzzy match on shared trigrams (Jaccard similarity)
+        grams = _trigrams(key)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for idx in self._grams.get(gram, ()):
+                shared[idx] = shared.get(idx, 0) + 1
+        best, best_score = None, self._min_similarity
+        for idx, count in shared.items():
+            score = count / (len(grams) + self._gram_counts[idx] - count)
+            if score > best_score or (score == best_score and best is not None and self._rank(idx) < self._rank(best)):
+                best, best_score = idx, score
+        return self._entries[best] if best is not None else None
+
+    def lookup_any(self, candidates, fuzzy: bool = True) -> Optional[Dict]:
+        """Return the first candidate string that resolves"""
+        for text in candidates:
+            place = self.lookup(text, fuzzy)
+            if place:
+                return place
+        return None
@@ -0,0 +1,151 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+from utils.result_cache import EvictionSchedule
+
+# Region suffixes appended before geocoding; stripped so "X" and "X, Andhra Pradesh, India" share a key
+_REGION_SUFFIXES = ("andhra pradesh india", "andhra pradesh", "india")
+
+
+def normalize_address(address: str) -> str:
+    """
+    Reduce an address to a cache key
+
+    Lower-cases, replaces punctuation with spaces, collapses whitespace and
+    drops a trailing "Andhra Pradesh, India" style suffix.
+    """
+    key = re.sub(r"[^\w\s]", " ", address.lower())
+    key = re.sub(r"\s+", " ", key).strip()
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in _REGION_SUFFIXES:
+            if key == suffix:
+                break
+            if key.endswith(" " + suffix):
+                key = key[:-len(suffix) - 1].strip()
+                stripped = True
+                break
+    return key
+
+
+class GeocodeCache:
+    """
+    Persistent SQLite cache of geocoding results keyed by normalized address.
+
+    Entries expire after ``ttl_seconds``; beyond ``max_entries`` the least
+    recently used entries are evicted. As in AudioResultCache, eviction runs
+    after every ``evict_every`` puts or ``evict_interval`` seconds.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 50000, ttl_seconds: int = 90 * 86400,
+                 evict_every: int = 100, evict_interval: float = 60.0):
+        self._db_path = db_path
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._eviction = EvictionSchedule(evict_every, evict_interval)
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS geocode_cache (
+                    address_key TEXT PRIMARY KEY,
+                    latitude REAL NOT NULL,
+                    longitude REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_geocode_cache_last_access ON geocode_cache (last_access)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, address: str) -> Optional[Dict]:
+        """Return cached coordinates for an address, or None on a miss"""
+        return self.get_any([address])
+
+    def get_any(self, addresses) -> Optional[Dict]:
+        """Return the first cached hit among several address candidates (counted as one lookup)"""
+        keys = [key for key in (normalize_address(a) for a in addresses if a) if key]
+        if not keys:
+            return None
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            for key in keys:
+                row = conn.execute(
+                    "SELECT latitude, longitude, created_at FROM geocode_cache WHERE address_key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    continue
+                if row[2] < now - self._ttl_seconds:
+                    conn.execute("DELETE FROM geocode_cache WHERE address_key = ?", (key,))
+                    conn.commit()
+                    continue
+                conn.execute("UPDATE geocode_cache SET last_access = ? WHERE address_key = ?", (now, key))
+                conn.commit()
+                self.hits += 1
+                return {"latitude": row[0], "longitude": row[1]}
+            self.misses += 1
+        return None
+
+    def put(self, address: str, latitude: float, longitude: float):
+        key = normalize_address(address)
+        if not key:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("""
+                INSERT INTO geocode_cache (address_key, latitude, longitude, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (address_key) DO UPDATE SET
+                    latitude = excluded.latitude,
+                    longitude = excluded.longitude,
+                    created_at = excluded.created_at,
+                    last_access = excluded.last_access
+            """, (key, latitude, longitude, now, now))
+            conn.commit()
+            due = self._eviction.record_write()
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Apply the retention policy: drop expired entries, then trim to max_entries by LRU"""
+        with self._lock:
+            self._eviction.evicted()
+            conn = self._connect()
+            conn.execute(
+                "DELETE FROM geocode_cache WHERE created_at < ?", (time.time() - self._ttl_seconds,)
+            )
+            conn.execute("""
+                DELETE FROM geocode_cache WHERE address_key IN (
+                    SELECT address_key FROM geocode_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+            """, (self._max_entries,))
+            conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self._max_entries,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None
+        }
@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import uuid
+import threading
+import concurrent.futures
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue already holds the maximum number of pending jobs"""
+
+
+class JobQueue:
+    """
+    Bounded pool of long-lived workers shared by all requests.
+
+    Every job is persisted as a small JSON file in ``jobs_dir`` so its status
+    survives a restart; jobs that were still queued or running when the
+    process stopped are picked up again by ``start()``.
+    """
+
+    def __init__(self, handler: Callable, jobs_dir: str, max_workers: int = 4,
+                 max_pending: int = 200, retention_seconds: int = 86400):
+        self._handler = handler
+        self._jobs_dir = jobs_dir
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._retention_seconds = retention_seconds
+        self._jobs: Dict[str, Dict] = {}
+        self._futures: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def start(self):
+        """Create the worker pool and resume jobs left over from a previous run"""
+        with self._lock:
+            if self._executor is not None:
+                return
+            os.makedirs(self._jobs_dir, exist_ok=True)
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="audio-job"
+            )
+            for name in os.listdir(self._jobs_dir):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(self._jobs_dir, name), "r", encoding="utf-8") as f:
+                        job = json.load(f)
+                except Exception as e:
+                    print(f"Skipping unreadable job file {name}: {e}")
+                    continue
+                self._jobs[job["job_id"]] = job
+                if job["status"] in ("queued", "running"):
+                    job["status"] = "queued"
+                    self._futures[job["job_id"]] = self._executor.submit(self._run, job["job_id"])
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, payload) -> str:
+        """Queue ``payload`` for the handler and return the new job ID immediately"""
+        return self.submit_many([payload])[0][0]
+
+    def submit_many(self, payloads: Iterable) -> List[Tuple[str, concurrent.futures.Future]]:
+        """
+        Queue every payload, or none of them if they don't all fit
+
+        Returns:
+            (job_id, future) per payload, in order. The future is handed out
+            here because finished jobs are no longer reachable via future().
+        """
+        payloads = [list(payload) for payload in payloads]
+        self.start()
+        self._prune()
+        submitted = []
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job["status"] in ("queued", "running"))
+            if pending + len(payloads) > self._max_pending:
+                raise QueueFullError(
+                    f"Job queue is full ({pending} pending jobs, {len(payloads)} more requested)"
+                )
+            for payload in payloads:
+                job_id = uuid.uuid4().hex
+                job = {
+                    "job_id": job_id,
+                    "status": "queued",
+                    "payload": payload,
+                    "result": None,
+                    "error": None,
+                    "created_at": time.time(),
+                    "started_at": None,
+                    "finished_at": None,
+                }
+                self._jobs[job_id] = job
+                self._save(job)
+                future = self._executor.submit(self._run, job_id)
+                self._futures[job_id] = future
+                submitted.append((job_id, future))
+        return submitted
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a public snapshot of a job, or None if it is unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {key: value for key, value in job.items() if key != "payload"}
+
+    def future(self, job_id: str) -> Optional[concurrent.futures.Future]:
+        """Future of a job that is still queued or running; None once it has finished"""
+        with self._lock:
+            return self._futures.get(job_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"workers": self._max_workers, "max_pending": self._max_pending, "jobs": counts}
+
+    def _run(self, job_id: str):
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = "running"
+            job["started_at"] = time.time()
+            self._save(job)
+        try:
+            result = self._handler(tuple(job["payload"]))
+            status, error = "done", None
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            result, status, error = None, "error", str(e)
+        with self._lock:
+            job["status"] = status
+            job["result"] = result
+            job["error"] = error
+            job["finished_at"] = time.time()
+            self._save(job)
+            self._futures.pop(job_id, None)
+        return result
+
+    def _prune(self):
+        """Forget finished jobs older than the retention window"""
+        cutoff = time.time() - self._retention_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job["finished_at"] is not None and job["finished_at"] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+                try:
+                    os.remove(self._job_path(job_id))
+                except FileNotFoundError:
+                    pass
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self._jobs_dir, f"{job_id}.json")
+
+    def _save(self, job: Dict):
+        path = self._job_path(job["job_id"])
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(job, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Failed to persist job {job['job_id']}: {e}")
@@ -1,4 +1,3 @@
-import pandas as pd
 import json
 import os
 
@@ -13,6 +12,9 @@ def excel_to_clean_json(excel_file_path):
         Path to the JSON file or JSON string if file cannot be created
     """
     try:
+        # pandas is only needed here, so it isn't loaded when the app starts
+        import pandas as pd
+
         # Read Excel file
         df = pd.read_excel(excel_file_path)
         
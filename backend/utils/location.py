@@ -1,59 +1,188 @@
+import asyncio
+import httpx
 import requests
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-def get_approx_lat_lng(location_data: Dict, api_key: str) -> Optional[Dict]:
+from config.config import (
+    GEOCODE_CACHE_PATH, GEOCODE_CACHE_MAX_ENTRIES, GEOCODE_CACHE_TTL_SECONDS,
+    GEOCODE_CACHE_EVICT_EVERY, GEOCODE_CACHE_EVICT_INTERVAL,
+    GEOCODER_BACKENDS, GAZETTEER_PATH, GAZETTEER_MIN_SIMILARITY, GEOCODE_URL, GEOCODE_TIMEOUT
+)
+from utils.geocode_cache import GeocodeCache
+from utils.gazetteer import Gazetteer
+from utils.rate_limit import get_limiter
+from utils.metrics import external_call
+
+# Shared across requests so repeated landmarks never reach the network
+geocode_cache = GeocodeCache(
+    GEOCODE_CACHE_PATH,
+    max_entries=GEOCODE_CACHE_MAX_ENTRIES,
+    ttl_seconds=GEOCODE_CACHE_TTL_SECONDS,
+    evict_every=GEOCODE_CACHE_EVICT_EVERY,
+    evict_interval=GEOCODE_CACHE_EVICT_INTERVAL
+)
+
+# Offline index of Andhra Pradesh places, loaded on first lookup
+gazetteer = Gazetteer(GAZETTEER_PATH, min_similarity=GAZETTEER_MIN_SIMILARITY)
+
+def build_address(location_data: Dict) -> Optional[str]:
+    """Build the geocoding query string from the extracted location fields"""
+    # Build address from available components
+    address_components = []
+
+    if location_data.get("primary_location"):
+        address_components.append(location_data["primary_location"])
+
+    if location_data.get("specific_landmark"):
+        address_components.append(location_data["specific_landmark"])
+
+    if location_data.get("state_region"):
+        address_components.append(location_data["state_region"])
+
+    if location_data.get("combined_address"):
+        # If we have a combined address, use it directly
+        address = location_data["combined_address"]
+    else:
+        # Otherwise, build from components
+        address = ", ".join(filter(None, address_components))
+
+    if not address:
+        return None
+
+    # Add "Andhra Pradesh, India" if not already in the address
+    if "andhra pradesh" not in address.lower() and "india" not in address.lower():
+        address += ", Andhra Pradesh, India"
+    elif "andhra pradesh" in address.lower() and "india" not in address.lower():
+        address += ", India"
+
+    return address
+
+def address_variations(location_data: Dict) -> List[str]:
+    """``address_variations`` as a list; GPT sometimes returns a single string"""
+    variations = location_data.get("address_variations") or []
+    return [variations] if isinstance(variations, str) else list(variations)
+
+def location_candidates(location_data: Dict, address: str) -> List[str]:
+    """Place strings to try locally, most specific first"""
+    candidates = [
+        location_data.get("specific_landmark"),
+        address,
+        *address_variations(location_data),
+        location_data.get("primary_location"),
+    ]
+    return [c for c in candidates if c]
+
+# === Geocoder backends: each returns {"latitude", "longitude"} or None ===
+
+def cache_geocoder(location_data: Dict, address: str, api_key: str) -> Optional[Dict]:
+    return geocode_cache.get_any([address] + address_variations(location_data))
+
+def gazetteer_geocoder(location_data: Dict, address: str, api_key: str) -> Optional[Dict]:
+    # Only a candidate that is itself a known place name; a city or landmark
+    # mentioned inside a longer address would pin it to that place's centroid
+    place = gazetteer.lookup_any(location_candidates(location_data, address), fuzzy=False)
+    if place:
+        return {"latitude": place["latitude"], "longitude": place["longitude"]}
+    return None
+
+def gazetteer_fuzzy_geocoder(location_data: Dict, address: str, api_key: str) -> Optional[Dict]:
+    place = gazetteer.lookup_any(location_candidates(location_data, address))
+    if place:
+        return {"latitude": place["latitude"], "longitude": place["longitude"]}
+    return None
+
+def google_geocoder(location_data: Dict, address: str, api_key: str) -> Optional[Dict]:
+    # Make request to Google Maps Geocoding API
+    get_limiter("maps").acquire()
+    with external_call("maps") as call:
+        response = requests.get(GEOCODE_URL, params={"address": address, "key": api_key}, timeout=GEOCODE_TIMEOUT)
+        call.status = response.status_code
+    return _parse_google_response(response.json(), address)
+
+def _parse_google_response(data: Dict, address: str) -> Optional[Dict]:
+    if data["status"] == "OK" and data["results"]:
+        location = data["results"][0]["geometry"]["location"]
+        geocode_cache.put(address, location["lat"], location["lng"])
+        return {
+            "latitude": location["lat"],
+            "longitude": location["lng"]
+        }
+
+    return None
+
+# Keep-alive client for the async pipeline, created on first use inside the event loop
+_async_http = None
+
+async def google_geocoder_async(location_data: Dict, address: str, api_key: str) -> Optional[Dict]:
+    global _async_http
+    if _async_http is None:
+        _async_http = httpx.AsyncClient(timeout=GEOCODE_TIMEOUT)
+    await get_limiter("maps").acquire_async()
+    with external_call("maps") as call:
+        response = await _async_http.get(GEOCODE_URL, params={"address": address, "key": api_key})
+        call.status = response.status_code
+    return await asyncio.to_thread(_parse_google_response, response.json(), address)
+
+GEOCODERS = {
+    "cache": cache_geocoder,
+    "gazetteer": gazetteer_geocoder,
+    "google": google_geocoder,
+    "gazetteer_fuzzy": gazetteer_fuzzy_geocoder,
+}
+
+def get_approx_lat_lng(location_data: Dict, api_key: str, backends: Optional[List[str]] = None) -> Optional[Dict]:
     """
-    Get approximate latitude and longitude from location data using Google Maps API
-    
+    Get approximate latitude and longitude from location data
+
+    Backends are tried in order (GEOCODER_BACKENDS by default): the local
+    geocode cache, exact gazetteer names, the Google Maps API and finally
+    partial or misspelt gazetteer matches, so the network is only used when
+    nothing local resolves the location exactly and an approximate centroid
+    is only used when Google has nothing better.
+
     Args:
         location_data: Dictionary containing location information
         api_key: Google Maps API key
-    
+        backends: Optional list of backend names overriding the configured order
+
     Returns:
         Dictionary with latitude and longitude if successful, None otherwise
     """
-    try:
-        # Build address from available components
-        address_components = []
-        
-        if location_data.get("primary_location"):
-            address_components.append(location_data["primary_location"])
-        
-        if location_data.get("specific_landmark"):
-            address_components.append(location_data["specific_landmark"])
-        
-        if location_data.get("state_region"):
-            address_components.append(location_data["state_region"])
-        
-        if location_data.get("combined_address"):
-            # If we have a combined address, use it directly
-            address = location_data["combined_address"]
-        else:
-            # Otherwise, build from components
-            address = ", ".join(filter(None, address_components))
-        
-        if not address:
-            return None
-        
-        # Add "Andhra Pradesh, India" if not already in the address
-        if "andhra pradesh" not in address.lower() and "india" not in address.lower():
-            address += ", Andhra Pradesh, India"
-        elif "andhra pradesh" in address.lower() and "india" not in address.lower():
-            address += ", India"
-        
-        # Make request to Google Maps Geocoding API
-        url = f"https://maps.googleapis.com/maps/api/geocode/json?address={address}&key={api_key}"
-        response = requests.get(url)
-        data = response.json()
-        
-        if data["status"] == "OK" and data["results"]:
-            location = data["results"][0]["geometry"]["location"]
-            return {
-                "latitude": location["lat"],
-                "longitude": location["lng"]
-            }
-        
+    address = build_address(location_data)
+    if not address:
         return None
-    except Exception as e:
-        print(f"Error getting location coordinates: {e}")
+
+    for name in backends or GEOCODER_BACKENDS:
+        try:
+            latlng = GEOCODERS[name](location_data, address, api_key)
+            if latlng:
+                return latlng
+        except Exception as e:
+            print(f"Error getting location coordinates from {name}: {e}")
+
+    return None
+
+async def get_approx_lat_lng_async(location_data: Dict, api_key: str, backends: Optional[List[str]] = None) -> Optional[Dict]:
+    """
+    Async variant of get_approx_lat_lng
+
+    The remote lookup goes through httpx.AsyncClient; the local backends
+    (cache and gazetteer) run on a worker thread so SQLite reads and fuzzy
+    matching never block the event loop.
+    """
+    address = build_address(location_data)
+    if not address:
         return None
+
+    for name in backends or GEOCODER_BACKENDS:
+        try:
+            if name == "google":
+                latlng = await google_geocoder_async(location_data, address, api_key)
+            else:
+                latlng = await asyncio.to_thread(GEOCODERS[name], location_data, address, api_key)
+            if latlng:
+                return latlng
+        except Exception as e:
+            print(f"Error getting location coordinates from {name}: {e}")
+
+    return None
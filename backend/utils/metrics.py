@@ -0,0 +1,278 @@
+import time
+import asyncio
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base for a named metric with a fixed set of label names"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in sorted(values.items())]
+
+
+class Gauge(Metric):
+    """
+    Current value per label set, either set directly or read from a callback at scrape time
+
+    A callback returns a number for an unlabelled gauge, or a dict mapping
+    label-value tuples to numbers.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._function: Optional[Callable] = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable):
+        self._function = function
+
+    def track_inprogress(self, **labels):
+        """Decorator counting calls currently running; works on sync and async functions"""
+        def decorator(fn):
+            if asyncio.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    self.inc(**labels)
+                    try:
+                        return await fn(*args, **kwargs)
+                    finally:
+                        self.dec(**labels)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                self.inc(**labels)
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.dec(**labels)
+            return wrapper
+        return decorator
+
+    def samples(self):
+        if self._function is not None:
+            try:
+                result = self._function()
+            except Exception as e:
+                print(f"Metric callback for {self.name} failed: {e}")
+                return []
+            values = result if isinstance(result, dict) else {(): result}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in sorted(values.items())]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self._buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values: Dict[Tuple, List] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self._buckets), 0.0, 0]
+            for i, bound in enumerate(self._buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """``with histogram.time(stage="x"):`` observes the block's duration"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        with self._lock:
+            values = {k: (list(v[0]), v[1], v[2]) for k, v in self._values.items()}
+        lines = []
+        for key, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self._buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+registry = Registry()
+
+
+# === Application metrics ===
+
+STAGE_SECONDS = Histogram(
+    "dial112_stage_seconds", "Latency of each audio pipeline stage", ("stage",)
+)
+JOBS_IN_FLIGHT = Gauge(
+    "dial112_jobs_in_flight", "Audio files or batches currently being processed", ("pipeline",)
+)
+JOB_QUEUE_JOBS = Gauge(
+    "dial112_job_queue_jobs", "Jobs held by the background queue by status", ("status",)
+)
+AUDIO_BYTES_SAVED = Counter(
+    "dial112_audio_preprocess_bytes_saved_total", "Upload bytes saved by preprocessing audio before transcription"
+)
+EXTERNAL_REQUESTS = Counter(
+    "dial112_external_requests_total", "Calls to external APIs by HTTP status", ("service", "status")
+)
+EXTERNAL_SECONDS = Histogram(
+    "dial112_external_request_seconds", "Latency of external API calls", ("service",)
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "dial112_db_pool_wait_seconds", "Time spent waiting to check out a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+DB_POOL_TIMEOUTS = Counter(
+    "dial112_db_pool_timeouts_total", "Connection checkouts that gave up waiting"
+)
+DB_POOL_IN_USE = Gauge(
+    "dial112_db_pool_connections_in_use", "Pooled connections currently checked out"
+)
+DB_QUERY_SECONDS = Histogram(
+    "dial112_db_query_seconds", "Duration of database queries", ("query",)
+)
+
+
+class _Call:
+    status = 200
+
+
+@contextmanager
+def external_call(service: str):
+    """
+    Count and time one call to an external API
+
+    The status defaults to 200; set ``call.status`` from the response when
+    there is one. An exception records its ``status_code`` if it carries
+    one, otherwise "error".
+    """
+    call = _Call()
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception as e:
+        call.status = getattr(e, "status_code", None) or "error"
+        raise
+    finally:
+        EXTERNAL_SECONDS.observe(time.perf_counter() - started, service=service)
+        EXTERNAL_REQUESTS.inc(service=service, status=call.status)
+
+
+def stage_timer(stage: str):
+    return STAGE_SECONDS.time(stage=stage)
+
+
+def query_timer(query: str):
+    return DB_QUERY_SECONDS.time(query=query)
+
+
+def render_metrics() -> str:
+    """Every registered metric in Prometheus text exposition format"""
+    return registry.render()
@@ -0,0 +1,128 @@
+import time
+import asyncio
+import threading
+from typing import Dict, Optional
+
+from config.config import (
+    RATE_LIMIT_WHISPER_RPM, RATE_LIMIT_GPT_RPM, RATE_LIMIT_GPT_TPM, RATE_LIMIT_MAPS_RPM
+)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``per_minute`` tokens per minute.
+
+    Callers reserve tokens up front and are told how long to wait, so the
+    bucket can go negative and later callers queue behind earlier ones
+    instead of racing for the same refill.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        # Quotas are enforced over short windows, so only allow ~10s worth of burst
+        self.capacity = capacity if capacity is not None else max(1.0, per_minute / 6.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens and return the seconds to wait before using them"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Request (RPM) and optional token (TPM) budget for one external backend"""
+
+    def __init__(self, name: str, rpm: float = 0, tpm: float = 0):
+        self.name = name
+        self._requests = TokenBucket(rpm) if rpm > 0 else None
+        self._tokens = TokenBucket(tpm) if tpm > 0 else None
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.max_waiting = 0
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _reserve(self, tokens: float) -> float:
+        delay = self._requests.reserve(1) if self._requests else 0.0
+        if self._tokens and tokens:
+            delay = max(delay, self._tokens.reserve(tokens))
+        return delay
+
+    def _enter(self, delay: float):
+        with self._lock:
+            self.acquired += 1
+            self.total_wait += delay
+            self.max_wait = max(self.max_wait, delay)
+            if delay > 0:
+                self.waiting += 1
+                self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def _leave(self, delay: float):
+        if delay > 0:
+            with self._lock:
+                self.waiting -= 1
+
+    def acquire(self, tokens: float = 0) -> float:
+        """Block until one request (and ``tokens`` tokens) fit the budget; returns the wait"""
+        delay = self._reserve(tokens)
+        self._enter(delay)
+        try:
+            if delay > 0:
+                time.sleep(delay)
+        finally:
+            self._leave(delay)
+        return delay
+
+    async def acquire_async(self, tokens: float = 0) -> float:
+        """asyncio version of acquire"""
+        delay = self._reserve(tokens)
+        self._enter(delay)
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+        finally:
+            self._leave(delay)
+        return delay
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "rpm": self._requests.rate * 60 if self._requests else None,
+                "tpm": self._tokens.rate * 60 if self._tokens else None,
+                "queue_depth": self.waiting,
+                "max_queue_depth": self.max_waiting,
+                "acquired": self.acquired,
+                "total_wait_seconds": round(self.total_wait, 3),
+                "avg_wait_seconds": round(self.total_wait / self.acquired, 3) if self.acquired else 0.0,
+                "max_wait_seconds": round(self.max_wait, 3)
+            }
+
+
+# One limiter per external backend; a budget of 0 means unlimited
+limiters = {
+    "whisper": RateLimiter("whisper", rpm=RATE_LIMIT_WHISPER_RPM),
+    "gpt": RateLimiter("gpt", rpm=RATE_LIMIT_GPT_RPM, tpm=RATE_LIMIT_GPT_TPM),
+    "maps": RateLimiter("maps", rpm=RATE_LIMIT_MAPS_RPM),
+}
+
+
+def get_limiter(name: str) -> RateLimiter:
+    return limiters[name]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for TPM budgeting"""
+    return len(text) // 4 + 1
+
+
+def limiter_stats() -> Dict:
+    return {name: limiter.stats() for name, limiter in limiters.items()}
@@ -0,0 +1,163 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+# Stage outputs stored per audio content hash
+STAGE_FIELDS = (
+    "transcript", "phone_number", "analysis", "severity",
+    "latitude", "longitude", "output_file", "ticket_id"
+)
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Hash a file in chunks so large recordings are never fully loaded"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class EvictionSchedule:
+    """Decides when a cache should apply its retention policy: every ``every`` writes or ``interval`` seconds"""
+
+    def __init__(self, every: int = 100, interval: float = 60.0):
+        self._every = every
+        self._interval = interval
+        self._writes = 0
+        self._last = time.monotonic()
+
+    def record_write(self) -> bool:
+        """Count one write; True when eviction is due"""
+        self._writes += 1
+        return self._writes >= self._every or time.monotonic() - self._last >= self._interval
+
+    def evicted(self):
+        self._writes = 0
+        self._last = time.monotonic()
+
+
+class AudioResultCache:
+    """
+    SQLite-backed cache of pipeline stage outputs keyed by the SHA-256 of the audio.
+
+    Entries older than ``ttl_seconds`` are dropped on read and on eviction; once
+    more than ``max_entries`` are stored the least recently used ones go first.
+    Eviction runs after every ``evict_every`` puts or ``evict_interval`` seconds,
+    whichever comes first, so the table may briefly exceed ``max_entries``.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 10000, ttl_seconds: int = 30 * 86400,
+                 evict_every: int = 100, evict_interval: float = 60.0):
+        self._db_path = db_path
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._eviction = EvictionSchedule(evict_every, evict_interval)
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS audio_results (
+                    sha256 TEXT PRIMARY KEY,
+                    transcript TEXT,
+                    phone_number TEXT,
+                    analysis TEXT,
+                    severity INTEGER,
+                    latitude REAL,
+                    longitude REAL,
+                    output_file TEXT,
+                    ticket_id TEXT,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_audio_results_last_access ON audio_results (last_access)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, sha256: str) -> Optional[Dict]:
+        """Return the cached stage outputs for an audio hash, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT * FROM audio_results WHERE sha256 = ?", (sha256,)).fetchone()
+            if row is None or row["created_at"] < now - self._ttl_seconds:
+                if row is not None:
+                    conn.execute("DELETE FROM audio_results WHERE sha256 = ?", (sha256,))
+                    conn.commit()
+                self.misses += 1
+                return None
+            conn.execute("UPDATE audio_results SET last_access = ? WHERE sha256 = ?", (now, sha256))
+            conn.commit()
+            self.hits += 1
+
+        entry = dict(row)
+        if entry["analysis"] is not None:
+            entry["analysis"] = json.loads(entry["analysis"])
+        return entry
+
+    def put(self, sha256: str, **stages):
+        """Store or update one or more stage outputs for an audio hash"""
+        unknown = set(stages) - set(STAGE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown cache fields: {', '.join(sorted(unknown))}")
+        if "analysis" in stages and stages["analysis"] is not None:
+            stages["analysis"] = json.dumps(stages["analysis"], ensure_ascii=False)
+
+        now = time.time()
+        columns = list(stages)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR IGNORE INTO audio_results (sha256, created_at, last_access) VALUES (?, ?, ?)",
+                (sha256, now, now)
+            )
+            if columns:
+                assignments = ", ".join(f"{column} = ?" for column in columns)
+                conn.execute(
+                    f"UPDATE audio_results SET {assignments}, last_access = ? WHERE sha256 = ?",
+                    [stages[column] for column in columns] + [now, sha256]
+                )
+            conn.commit()
+            due = self._eviction.record_write()
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Apply the retention policy: drop expired entries, then trim to max_entries by LRU"""
+        with self._lock:
+            self._eviction.evicted()
+            conn = self._connect()
+            conn.execute(
+                "DELETE FROM audio_results WHERE created_at < ?", (time.time() - self._ttl_seconds,)
+            )
+            conn.execute("""
+                DELETE FROM audio_results WHERE sha256 IN (
+                    SELECT sha256 FROM audio_results ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+            """, (self._max_entries,))
+            conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM audio_results").fetchone()[0]
+        return {
+            "entries": entries,
+            "max_entries": self._max_entries,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,128 @@
+import os
+import re
+import json
+import time
+import threading
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+from config.config import TAXONOMY_PATH, TAXONOMY_RELOAD_CHECK_SECONDS
+
+CRIME_KEY = "Crime"
+SUBCRIME_KEY = "Sub-Crime"
+SEVERITY_KEY = "Severity Rank (1–10) based on threat or frequency"
+
+
+def normalize_name(name) -> str:
+    """Case, whitespace and punctuation-insensitive key ("Eve -Teasing" -> "eve teasing")"""
+    return re.sub(r"[^0-9a-z]+", " ", str(name).lower()).strip()
+
+
+class CrimeTaxonomy:
+    """Immutable lookup tables built once from the crime type/subtype sheet"""
+
+    def __init__(self, rows: List[Dict]):
+        severity, subtypes, subtype_names, type_names, subtype_type = {}, {}, {}, {}, {}
+        for row in rows:
+            crime = str(row.get(CRIME_KEY) or "").strip()
+            subcrime = str(row.get(SUBCRIME_KEY) or "").strip()
+            if not crime or not subcrime:
+                continue
+            subtypes.setdefault(crime, []).append(subcrime)
+            type_names.setdefault(normalize_name(crime), crime)
+            subtype_names.setdefault(normalize_name(subcrime), subcrime)
+            subtype_type.setdefault(subcrime, crime)
+            rank = row.get(SEVERITY_KEY)
+            if rank is not None and rank == rank:  # skip NaN from the spreadsheet
+                severity[subcrime] = int(rank)
+
+        self.severity_by_subtype = MappingProxyType(severity)
+        self.subtypes_by_type = MappingProxyType({k: tuple(v) for k, v in subtypes.items()})
+        self.type_by_subtype = MappingProxyType(subtype_type)
+        self._subtype_aliases = MappingProxyType(subtype_names)
+        self._type_aliases = MappingProxyType(type_names)
+        # Compact "Type: SubType, SubType" lines for the analysis prompt
+        self.prompt_text = "\n".join(
+            f"{crime}: {', '.join(names)}" for crime, names in self.subtypes_by_type.items()
+        )
+
+    def canonical_subtype(self, name) -> Optional[str]:
+        if not name:
+            return None
+        return self._subtype_aliases.get(normalize_name(name))
+
+    def canonical_type(self, name) -> Optional[str]:
+        if not name:
+            return None
+        return self._type_aliases.get(normalize_name(name))
+
+    def severity(self, subtype) -> Optional[int]:
+        """Severity rank for a sub-crime, matched case/whitespace-insensitively"""
+        canonical = self.canonical_subtype(subtype)
+        return self.severity_by_subtype.get(canonical) if canonical else None
+
+    def subtypes(self, crime_type) -> Tuple[str, ...]:
+        canonical = self.canonical_type(crime_type)
+        return self.subtypes_by_type.get(canonical, ()) if canonical else ()
+
+
+def _read_rows(path: str) -> List[Dict]:
+    if path.lower().endswith((".xlsx", ".xls")):
+        # Only the spreadsheet source needs pandas; the JSON path never imports it
+        import pandas as pd
+        df = pd.read_excel(path)
+        df.columns = [col.strip() for col in df.columns]
+        return df.to_dict(orient="records")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TaxonomyStore:
+    """
+    Holds the current CrimeTaxonomy and reloads it when the source file changes.
+
+    The file's mtime is checked at most every ``check_interval`` seconds, so
+    lookups in between touch no disk at all.
+    """
+
+    def __init__(self, path: str, check_interval: float = 5.0):
+        self._path = path
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self._taxonomy = None
+        self._mtime = None
+        self._checked_at = 0.0
+
+    def get(self) -> CrimeTaxonomy:
+        now = time.monotonic()
+        if self._taxonomy is not None and now - self._checked_at < self._check_interval:
+            return self._taxonomy
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self._path).st_mtime
+            except OSError as e:
+                if self._taxonomy is None:
+                    print(f"Crime taxonomy not available: {e}")
+                    self._taxonomy = CrimeTaxonomy([])
+                return self._taxonomy
+            if mtime != self._mtime:
+                try:
+                    self._taxonomy = CrimeTaxonomy(_read_rows(self._path))
+                    self._mtime = mtime
+                except Exception as e:
+                    print(f"Error loading crime taxonomy from {self._path}: {e}")
+                    if self._taxonomy is None:
+                        self._taxonomy = CrimeTaxonomy([])
+            return self._taxonomy
+
+
+taxonomy_store = TaxonomyStore(TAXONOMY_PATH, check_interval=TAXONOMY_RELOAD_CHECK_SECONDS)
+
+
+def get_taxonomy() -> CrimeTaxonomy:
+    return taxonomy_store.get()
+
+
+def severity_for_subtype(subtype) -> Optional[int]:
+    return get_taxonomy().severity(subtype)
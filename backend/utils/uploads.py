@@ -0,0 +1,93 @@
+import os
+import uuid
+import hashlib
+import aiofiles
+from typing import Dict, Optional
+from fastapi import UploadFile
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload goes over the per-file or per-request size limit"""
+
+    def __init__(self, message: str, scope: str):
+        super().__init__(message)
+        self.scope = scope
+
+
+class UploadBudget:
+    """Bytes still allowed for the rest of a single request"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.used = 0
+
+    def consume(self, nbytes: int):
+        self.used += nbytes
+        if self.used > self.max_bytes:
+            raise UploadTooLargeError(
+                f"Request exceeds the upload limit of {self.max_bytes} bytes", scope="request"
+            )
+
+
+async def save_upload_streaming(
+    file: UploadFile,
+    dest_dir: str,
+    max_file_bytes: int,
+    budget: Optional[UploadBudget] = None,
+    chunk_size: int = 1024 * 1024
+) -> Dict:
+    """
+    Copy an UploadFile to disk in fixed-size chunks, hashing it on the way
+
+    The file is written to a temporary name first and only moved into place
+    once it is complete, so a rejected upload never leaves a partial file.
+    It is stored as ``<sha256>_<filename>``: uploads sharing a name never
+    replace each other while queued jobs still have to read them, and the
+    phone number stays the last ``_``-separated part of the name.
+
+    Args:
+        file: Incoming upload
+        dest_dir: Directory to store the file in
+        max_file_bytes: Largest size accepted for this file
+        budget: Optional per-request byte budget shared by all files
+        chunk_size: Bytes read and written per step
+
+    Returns:
+        Dictionary with the original filename and the path, size and sha256
+        of the stored file
+    """
+    filename = os.path.basename(file.filename)
+    tmp_path = os.path.join(dest_dir, f".{filename}.{uuid.uuid4().hex}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_file_bytes:
+                    raise UploadTooLargeError(
+                        f"{filename} exceeds the per-file limit of {max_file_bytes} bytes", scope="file"
+                    )
+                if budget is not None:
+                    budget.consume(len(chunk))
+                digest.update(chunk)
+                await out.write(chunk)
+        file_path = os.path.join(dest_dir, f"{digest.hexdigest()}_{filename}")
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        await file.close()
+
+    return {
+        "filename": filename,
+        "path": file_path,
+        "size": size,
+        "sha256": digest.hexdigest()
+    }
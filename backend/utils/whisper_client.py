@@ -0,0 +1,180 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from functools import lru_cache
+
+import httpx
+
+from utils.rate_limit import get_limiter
+from utils.metrics import external_call
+from config.config import (
+    WHISPER_CONNECT_TIMEOUT, WHISPER_READ_TIMEOUT, WHISPER_MAX_CONNECTIONS,
+    WHISPER_MAX_CONCURRENCY, WHISPER_MAX_RETRIES, WHISPER_BACKOFF_BASE,
+    WHISPER_BACKOFF_MAX, WHISPER_HTTP2
+)
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: str = None) -> float:
+    """Full-jitter exponential backoff, honouring a numeric Retry-After header"""
+    if retry_after:
+        try:
+            return min(float(retry_after), cap)
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def http2_available(requested: bool) -> bool:
+    """HTTP/2 needs the optional ``h2`` package; fall back to HTTP/1.1 without it"""
+    if not requested:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        print("WHISPER_HTTP2 is on but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+class WhisperClient:
+    """
+    Shared, connection-pooled client for the Whisper transcription endpoint.
+
+    One httpx.Client is kept alive for the life of the process so files reuse
+    open TCP/TLS connections; a semaphore bounds concurrent uploads and
+    throttled or failed calls are retried with jittered exponential backoff.
+    The semaphore is only held during an upload, never while backing off,
+    so a throttled file doesn't keep others from being sent.
+    """
+
+    def __init__(self, endpoint: str, api_key: str, api_version: str,
+                 connect_timeout: float = WHISPER_CONNECT_TIMEOUT,
+                 read_timeout: float = WHISPER_READ_TIMEOUT,
+                 max_connections: int = WHISPER_MAX_CONNECTIONS,
+                 max_concurrency: int = WHISPER_MAX_CONCURRENCY,
+                 max_retries: int = WHISPER_MAX_RETRIES,
+                 backoff_base: float = WHISPER_BACKOFF_BASE,
+                 backoff_max: float = WHISPER_BACKOFF_MAX,
+                 http2: bool = WHISPER_HTTP2):
+        self.url = f"{endpoint}?api-version={api_version}"
+        self._headers = {"api-key": api_key}
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._client = httpx.Client(
+            http2=http2_available(http2),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+
+    def transcribe(self, audio_path: str, language: str = "en") -> str:
+        """Upload one audio file and return the transcript text"""
+        data = {"language": language, "response_format": "text"}
+        attempt = 0
+        while True:
+            get_limiter("whisper").acquire()
+            try:
+                with self._semaphore, external_call("whisper") as call, open(audio_path, "rb") as audio_file:
+                    files = {"file": (os.path.basename(audio_path), audio_file, "audio/wav")}
+                    response = self._client.post(self.url, headers=self._headers, data=data, files=files)
+                    call.status = response.status_code
+            except httpx.TransportError as e:
+                if attempt >= self._max_retries:
+                    raise Exception(f"Transcription Error: {e}")
+                time.sleep(backoff_delay(attempt, self._backoff_base, self._backoff_max))
+                attempt += 1
+                continue
+
+            if response.status_code == 200:
+                return response.text.strip()
+            if response.status_code in RETRY_STATUS_CODES and attempt < self._max_retries:
+                time.sleep(backoff_delay(
+                    attempt, self._backoff_base, self._backoff_max, response.headers.get("retry-after")
+                ))
+                attempt += 1
+                continue
+            raise Exception(f"Transcription Error {response.status_code}: {response.text}")
+
+    def close(self):
+        self._client.close()
+
+
+class AsyncWhisperClient:
+    """asyncio counterpart of WhisperClient built on httpx.AsyncClient"""
+
+    def __init__(self, endpoint: str, api_key: str, api_version: str,
+                 connect_timeout: float = WHISPER_CONNECT_TIMEOUT,
+                 read_timeout: float = WHISPER_READ_TIMEOUT,
+                 max_connections: int = WHISPER_MAX_CONNECTIONS,
+                 max_concurrency: int = WHISPER_MAX_CONCURRENCY,
+                 max_retries: int = WHISPER_MAX_RETRIES,
+                 backoff_base: float = WHISPER_BACKOFF_BASE,
+                 backoff_max: float = WHISPER_BACKOFF_MAX,
+                 http2: bool = WHISPER_HTTP2):
+        self.url = f"{endpoint}?api-version={api_version}"
+        self._headers = {"api-key": api_key}
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            http2=http2_available(http2),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+
+    async def transcribe(self, audio_path: str, language: str = "en") -> str:
+        """Upload one audio file and return the transcript text"""
+        data = {"language": language, "response_format": "text"}
+        attempt = 0
+        while True:
+            await get_limiter("whisper").acquire_async()
+            try:
+                async with self._semaphore:
+                    with external_call("whisper") as call, open(audio_path, "rb") as audio_file:
+                        files = {"file": (os.path.basename(audio_path), audio_file, "audio/wav")}
+                        response = await self._client.post(self.url, headers=self._headers, data=data, files=files)
+                        call.status = response.status_code
+            except httpx.TransportError as e:
+                if attempt >= self._max_retries:
+                    raise Exception(f"Transcription Error: {e}")
+                await asyncio.sleep(backoff_delay(attempt, self._backoff_base, self._backoff_max))
+                attempt += 1
+                continue
+
+            if response.status_code == 200:
+                return response.text.strip()
+            if response.status_code in RETRY_STATUS_CODES and attempt < self._max_retries:
+                await asyncio.sleep(backoff_delay(
+                    attempt, self._backoff_base, self._backoff_max, response.headers.get("retry-after")
+                ))
+                attempt += 1
+                continue
+            raise Exception(f"Transcription Error {response.status_code}: {response.text}")
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+@lru_cache(maxsize=None)
+def get_whisper_client(endpoint: str, api_key: str, api_version: str) -> WhisperClient:
+    """Process-wide client per endpoint configuration"""
+    return WhisperClient(endpoint, api_key, api_version)
+
+
+@lru_cache(maxsize=None)
+def get_async_whisper_client(endpoint: str, api_key: str, api_version: str) -> AsyncWhisperClient:
+    """Async client per endpoint configuration; must be used from the app's event loop"""
+    return AsyncWhisperClient(endpoint, api_key, api_version)
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import {
   Box,
   Card,
@@ -96,12 +96,44 @@ const theme = {
   info: '#3b82f6'
 };
 
+// Start of a relative time filter ("last 5 minutes" etc.), or null
+const timeFilterStart = (timeFilter) => {
+  const minutes = {
+    last5min: 5,
+    last10min: 10,
+    last30min: 30,
+    lastHour: 60,
+    last7days: 7 * 24 * 60
+  }[timeFilter];
+  return minutes ? new Date(Date.now() - minutes * 60 * 1000) : null;
+};
+
+// Replace changed rows in place and put newly created ones at the top.
+// With ``includeCreated`` false only rows already shown are updated, since
+// new rows can't be checked against the server-side filters here.
+const mergeChangedRows = (rows, changed, includeCreated = true) => {
+  const byTicket = new Map(changed.map(row => [row.ticket_id, row]));
+  const merged = rows.map(row => {
+    const update = byTicket.get(row.ticket_id);
+    if (!update) return row;
+    byTicket.delete(row.ticket_id);
+    return update;
+  });
+  if (!includeCreated) return merged;
+  const created = [...byTicket.values()].sort((a, b) => (b.created_at || '').localeCompare(a.created_at || ''));
+  return [...created, ...merged];
+};
+
 const AudioUploaderDashboard = ({ onLogout, username }) => {
   const [files, setFiles] = useState([]);
   const [uploadSummary, setUploadSummary] = useState([]);
   const [showModal, setShowModal] = useState(false);
   const [tableData, setTableData] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [changesCursor, setChangesCursor] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
+  const [summary, setSummary] = useState(null);
+  const [filterOptions, setFilterOptions] = useState({ severities: [], crime_types: [], crime_subtypes: [] });
   const [expandedRow, setExpandedRow] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
@@ -119,6 +151,9 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
   const [fromDate, setFromDate] = useState(null);
   const [toDate, setToDate] = useState(null);
   const [timeFilter, setTimeFilter] = useState('');
+  // Read by the live stream handler, which is set up once
+  const filtersActiveRef = useRef(false);
+  const refreshSummaryRef = useRef(null);
   
   // Time filter options
   const timeFilterOptions = [
@@ -151,7 +186,7 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
       const response = await axios.post('http://127.0.0.1:8007/audio/upload-and-process/', formData);
       setUploadSummary(response.data.results);
       setShowModal(true);
-      fetchTableData();
+      fetchChanges();
     } catch (err) {
       setError('Upload failed! Please try again.');
     } finally {
@@ -159,73 +194,135 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
     }
   };
 
+  // Filters are applied by the server, so paging, totals and search cover every report
+  const buildQueryParams = () => {
+    const params = {};
+    if (searchQuery) params.search = searchQuery;
+    if (severityFilter) params.severity = severityFilter;
+    if (crimeTypeFilter) params.crimeType = crimeTypeFilter;
+    if (crimeSubTypeFilter) params.crimeSubType = crimeSubTypeFilter;
+    if (timeFilter) {
+      const start = timeFilterStart(timeFilter);
+      if (start) params.fromDate = start.toISOString();
+    } else {
+      if (fromDate) params.fromDate = new Date(fromDate).toISOString();
+      if (toDate) params.toDate = new Date(toDate).toISOString();
+    }
+    return params;
+  };
+
   const fetchTableData = async () => {
     try {
       // Updated API endpoint with the data prefix
-      const response = await axios.get('http://127.0.0.1:8007/data/get-data');
+      const response = await axios.get('http://127.0.0.1:8007/data/get-data', {
+        params: buildQueryParams()
+      });
       setTableData(response.data.records);
+      setNextCursor(response.data.next_cursor);
+      setChangesCursor(response.data.changes_cursor);
+    } catch (err) {
+      setError('Failed to fetch records');
+    }
+  };
+
+  const fetchSummary = async () => {
+    try {
+      const response = await axios.get('http://127.0.0.1:8007/data/summary', {
+        params: buildQueryParams()
+      });
+      setSummary(response.data);
+    } catch (err) {
+      setError('Failed to fetch summary');
+    }
+  };
+
+  const fetchFilterOptions = async () => {
+    try {
+      const response = await axios.get('http://127.0.0.1:8007/data/filter-options');
+      setFilterOptions(response.data);
+    } catch (err) {
+      setError('Failed to fetch filter options');
+    }
+  };
+
+  refreshSummaryRef.current = fetchSummary;
+
+  // Fetch only the rows inserted or updated since the last refresh
+  const fetchChanges = async () => {
+    if (!changesCursor) {
+      fetchTableData();
+      return;
+    }
+    try {
+      let cursor = changesCursor;
+      let changed = [];
+      let hasMore = true;
+      while (hasMore) {
+        const response = await axios.get('http://127.0.0.1:8007/data/changes', {
+          params: { cursor }
+        });
+        changed = changed.concat(response.data.records);
+        cursor = response.data.next_cursor;
+        hasMore = response.data.has_more;
+      }
+      setChangesCursor(cursor);
+      setTableData(prev => mergeChangedRows(prev, changed, !filtersActiveRef.current));
+      fetchSummary();
+      fetchFilterOptions();
+    } catch (err) {
+      setError('Failed to fetch records');
+    }
+  };
+
+  const loadMoreRecords = async () => {
+    try {
+      const response = await axios.get('http://127.0.0.1:8007/data/get-data', {
+        params: { ...buildQueryParams(), cursor: nextCursor }
+      });
+      setTableData(prev => [...prev, ...response.data.records]);
+      setNextCursor(response.data.next_cursor);
     } catch (err) {
       setError('Failed to fetch records');
     }
   };
 
   useEffect(() => {
-    fetchTableData();
+    fetchFilterOptions();
+  }, []);
+
+  // Reload the first page and the totals whenever a filter changes; typing in search is debounced
+  useEffect(() => {
+    filtersActiveRef.current = Boolean(
+      searchQuery || severityFilter || crimeTypeFilter || crimeSubTypeFilter || timeFilter || fromDate || toDate
+    );
+    const timer = setTimeout(() => {
+      fetchTableData();
+      fetchSummary();
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [searchQuery, severityFilter, crimeTypeFilter, crimeSubTypeFilter, timeFilter, fromDate, toDate]);
+
+  // Live ticket updates pushed by the server; EventSource reconnects with the last event id
+  useEffect(() => {
+    const source = new EventSource('http://127.0.0.1:8007/data/stream');
+    let summaryTimer = null;
+    source.addEventListener('report', (event) => {
+      const record = JSON.parse(event.data);
+      setTableData(prev => mergeChangedRows(prev, [record], !filtersActiveRef.current));
+      // Totals come from the server; refresh them at most once per burst of events
+      clearTimeout(summaryTimer);
+      summaryTimer = setTimeout(() => refreshSummaryRef.current(), 1000);
+    });
+    return () => {
+      clearTimeout(summaryTimer);
+      source.close();
+    };
   }, []);
 
   const handleExpandRow = (idx) => {
     setExpandedRow(expandedRow === idx ? null : idx);
   };
 
-  const filteredData = tableData
-    .filter(row =>
-      Object.values(row).some(val =>
-        String(val).toLowerCase().includes(searchQuery.toLowerCase())
-      )
-    )
-    .filter(row =>
-      (!severityFilter || String(row.severity_rank) === severityFilter) &&
-      (!crimeTypeFilter || row.crime_type === crimeTypeFilter) &&
-      (!crimeSubTypeFilter || row.crime_subtype === crimeSubTypeFilter)
-    )
-    .filter(row => {
-      if (!timeFilter && !fromDate && !toDate) return true;
-      
-      const rowDate = row.created_at ? new Date(row.created_at) : null;
-      if (!rowDate) return false;
-      
-      if (timeFilter) {
-        const now = new Date();
-        let cutoffDate;
-        
-        switch (timeFilter) {
-          case 'last5min':
-            cutoffDate = new Date(now.getTime() - 5 * 60 * 1000);
-            break;
-          case 'last10min':
-            cutoffDate = new Date(now.getTime() - 10 * 60 * 1000);
-            break;
-          case 'last30min':
-            cutoffDate = new Date(now.getTime() - 30 * 60 * 1000);
-            break;
-          case 'lastHour':
-            cutoffDate = new Date(now.getTime() - 60 * 60 * 1000);
-            break;
-          case 'last7days':
-            cutoffDate = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
-            break;
-          default:
-            return true;
-        }
-        
-        return rowDate >= cutoffDate;
-      } else {
-        if (fromDate && rowDate < new Date(fromDate)) return false;
-        if (toDate && rowDate > new Date(toDate)) return false;
-        return true;
-      }
-    });
-
   const getSeverityColor = (severity) => {
     const num = parseInt(severity, 10);
     if (num >= 8) return 'error';
@@ -241,10 +338,10 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
     return <Info sx={{ fontSize: 16 }} />;
   };
 
-  // Unique lists for filters
-  const uniqueSeverities = [...new Set(tableData.map(item => item.severity_rank).filter(Boolean))];
-  const uniqueCrimeTypes = [...new Set(tableData.map(item => item.crime_type).filter(Boolean))];
-  const uniqueCrimeSubTypes = [...new Set(tableData.map(item => item.crime_subtype).filter(Boolean))];
+  // Filter menus list every value in the database, not just the loaded page
+  const uniqueSeverities = filterOptions.severities;
+  const uniqueCrimeTypes = filterOptions.crime_types;
+  const uniqueCrimeSubTypes = filterOptions.crime_subtypes;
 
   const statusOptions = ['pending', 'approved', 'rejected'];
 
@@ -264,7 +361,7 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
         officer_assigned: editAssignee
       });
       setEditRowIdx(null);
-      fetchTableData();
+      fetchChanges();
     } catch (err) {
       setError('Failed to update record');
     } finally {
@@ -490,7 +587,7 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
                           <Grid item xs={4}>
                             <Box sx={{ textAlign: 'center', p: 1, background: 'rgba(16, 185, 129, 0.1)', borderRadius: 2 }}>
                               <Typography variant="h5" sx={{ color: 'black', fontWeight: 700 }}>
-                                {tableData.length}
+                                {summary ? summary.total : '–'}
                               </Typography>
                               <Typography variant="body2" sx={{ color: 'black' }}>
                                 Total
@@ -500,7 +597,7 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
                           <Grid item xs={4}>
                             <Box sx={{ textAlign: 'center', p: 1, background: 'rgba(245, 158, 11, 0.1)', borderRadius: 2 }}>
                               <Typography variant="h5" sx={{ color: 'black', fontWeight: 700 }}>
-                                {tableData.filter(row => row.status === 'pending').length}
+                                {summary ? summary.status.pending : '–'}
                               </Typography>
                               <Typography variant="body2" sx={{ color: 'black' }}>
                                 Pending
@@ -510,7 +607,7 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
                           <Grid item xs={4}>
                             <Box sx={{ textAlign: 'center', p: 1, background: 'rgba(59, 130, 246, 0.1)', borderRadius: 2 }}>
                               <Typography variant="h5" sx={{ color: 'black', fontWeight: 700 }}>
-                                {tableData.filter(row => row.status === 'approved').length}
+                                {summary ? summary.status.approved : '–'}
                               </Typography>
                               <Typography variant="body2" sx={{ color: 'black' }}>
                                 Approved
@@ -531,7 +628,7 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
                           <Grid item xs={4}>
                             <Box sx={{ textAlign: 'center', p: 1, background: 'rgba(239, 68, 68, 0.1)', borderRadius: 2 }}>
                               <Typography variant="h5" sx={{ color: 'black', fontWeight: 700 }}>
-                                {tableData.filter(row => parseInt(row.severity_rank, 10) >= 8).length}
+                                {summary ? summary.severity.high : '–'}
                               </Typography>
                               <Typography variant="body2" sx={{ color: 'black' }}>
                                 High
@@ -541,7 +638,7 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
                           <Grid item xs={4}>
                             <Box sx={{ textAlign: 'center', p: 1, background: 'rgba(245, 158, 11, 0.1)', borderRadius: 2 }}>
                               <Typography variant="h5" sx={{ color: 'black', fontWeight: 700 }}>
-                                {tableData.filter(row => parseInt(row.severity_rank, 10) >= 5 && parseInt(row.severity_rank, 10) < 8).length}
+                                {summary ? summary.severity.medium : '–'}
                               </Typography>
                               <Typography variant="body2" sx={{ color: 'black' }}>
                                 Medium
@@ -551,7 +648,7 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
                           <Grid item xs={4}>
                             <Box sx={{ textAlign: 'center', p: 1, background: 'rgba(16, 185, 129, 0.1)', borderRadius: 2 }}>
                               <Typography variant="h5" sx={{ color: 'black', fontWeight: 700 }}>
-                                {tableData.filter(row => parseInt(row.severity_rank, 10) < 5).length}
+                                {summary ? summary.severity.low : '–'}
                               </Typography>
                               <Typography variant="body2" sx={{ color: 'black' }}>
                                 Low
@@ -569,18 +666,9 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
                       </Typography>
                       <Box sx={{ p: 2, background: 'rgba(255, 255, 255, 0.7)', borderRadius: 2, height: '100%' }}>
                         {(() => {
-                          // Calculate top crime types
-                          const crimeTypeCounts = {};
-                          tableData.forEach(row => {
-                            if (row.crime_type) {
-                              crimeTypeCounts[row.crime_type] = (crimeTypeCounts[row.crime_type] || 0) + 1;
-                            }
-                          });
-                          
-                          // Sort and get top 3
-                          const topCrimes = Object.entries(crimeTypeCounts)
-                            .sort((a, b) => b[1] - a[1])
-                            .slice(0, 3);
+                          // Top 3 crime types over every matching report, counted by the server
+                          const topCrimes = (summary ? summary.top_crime_types : [])
+                            .map(({ crime_type, count }) => [crime_type, count]);
                           
                           return (
                             <Box>
@@ -1113,7 +1201,7 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
                   </TableRow>
                 </TableHead>
                 <TableBody>
-                  {filteredData.map((row, idx) => (
+                  {tableData.map((row, idx) => (
                     <React.Fragment key={idx}>
                       <TableRow 
                         hover 
@@ -1567,6 +1655,13 @@ const AudioUploaderDashboard = ({ onLogout, username }) => {
                   ))}
                 </TableBody>
               </Table>
+              {nextCursor && (
+                <Box sx={{ display: 'flex', justifyContent: 'center', p: 2 }}>
+                  <Button variant="outlined" onClick={loadMoreRecords}>
+                    Load more
+                  </Button>
+                </Box>
+              )}
             </TableContainer>
           </Fade>
         )}
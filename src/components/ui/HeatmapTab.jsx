@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { Box, CircularProgress, Typography } from '@mui/material';
-import { MapContainer, TileLayer, GeoJSON } from 'react-leaflet';
+import { MapContainer, TileLayer, GeoJSON, useMapEvents } from 'react-leaflet';
 import { HeatmapLayer } from 'react-leaflet-heatmap-layer-v3';
 import 'leaflet/dist/leaflet.css';
 import axios from 'axios';
@@ -10,21 +10,41 @@ const AP_BOUNDS = [
   [12.5, 76.5], // SW
   [19.5, 85.5], // NE
 ];
+const INITIAL_ZOOM = 7;
+const MAX_ZOOM = 10;
+
+// Reports the map's zoom level after every zoom so cells can be re-binned for it
+const ZoomWatcher = ({ onZoom }) => {
+  useMapEvents({
+    zoomend: (e) => onZoom(e.target.getZoom())
+  });
+  return null;
+};
 
 const HeatmapTab = ({ filters }) => {
   const [heatData, setHeatData] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [apGeoJson, setApGeoJson] = useState(null);
+  const [zoom, setZoom] = useState(INITIAL_ZOOM);
+  const [loadedOnce, setLoadedOnce] = useState(false);
+
+  useEffect(() => {
+    // Fetch Andhra Pradesh GeoJSON
+    axios.get('http://127.0.0.1:8007/static/ANDHRA%20PRADESH_STATE.geojson')
+      .then(res => setApGeoJson(res.data))
+      .catch(() => setApGeoJson(null));
+  }, []);
 
   useEffect(() => {
     // Fetch heatmap data with filters if provided
     let url = 'http://127.0.0.1:8007/heatmap-data';
     
+    // Ask for server-side cells sized for the map's current zoom
+    const params = new URLSearchParams({ zoom });
+
     // Add query parameters if filters are provided
     if (filters) {
-      const params = new URLSearchParams();
-      
       if (filters.searchQuery) {
         params.append('search', filters.searchQuery);
       }
@@ -77,41 +97,40 @@ const HeatmapTab = ({ filters }) => {
           params.append('toDate', new Date(filters.toDate).toISOString());
         }
       }
-      
-      if (params.toString()) {
-        url += '?' + params.toString();
-      }
     }
+
+    url += '?' + params.toString();
     
     setLoading(true);
     axios.get(url)
       .then(res => {
+        // Each cell weighs its summed severity, so busy cells stand out as well as serious ones
         setHeatData(
-          (res.data.data || []).map(d => [d.lat, d.lng, Number(d.severity) || 1])
+          (res.data.data || []).map(d => [d.lat, d.lng, Number(d.severity_sum) || Number(d.count) || 1])
         );
+        setError('');
         setLoading(false);
+        setLoadedOnce(true);
       })
       .catch(() => {
         setError('Failed to load heatmap data');
         setLoading(false);
       });
-      
-    // Fetch Andhra Pradesh GeoJSON
-    axios.get('http://127.0.0.1:8007/static/ANDHRA%20PRADESH_STATE.geojson')
-      .then(res => setApGeoJson(res.data))
-      .catch(() => setApGeoJson(null));
-  }, [filters]);
+  }, [filters, zoom]);
 
-  if (loading) return <Box textAlign="center" mt={4}><CircularProgress /></Box>;
+  // The map stays mounted while refetching so it keeps its zoom and position
+  if (loading && !loadedOnce) return <Box textAlign="center" mt={4}><CircularProgress /></Box>;
   if (error) return <Typography color="error">{error}</Typography>;
 
+  const maxIntensity = heatData.reduce((max, point) => Math.max(max, point[2]), 1);
+
   return (
     <Box sx={{ height: 600, width: '100%' }}>
       <MapContainer
         center={AP_CENTER}
-        zoom={7}
+        zoom={INITIAL_ZOOM}
         minZoom={6}
-        maxZoom={10}
+        maxZoom={MAX_ZOOM}
         style={{ height: '100%', width: '100%', borderRadius: 12 }}
         maxBounds={AP_BOUNDS}
         scrollWheelZoom={true}
@@ -120,6 +139,7 @@ const HeatmapTab = ({ filters }) => {
           url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
           attribution="&copy; OpenStreetMap contributors"
         />
+        <ZoomWatcher onZoom={setZoom} />
         {apGeoJson && (
           <GeoJSON
             data={apGeoJson}
@@ -133,13 +153,12 @@ const HeatmapTab = ({ filters }) => {
         )}
         <HeatmapLayer
           fitBoundsOnLoad
-          fitBoundsOnUpdate
           points={heatData}
           longitudeExtractor={m => m[1]}
           latitudeExtractor={m => m[0]}
           intensityExtractor={m => m[2]}
           radius={25}
-          max={10}
+          max={maxIntensity}
         />
       </MapContainer>
     </Box>